@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Simulation Decision-Graph Analyzer
+
+The simulation and remediation engines work out scores, best choices and
+paths live, from decision_points[] whose options carry points,
+is_optimal / is_correct and (sometimes) next_dp. This stage walks every
+scenario's decision graph once at build time and writes a scoring table
+the runtime can look up instead:
+
+    scoring/tables.json
+        fields       column order of each option tuple
+        scenarios    {scenario_id: {
+                        start, max_score, min_score, optimal_path, paths,
+                        pass_score, pass_percent, declared_max, tiers,
+                        decisions: {dp_id: {seq, best, options: {
+                            option_id: [points, delta, optimal, next]}}},
+                        issues: [...]}}
+
+- Edges: an option's next_dp when the key is present (null ends the
+  scenario), otherwise the next decision point in sequence order
+- points: the option's points; options without any fall back to the
+  remediation engine's rule (25 if correct, else 5)
+- delta: points minus the best option at that decision point (<= 0)
+- max/min score and the optimal path are longest/shortest paths over the
+  DAG from the first decision point; paths counts distinct playthroughs
+- pass_score / pass_percent / declared_max come from completion_criteria,
+  passing_score/max_score or scoring{}, whichever the scenario declares
+
+Issues flagged per scenario: unreachable or dangling decision points,
+cycles, degenerate decision points (one option, all options equal, no or
+several optimal options, optimal option not the highest scoring, duplicate
+option IDs), declared maxima that differ from the computed one and pass
+scores that cannot be reached.
+
+Usage:
+    python scripts/analyze_simulations.py [--source build/data]
+"""
+
+import argparse
+import math
+import os
+
+from content_repo import BUILD_DIR, load_corpus, unwrap, write_json
+
+TABLES_PATH = 'scoring/tables.json'
+SCENARIO_TYPES = ['simulation', 'remediation']
+OPTION_FIELDS = ['points', 'delta', 'optimal', 'next']
+CORRECT_POINTS = 25
+INCORRECT_POINTS = 5
+END = None
+
+
+def option_points(option):
+    if isinstance(option.get('points'), (int, float)) and not isinstance(option.get('points'), bool):
+        return option['points']
+    return CORRECT_POINTS if option.get('is_correct') or option.get('is_optimal') else INCORRECT_POINTS
+
+
+def _is_marked(option):
+    return bool(option.get('is_optimal') or option.get('is_correct') or option.get('isCorrect'))
+
+
+def ordered_decisions(body):
+    """Decision points in sequence order with resolved IDs"""
+    points = [dp for dp in body.get('decision_points') or [] if isinstance(dp, dict)]
+    indexed = sorted(enumerate(points), key=lambda item: (item[1].get('sequence', item[0] + 1), item[0]))
+    return [(dp.get('id') or dp.get('dp_id') or f"dp{index + 1}", dp) for index, dp in indexed]
+
+
+def declared_scoring(body):
+    """(declared_max, pass_score, pass_percent) from whichever fields exist"""
+    criteria = body.get('completion_criteria') or {}
+    scoring = body.get('scoring') if isinstance(body.get('scoring'), dict) else {}
+    declared_max = (criteria.get('points_possible') or body.get('max_score')
+                    or scoring.get('max_points') or scoring.get('max_possible_points') or scoring.get('max_score'))
+    pass_score = (body.get('passing_score') or scoring.get('passing_score')
+                  or scoring.get('passing_points'))
+    pass_percent = (criteria.get('pass_threshold') or scoring.get('passing_percentage')
+                    or scoring.get('passing_threshold'))
+    return declared_max, pass_score, pass_percent
+
+
+def analyze_scenario(body):
+    decisions = ordered_decisions(body)
+    ids = [dp_id for dp_id, _ in decisions]
+    known = set(ids)
+    issues = []
+    table = {}
+    edges = {}
+
+    for position, (dp_id, dp) in enumerate(decisions):
+        fallthrough = ids[position + 1] if position + 1 < len(ids) else END
+        options = [o for o in dp.get('options') or [] if isinstance(o, dict)]
+        scored = [(o, option_points(o)) for o in options]
+        best = max((points for _, points in scored), default=0)
+        marked = [o.get('id') for o, _ in scored if _is_marked(o)]
+
+        if len(options) < 2:
+            issues.append({'dp': dp_id, 'issue': 'fewer than two options'})
+        elif len({points for _, points in scored}) == 1:
+            issues.append({'dp': dp_id, 'issue': 'all options score the same'})
+        if options and not marked:
+            issues.append({'dp': dp_id, 'issue': 'no optimal option marked'})
+        elif len(marked) > 1:
+            issues.append({'dp': dp_id, 'issue': f"{len(marked)} options marked optimal"})
+        if any(points > option_points(o) for o in options if _is_marked(o) for _, points in scored):
+            issues.append({'dp': dp_id, 'issue': 'marked optimal option is not the highest scoring'})
+        option_ids = [o.get('id') for o in options]
+        if len(set(option_ids)) != len(option_ids):
+            issues.append({'dp': dp_id, 'issue': 'duplicate option IDs'})
+
+        entry = {'seq': position + 1, 'best': best, 'options': {}}
+        targets = set()
+        for option, points in scored:
+            target = option['next_dp'] if 'next_dp' in option else fallthrough
+            if target is not END and target not in known:
+                issues.append({'dp': dp_id, 'issue': f"option {option.get('id')} points to unknown {target}"})
+                target = END
+            targets.add(target)
+            optimal = 1 if (_is_marked(option) if marked else points == best) else 0
+            entry['options'][option.get('id')] = [points, points - best, optimal, target]
+        table[dp_id] = entry
+        edges[dp_id] = [(o_id, row[0], row[3]) for o_id, row in entry['options'].items()]
+
+    start = ids[0] if ids else None
+    reachable = set()
+    stack = [start] if start else []
+    while stack:
+        node = stack.pop()
+        if node in reachable:
+            continue
+        reachable.add(node)
+        stack.extend(t for _, _, t in edges[node] if t is not END)
+    for dp_id in ids:
+        if dp_id not in reachable:
+            issues.append({'dp': dp_id, 'issue': 'unreachable from the first decision point'})
+
+    # Longest / shortest path and path count over the DAG (memoised DFS)
+    best_score, worst_score, path_count, choice = {}, {}, {}, {}
+    cyclic = False
+    visiting = set()
+
+    def solve(node):
+        nonlocal cyclic
+        if node is END:
+            return 0, 0, 1
+        if node in best_score:
+            return best_score[node], worst_score[node], path_count[node]
+        if node in visiting:
+            cyclic = True
+            return 0, 0, 0
+        visiting.add(node)
+        high, low, count, pick = -math.inf, math.inf, 0, None
+        for option_id, points, target in edges[node]:
+            sub_high, sub_low, sub_count = solve(target)
+            if points + sub_high > high:
+                high, pick = points + sub_high, option_id
+            low = min(low, points + sub_low)
+            count += sub_count
+        visiting.discard(node)
+        if pick is None:
+            high = low = 0
+        best_score[node], worst_score[node], path_count[node], choice[node] = high, low, count, pick
+        return high, low, count
+
+    max_score, min_score, paths = solve(start) if start else (0, 0, 0)
+    if cyclic:
+        issues.append({'dp': None, 'issue': 'decision graph has a cycle'})
+
+    optimal_path = []
+    node = start
+    while node is not END and node not in optimal_path and choice.get(node):
+        optimal_path.append(node)
+        node = table[node]['options'][choice[node]][3]
+
+    declared_max, pass_score, pass_percent = declared_scoring(body)
+    if pass_score is None and pass_percent is not None:
+        pass_score = math.ceil((declared_max or max_score) * pass_percent / 100)
+    if pass_percent is None and pass_score is not None and (declared_max or max_score):
+        pass_percent = round(pass_score * 100 / (declared_max or max_score), 1)
+    if declared_max is not None and declared_max != max_score:
+        issues.append({'dp': None, 'issue': f"declared max {declared_max} but best path scores {max_score}"})
+    if pass_score is not None and pass_score > max_score:
+        issues.append({'dp': None, 'issue': f"pass score {pass_score} is above the reachable maximum {max_score}"})
+
+    thresholds = body.get('outcome_thresholds') if isinstance(body.get('outcome_thresholds'), dict) else {}
+    tiers = sorted(([t['min_score'], name] for name, t in thresholds.items()
+                    if isinstance(t, dict) and isinstance(t.get('min_score'), (int, float))), reverse=True)
+
+    return {
+        'start': start,
+        'max_score': max_score,
+        'min_score': min_score,
+        'optimal_path': optimal_path,
+        'paths': paths,
+        'declared_max': declared_max,
+        'pass_score': pass_score,
+        'pass_percent': pass_percent,
+        'tiers': tiers,
+        'decisions': table,
+        'issues': issues,
+    }
+
+
+def build_scoring_tables(corpus, output_dir, options=None):
+    """Build stage: write scoring/tables.json. Returns the tables."""
+    compact = (options or {}).get('compact', False)
+    scenarios = {}
+    for doc in sorted(corpus, key=lambda doc: doc['id'] or ''):
+        if doc['type'] not in SCENARIO_TYPES or not doc['id']:
+            continue
+        body = unwrap(doc['data'])
+        if isinstance(body, dict):
+            scenarios[doc['id']] = dict(analyze_scenario(body), type=doc['type'], path=doc['path'])
+    tables = {
+        'version': 1,
+        'fields': OPTION_FIELDS,
+        'scenarios': scenarios,
+    }
+    write_json(os.path.join(output_dir, TABLES_PATH), tables, compact)
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute simulation scoring tables")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SIMULATION SCORING TABLES")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, SCENARIO_TYPES)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    tables = build_scoring_tables(corpus, args.source, {'compact': args.minify})
+
+    flagged = {sid: s for sid, s in tables['scenarios'].items() if s['issues']}
+    print(f"  ✅ {len(tables['scenarios'])} scenarios analysed")
+    if flagged:
+        print(f"  ⚠️ {len(flagged)} scenarios with issues")
+        for sid, scenario in list(flagged.items())[:10]:
+            first = scenario['issues'][0]
+            where = f" {first['dp']}" if first['dp'] else ''
+            more = f" (+{len(scenario['issues']) - 1} more)" if len(scenario['issues']) > 1 else ''
+            print(f"     - {sid}{where}: {first['issue']}{more}")
+        if len(flagged) > 10:
+            print(f"     ... and {len(flagged) - 10} more")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
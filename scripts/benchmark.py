@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Content Pipeline Benchmark
+
+Times the pipeline phases per content type so a content or code change
+that slows publishing shows up before it ships:
+
+    load        read + json parse
+    transform   the content_build.py transforms (lessons only today)
+    validate    validate_content.py schema + rules
+    serialise   json dump, repo format and minified
+    compress    gzip -9; gzip_bytes records the compressed size
+    brotli      brotli, only when installed; brotli_bytes likewise
+                (a separate phase, so compress timings and sizes compare
+                like with like on machines with and without brotli)
+
+Each phase records wall time, CPU time, files and bytes per content type.
+Corpora:
+- real       the data/ tree (--source)
+- synthetic  every source file copied --scale times into a temp dir, so
+             growth in per-document cost is visible at larger sizes
+
+Every corpus runs in a fresh worker process so its peak RSS
+(resource.getrusage) is its own; --repeat N keeps the fastest of N runs
+per phase. --trace-memory also records the tracemalloc peak per phase
+(slower, so off by default).
+
+Results are appended to build/benchmarks/history.json. Each run is
+compared with the baseline (build/benchmarks/baseline.json when saved with
+--save-baseline, otherwise the previous run of the same corpus); phases
+slower by more than --threshold (and by at least MIN_DELTA seconds) are
+flagged, and --fail-on-regression turns flags into exit code 1.
+
+Usage:
+    python scripts/benchmark.py [--scale 10] [--repeat 3] [--save-baseline] [--fail-on-regression]
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from content_build import apply_transforms
+from content_repo import BUILD_DIR, DATA_DIR, ROOT_DIR, discover_documents, dump_json, read_json, write_json
+from validate_content import check_document
+
+try:
+    import brotli
+except ImportError:  # optional - brotli timings are skipped without it
+    brotli = None
+
+BENCH_DIR = os.path.join(BUILD_DIR, 'benchmarks')
+HISTORY_PATH = os.path.join(BENCH_DIR, 'history.json')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+PHASES = ['load', 'transform', 'validate', 'serialise', 'compress', 'brotli']
+# Output sizes some phases record next to their input bytes
+SIZE_FIELDS = {'compress': 'gzip_bytes', 'brotli': 'brotli_bytes'}
+DEFAULT_THRESHOLD = 0.20
+MIN_DELTA = 0.005
+
+
+# ================================================
+# CORPORA
+# ================================================
+
+def make_synthetic(source_dir, target_dir, scale):
+    """Copy every source document `scale` times under target_dir"""
+    for entry in discover_documents(source_dir):
+        src = os.path.join(source_dir, entry['path'])
+        stem, ext = os.path.splitext(entry['path'])
+        for copy_no in range(scale):
+            dst = os.path.join(target_dir, f"{stem}_x{copy_no:04d}{ext}")
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copyfile(src, dst)
+
+
+# ================================================
+# MEASUREMENT
+# ================================================
+
+class PhaseTimer:
+    """Accumulates wall/CPU time (and optionally tracemalloc peak) per (type, phase)"""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.results = {}
+
+    def measure(self, content_type, phase, func, *args):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        value = func(*args)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        entry = self.results.setdefault(content_type, {}).setdefault(
+            phase, {'wall': 0.0, 'cpu': 0.0, 'files': 0, 'bytes': 0})
+        entry['wall'] += wall
+        entry['cpu'] += cpu
+        entry['files'] += 1
+        if self.trace_memory:
+            entry['peak_traced'] = max(entry.get('peak_traced', 0), tracemalloc.get_traced_memory()[1])
+        return value, entry
+
+
+def _load(filepath):
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return raw, json.loads(raw.decode('utf-8'))
+
+
+def _serialise(data):
+    return dump_json(data).encode('utf-8'), dump_json(data, compact=True).encode('utf-8')
+
+
+def _gzip_size(raw):
+    return len(gzip.compress(raw, compresslevel=9, mtime=0))
+
+
+def _brotli_size(raw):
+    return len(brotli.compress(raw))
+
+
+def run_pipeline(source_dir, trace_memory=False):
+    """One timed pass over a corpus. Returns {'types': ..., 'errors': n}."""
+    timer = PhaseTimer(trace_memory)
+    errors = 0
+    if trace_memory:
+        tracemalloc.start()
+    for entry in discover_documents(source_dir):
+        content_type = entry['type']
+        try:
+            (raw, data), load = timer.measure(content_type, 'load', _load,
+                                              os.path.join(source_dir, entry['path']))
+        except ValueError:
+            errors += 1
+            continue
+        load['bytes'] += len(raw)
+
+        working = copy.deepcopy(data)
+        timer.measure(content_type, 'transform', apply_transforms, working, content_type)
+        timer.measure(content_type, 'validate', check_document, working, content_type, entry['filename'])
+        (pretty, compact), serialise = timer.measure(content_type, 'serialise', _serialise, working)
+        serialise['bytes'] += len(compact)
+        compressors = [('compress', _gzip_size)] + ([('brotli', _brotli_size)] if brotli is not None else [])
+        for phase, compressor in compressors:
+            size, entry = timer.measure(content_type, phase, compressor, compact)
+            entry['bytes'] += len(compact)
+            entry[SIZE_FIELDS[phase]] = entry.get(SIZE_FIELDS[phase], 0) + size
+    if trace_memory:
+        tracemalloc.stop()
+    return {'types': timer.results, 'errors': errors}
+
+
+def _best_of(runs):
+    """Per (type, phase), keep the fastest run"""
+    best = copy.deepcopy(runs[0])
+    for run in runs[1:]:
+        for content_type, phases in run['types'].items():
+            for phase, entry in phases.items():
+                current = best['types'][content_type][phase]
+                if entry['wall'] < current['wall']:
+                    best['types'][content_type][phase] = entry
+    return best
+
+
+def _totals(types):
+    totals = {}
+    for phases in types.values():
+        for phase, entry in phases.items():
+            total = totals.setdefault(phase, {'wall': 0.0, 'cpu': 0.0, 'files': 0, 'bytes': 0})
+            for key in ('wall', 'cpu', 'files', 'bytes', SIZE_FIELDS.get(phase)):
+                if key in entry:
+                    total[key] = total.get(key, 0) + entry[key]
+    return {phase: totals[phase] for phase in PHASES if phase in totals}
+
+
+def benchmark_corpus(task):
+    """Worker: run the pipeline `repeat` times over one corpus in a fresh process"""
+    label, source_dir, repeat, trace_memory = task
+    runs = [run_pipeline(source_dir, trace_memory) for _ in range(repeat)]
+    result = _best_of(runs)
+    for phases in result['types'].values():
+        for entry in phases.values():
+            entry['wall'] = round(entry['wall'], 6)
+            entry['cpu'] = round(entry['cpu'], 6)
+    return {
+        'corpus': label,
+        'documents': sum(p['load']['files'] for p in result['types'].values()),
+        'errors': result['errors'],
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'totals': _totals(result['types']),
+        'types': dict(sorted(result['types'].items())),
+    }
+
+
+def run_in_fresh_process(task):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(benchmark_corpus, task).result()
+
+
+# ================================================
+# HISTORY / REGRESSIONS
+# ================================================
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    try:
+        return read_json(path)
+    except (ValueError, OSError):
+        return []
+
+
+def find_baseline(corpus, history, baseline_path=BASELINE_PATH):
+    """Saved baseline for this corpus, else the latest earlier run of it"""
+    try:
+        saved = read_json(baseline_path)
+        if corpus in saved:
+            return saved[corpus]
+    except (ValueError, OSError):
+        pass
+    previous = [run for run in history if run['corpus'] == corpus]
+    return previous[-1] if previous else None
+
+
+def compare(result, baseline, threshold=DEFAULT_THRESHOLD):
+    """Phases (total and per type) slower than baseline by more than threshold"""
+    regressions = []
+    if not baseline:
+        return regressions
+
+    def check(scope, phase, now, before):
+        delta = now['wall'] - before['wall']
+        if before['wall'] > 0 and delta > MIN_DELTA and delta / before['wall'] > threshold:
+            regressions.append({
+                'scope': scope, 'phase': phase,
+                'baseline': round(before['wall'], 4), 'current': round(now['wall'], 4),
+                'change': round(delta / before['wall'], 3),
+            })
+
+    for phase, now in result['totals'].items():
+        if phase in baseline['totals']:
+            check('total', phase, now, baseline['totals'][phase])
+    for content_type, phases in result['types'].items():
+        for phase, now in phases.items():
+            before = baseline['types'].get(content_type, {}).get(phase)
+            if before:
+                check(content_type, phase, now, before)
+    return regressions
+
+
+def print_result(result):
+    print(f"\n  📊 {result['corpus']}: {result['documents']} documents, "
+          f"peak RSS {result['peak_rss_kb'] / 1024:.1f} MB")
+    print(f"     {'phase':<12}{'wall (s)':>10}{'cpu (s)':>10}{'MB':>9}")
+    for phase, entry in result['totals'].items():
+        print(f"     {phase:<12}{entry['wall']:>10.3f}{entry['cpu']:>10.3f}{entry['bytes'] / 1048576:>9.1f}")
+    slowest = sorted(((entry['wall'], content_type, phase)
+                      for content_type, phases in result['types'].items()
+                      for phase, entry in phases.items()), reverse=True)[:3]
+    print("     slowest: " + ", ".join(f"{t}/{p} {w:.3f}s" for w, t, p in slowest))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the content pipeline")
+    parser.add_argument('--source', default=DATA_DIR, help="real corpus directory")
+    parser.add_argument('--scale', type=int, default=10, help="synthetic corpus multiplier (0 = skip)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per corpus; the fastest is kept")
+    parser.add_argument('--trace-memory', action='store_true', help="record tracemalloc peak per phase")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="regression threshold (0.2 = 20%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit 1 when a regression is flagged")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONTENT PIPELINE BENCHMARK")
+    print("=" * 80)
+
+    history = load_history()
+    meta = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'brotli': brotli is not None,
+    }
+
+    results = []
+    tasks = [('real', args.source, args.repeat, args.trace_memory)]
+    with tempfile.TemporaryDirectory(prefix='bench-') as synthetic_dir:
+        if args.scale > 0:
+            make_synthetic(args.source, synthetic_dir, args.scale)
+            tasks.append((f"synthetic-x{args.scale}", synthetic_dir, args.repeat, args.trace_memory))
+        for task in tasks:
+            results.append(dict(meta, **run_in_fresh_process(task)))
+
+    flagged = False
+    for result in results:
+        print_result(result)
+        result['regressions'] = compare(result, find_baseline(result['corpus'], history), args.threshold)
+        for reg in result['regressions']:
+            flagged = True
+            print(f"     ⚠️ regression {reg['scope']}/{reg['phase']}: "
+                  f"{reg['baseline']:.3f}s -> {reg['current']:.3f}s (+{reg['change'] * 100:.0f}%)")
+        if not result['regressions']:
+            print("     ✅ no regressions against baseline")
+
+    write_json(HISTORY_PATH, history + results)
+    if args.save_baseline:
+        write_json(BASELINE_PATH, {result['corpus']: result for result in results})
+        print(f"\n  📌 Baseline saved: {BASELINE_PATH}")
+    print(f"\n  📄 History: {HISTORY_PATH} ({len(history) + len(results)} runs)")
+    return 1 if flagged and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Domain Bundle Generator
+
+DataLoader.loadAll fetches every lesson, simulation and remediation file
+one at a time - roughly 100 sequential round trips before the app is
+usable. This stage groups the built documents into a handful of bundles:
+
+    bundles/D1.lessons.json       bundles/D1.simulations.json
+    bundles/D1.remediation.json   ...
+    bundles/shared.questions.json (questions, question bank, PBQs, glossary)
+    bundles/shared.tools.json     (tool labs and the Linux guide)
+
+plus bundles/manifest.json listing each bundle's type, domain, document
+IDs, byte size and content hash so the loader can fetch them in parallel.
+--profile writes a per-bundle timing report under build/profile/bundles/.
+
+Usage:
+    python scripts/build_bundles.py [--source build/data] [--profile]
+"""
+
+import argparse
+import contextlib
+import os
+import time
+
+from content_repo import BUILD_DIR, hash_bytes, load_corpus, write_json
+from profiling import Profiler, print_summary as print_profile
+
+# content_type -> bundle type; unlisted types are not bundled
+BUNDLE_TYPES = {
+    'lesson': 'lessons',
+    'simulation': 'simulations',
+    'remediation': 'remediation',
+    'questions': 'questions',
+    'question_bank': 'questions',
+    'pbqs': 'questions',
+    'glossary': 'questions',
+    'tool_lab': 'tools',
+    'guide': 'tools',
+}
+
+# Bundle types the loader needs on startup (tools are fetched lazily)
+STARTUP_TYPES = ['lessons', 'simulations', 'remediation', 'questions']
+
+BUNDLE_DIR = 'bundles'
+
+
+def bundle_name(bundle_type, domain):
+    return f"D{domain}.{bundle_type}" if domain else f"shared.{bundle_type}"
+
+
+def group_bundles(corpus):
+    """Group documents by (bundle name) preserving corpus order"""
+    groups = {}
+    for doc in corpus:
+        bundle_type = BUNDLE_TYPES.get(doc['type'])
+        if bundle_type is None:
+            continue
+        # Domain-less content and tool labs (which span domains) go to shared bundles
+        domain = doc['domain'] if bundle_type in ('lessons', 'simulations', 'remediation') else None
+        name = bundle_name(bundle_type, domain)
+        group = groups.setdefault(name, {'type': bundle_type, 'domain': domain, 'documents': []})
+        group['documents'].append(doc)
+    return groups
+
+
+def build_bundles(corpus, output_dir, options=None):
+    """Write every bundle plus manifest.json. Returns the manifest."""
+    compact = (options or {}).get('compact', False)
+    profiler = (options or {}).get('profiler')
+    memo = (options or {}).get('memo')
+    written = memo.setdefault('bundles', {}) if memo is not None else {}
+    groups = group_bundles(corpus)
+    bundles = []
+
+    for name in sorted(groups, key=lambda n: (groups[n]['domain'] is None, n)):
+        group = groups[name]
+        path = f"{BUNDLE_DIR}/{name}.json"
+        # In watch mode a bundle whose documents are all unchanged is not rewritten
+        token = tuple((doc['path'], doc['data']) for doc in group['documents'])
+        if name in written and written[name][0] == token and os.path.exists(os.path.join(output_dir, path)):
+            bundles.append(written[name][1])
+            continue
+        start = time.perf_counter()
+        payload = {
+            'bundle': name,
+            'type': group['type'],
+            'domain': group['domain'],
+            'documents': [
+                {'id': doc['id'], 'path': doc['path'], 'content_type': doc['type'], 'data': doc['data']}
+                for doc in group['documents']
+            ],
+        }
+        raw = write_json(os.path.join(output_dir, path), payload, compact)
+        if profiler:
+            profiler.record_file('bundles', path, time.perf_counter() - start)
+        written[name] = (token, {
+            'name': name,
+            'path': path,
+            'type': group['type'],
+            'domain': group['domain'],
+            'startup': group['type'] in STARTUP_TYPES,
+            'count': len(group['documents']),
+            'ids': [doc['id'] for doc in group['documents']],
+            'bytes': len(raw),
+            'hash': hash_bytes(raw),
+        })
+        bundles.append(written[name][1])
+
+    manifest = {
+        'version': 1,
+        'total_bytes': sum(b['bytes'] for b in bundles),
+        'bundles': bundles,
+    }
+    write_json(os.path.join(output_dir, BUNDLE_DIR, 'manifest.json'), manifest, compact)
+    return manifest
+
+
+def print_summary(manifest):
+    for b in manifest['bundles']:
+        flag = "🚀" if b['startup'] else "💤"
+        print(f"  {flag} {b['path']}: {b['count']} documents, {b['bytes'] / 1024:.0f} KB")
+    print(f"\n  📦 {len(manifest['bundles'])} bundles, {manifest['total_bytes'] / 1024:.0f} KB total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate per-domain content bundles")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    parser.add_argument('--profile', action='store_true', help="profile the stage, report under build/profile/")
+    args = parser.parse_args()
+    profiler = Profiler('bundles') if args.profile else None
+
+    print("=" * 80)
+    print("DOMAIN BUNDLES")
+    print("=" * 80)
+
+    with profiler.stage('load_corpus') if profiler else contextlib.nullcontext():
+        corpus, errors = load_corpus(args.source)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    with profiler.stage('bundles') if profiler else contextlib.nullcontext():
+        manifest = build_bundles(corpus, args.source, {'compact': args.minify, 'profiler': profiler})
+    print_summary(manifest)
+    if profiler:
+        print_profile(profiler.write())
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Content Catalog Projection
+
+The dashboard and lesson list only need a few fields per item, but the app
+loads all 41 full lessons (1.7 MB) to render them and app.js carries a
+hand-maintained ALL_LESSONS array that drifts from the real files. This
+stage projects the built documents into one small file:
+
+    catalog/catalog.json
+        lessons       id, title, subtitle, domain, difficulty, duration,
+                      minutes, objectives, sections [{id, title}]
+        simulations   id, title, domain, difficulty, duration, minutes,
+                      objectives, decisions
+        remediation   (same fields as simulations)
+        tool_labs     id, title, category, difficulty, duration, minutes,
+                      objectives, domains
+        domains       {domain: {counts, minutes, objectives}} per domain
+
+- duration is the authored text; minutes is [low, high] parsed from it
+  (or from the *_minutes fields), null when nothing parses
+- objectives come from objectives_covered, exam_objectives[].id or, for
+  tool labs, security_plus_relevance.objectives
+- tool labs count towards every domain in security_plus_relevance.domains
+
+Usage:
+    python scripts/catalog.py [--source build/data] [--minify]
+"""
+
+import argparse
+import os
+import re
+
+from content_repo import BUILD_DIR, load_corpus, unwrap, write_json
+
+CATALOG_PATH = 'catalog/catalog.json'
+# content_type -> catalog section
+SECTIONS = {
+    'lesson': 'lessons',
+    'simulation': 'simulations',
+    'remediation': 'remediation',
+    'tool_lab': 'tool_labs',
+}
+DURATION_PATTERN = re.compile(r'(\d+)(?:\s*-\s*(\d+))?\s*(hours?|hrs?|minutes?|mins?)', re.IGNORECASE)
+MINUTE_FIELDS = ['estimated_duration_minutes', 'time_estimate_minutes']
+DURATION_FIELDS = ['estimated_duration', 'time_estimate']
+
+
+def parse_minutes(text):
+    """[low, high] minutes from '90-120 minutes (core: 60 min)' / '2-3 hours', else None"""
+    match = DURATION_PATTERN.search(text or '')
+    if not match:
+        return None
+    scale = 60 if match.group(3).lower().startswith('h') else 1
+    low = int(match.group(1)) * scale
+    high = int(match.group(2)) * scale if match.group(2) else low
+    return [low, high]
+
+
+def duration(body):
+    """(authored text, [low, high] minutes) from whichever duration field exists"""
+    metadata = body.get('metadata') if isinstance(body.get('metadata'), dict) else {}
+    for field in MINUTE_FIELDS:
+        if isinstance(body.get(field), int):
+            return f"{body[field]} minutes", [body[field], body[field]]
+    for text in [body.get(field) for field in DURATION_FIELDS] + [metadata.get('estimated_time')]:
+        if isinstance(text, str) and text:
+            return text, parse_minutes(text)
+    return None, None
+
+
+def objectives(body):
+    if isinstance(body.get('objectives_covered'), list):
+        return [str(o) for o in body['objectives_covered']]
+    if isinstance(body.get('exam_objectives'), list):
+        return [str(o['id']) for o in body['exam_objectives'] if isinstance(o, dict) and o.get('id')]
+    relevance = body.get('security_plus_relevance')
+    if isinstance(relevance, dict) and isinstance(relevance.get('objectives'), list):
+        return [str(o) for o in relevance['objectives']]
+    return []
+
+
+def project(doc):
+    """Catalog entry for one document"""
+    body = unwrap(doc['data'])
+    metadata = body.get('metadata') if isinstance(body.get('metadata'), dict) else {}
+    text, minutes = duration(body)
+    entry = {
+        'id': doc['id'],
+        'title': body.get('title') or body.get('tool_name') or '',
+        'domain': doc['domain'],
+        'difficulty': body.get('difficulty') or metadata.get('difficulty'),
+        'duration': text,
+        'minutes': minutes,
+        'objectives': objectives(body),
+    }
+    if doc['type'] == 'lesson':
+        entry['subtitle'] = body.get('subtitle')
+        entry['sections'] = [
+            {'id': section.get('section_id'), 'title': section.get('title', '')}
+            for section in body.get('sections') or [] if isinstance(section, dict)
+        ]
+    elif doc['type'] in ('simulation', 'remediation'):
+        entry['decisions'] = len(body.get('decision_points') or [])
+    elif doc['type'] == 'tool_lab':
+        relevance = body.get('security_plus_relevance') if isinstance(body.get('security_plus_relevance'), dict) else {}
+        del entry['domain']
+        entry['category'] = body.get('tool_category')
+        entry['domains'] = [d for d in relevance.get('domains') or [] if isinstance(d, int)]
+    return entry
+
+
+def domain_aggregates(catalog):
+    domains = {}
+
+    def add(domain, section, entry):
+        if domain is None:
+            return
+        agg = domains.setdefault(str(domain), {
+            'counts': {name: 0 for name in SECTIONS.values()},
+            'minutes': {name: [0, 0] for name in SECTIONS.values()},
+            'objectives': set(),
+        })
+        agg['counts'][section] += 1
+        if entry['minutes']:
+            agg['minutes'][section][0] += entry['minutes'][0]
+            agg['minutes'][section][1] += entry['minutes'][1]
+        agg['objectives'].update(o for o in entry['objectives'] if o.startswith(f"{domain}."))
+
+    for section, entries in catalog.items():
+        for entry in entries:
+            for domain in entry['domains'] if section == 'tool_labs' else [entry['domain']]:
+                add(domain, section, entry)
+
+    for agg in domains.values():
+        agg['objectives'] = sorted(agg['objectives'], key=lambda o: [int(p) for p in o.split('.') if p.isdigit()])
+    return dict(sorted(domains.items()))
+
+
+def build_catalog(corpus, output_dir, options=None):
+    """Build stage: write catalog/catalog.json. Returns the catalog."""
+    compact = (options or {}).get('compact', False)
+    sections = {name: [] for name in SECTIONS.values()}
+    for doc in sorted(corpus, key=lambda doc: doc['id'] or ''):
+        if doc['type'] in SECTIONS and doc['id'] and isinstance(unwrap(doc['data']), dict):
+            sections[SECTIONS[doc['type']]].append(project(doc))
+    catalog = dict({'version': 1}, **sections, domains=domain_aggregates(sections))
+    write_json(os.path.join(output_dir, CATALOG_PATH), catalog, compact)
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project the built content into a lightweight catalog")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONTENT CATALOG")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, list(SECTIONS))
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    catalog = build_catalog(corpus, args.source, {'compact': args.minify})
+
+    for section in SECTIONS.values():
+        untimed = sum(1 for entry in catalog[section] if entry['minutes'] is None)
+        note = f" ({untimed} without a duration)" if untimed else ""
+        print(f"  ✅ {section}: {len(catalog[section])}{note}")
+    for domain, agg in catalog['domains'].items():
+        low = sum(m[0] for m in agg['minutes'].values())
+        high = sum(m[1] for m in agg['minutes'].values())
+        print(f"  📚 Domain {domain}: {agg['counts']['lessons']} lessons, {agg['counts']['simulations']} sims, "
+              f"{agg['counts']['remediation']} remediation, {agg['counts']['tool_labs']} tool labs, "
+              f"{low / 60:.1f}-{high / 60:.1f} h")
+    size = os.path.getsize(os.path.join(args.source, CATALOG_PATH))
+    print(f"\n  📦 {CATALOG_PATH}: {size / 1024:.1f} KB")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Cross-Corpus Referential Integrity Checker
+
+Lessons, simulations, remediation and tool labs point at each other by ID
+(related_content, skill_tree, next_recommended, weakness_mapping,
+next_steps, ...). A broken reference surfaces at runtime as a failed fetch
+or an empty panel. This check:
+
+1. Parses each document once and builds a global ID index:
+   document IDs and titles, plus decision point IDs scoped to their document
+2. Resolves every reference listed in REFERENCES against the index with
+   dictionary lookups, so the whole run is linear in corpus size
+
+A reference may be an ID, an "<ID> <title>" string, a {lesson_id|lesson|id}
+object or a document title; `_retry` suffixes resolve to the base ID.
+
+Reported:
+- dangling:   the target does not exist
+- ambiguous:  the target resolves to more than one document
+- orphaned:   a document nothing else references (warning)
+
+Output: build/reports/references.json. Exits 1 on dangling or ambiguous
+references.
+
+Usage:
+    python scripts/check_references.py [--source build/data]
+"""
+
+import argparse
+import os
+import re
+
+from content_repo import BUILD_DIR, load_corpus, unwrap, write_json
+
+REPORT_PATH = os.path.join(BUILD_DIR, 'reports', 'references.json')
+DOCUMENT_TYPES = ['lesson', 'simulation', 'remediation', 'tool_lab', 'guide']
+ID_PREFIX = re.compile(r'^([A-Z0-9]+(?:-[A-Z0-9]+)+)(?:_retry)?(?:\s|$)')
+
+# (content type, field path, scope): '[]' iterates a list; 'local' targets
+# are decision points of the same document
+SCENARIO_REFERENCES = [
+    ('prerequisites[]', 'global'),
+    ('unlocks[]', 'global'),
+    ('next_recommended', 'global'),
+    ('weakness_mapping[].suggested_simulation', 'global'),
+    ('weakness_mapping[].if_missed[]', 'local'),
+    ('weakness_mapping.provides_foundation_for[]', 'global'),
+]
+
+REFERENCES = {
+    'lesson': [
+        ('related_content.simulations[]', 'global'),
+        ('related_content.remediation[]', 'global'),
+        ('related_content.lessons[]', 'global'),
+        ('related_content.labs[]', 'global'),
+        ('related_content.next_lesson', 'global'),
+        ('related_content.previous_lesson', 'global'),
+        ('related_content.related_topics[].lesson', 'global'),
+        ('skill_tree.prerequisites[]', 'global'),
+        ('skill_tree.unlocks[]', 'global'),
+        ('skill_tree.related_concepts[].lesson', 'global'),
+        ('skill_tree.related_topics[].lesson', 'global'),
+    ],
+    'simulation': SCENARIO_REFERENCES,
+    'remediation': SCENARIO_REFERENCES,
+    'tool_lab': [
+        ('next_steps.related_labs[]', 'global'),
+        ('next_steps.related_lessons[]', 'global'),
+    ],
+}
+
+
+def select(value, path):
+    """Yield (concrete_path, value) for every match of a dotted field path"""
+    if not path:
+        yield '', value
+        return
+    head, _, rest = path.partition('.')
+    many = head.endswith('[]')
+    key = head[:-2] if many else head
+    if not isinstance(value, dict) or value.get(key) is None:
+        return
+    child = value[key]
+    if many:
+        if isinstance(child, list):
+            for index, item in enumerate(child):
+                for sub_path, found in select(item, rest):
+                    yield f"{key}[{index}]" + (f".{sub_path}" if sub_path else ''), found
+    else:
+        for sub_path, found in select(child, rest):
+            yield key + (f".{sub_path}" if sub_path else ''), found
+
+
+def reference_key(ref):
+    """Normalise one raw reference to the string to look up"""
+    if isinstance(ref, dict):
+        ref = ref.get('lesson_id') or ref.get('lesson') or ref.get('id')
+    if not isinstance(ref, str) or not ref.strip():
+        return None
+    return ref.strip()
+
+
+def _title_key(title):
+    return ' '.join(title.lower().split())
+
+
+def build_index(corpus):
+    """ID index: id -> [paths], title -> [ids], per-document local IDs"""
+    ids = {}
+    titles = {}
+    local = {}
+    for doc in corpus:
+        if doc['type'] not in DOCUMENT_TYPES or not doc['id']:
+            continue
+        body = unwrap(doc['data'])
+        ids.setdefault(doc['id'], []).append(doc['path'])
+        title = body.get('title') or body.get('tool_name') if isinstance(body, dict) else None
+        if isinstance(title, str) and title.strip():
+            titles.setdefault(_title_key(title), set()).add(doc['id'])
+        local[doc['path']] = {
+            dp.get('id') or dp.get('dp_id')
+            for dp in (body.get('decision_points') or []) if isinstance(dp, dict)
+        } if isinstance(body, dict) else set()
+    return {'ids': ids, 'titles': titles, 'local': local}
+
+
+def resolve(key, index):
+    """Return (status, targets) for a global reference"""
+    ids = index['ids']
+    candidates = [key]
+    match = ID_PREFIX.match(key)
+    if match:
+        candidates.append(match.group(1))
+    for candidate in candidates:
+        if candidate in ids:
+            return ('ambiguous' if len(ids[candidate]) > 1 else 'ok'), [candidate]
+    by_title = index['titles'].get(_title_key(key))
+    if by_title:
+        return ('ambiguous' if len(by_title) > 1 else 'ok'), sorted(by_title)
+    return 'dangling', []
+
+
+def check_references(corpus):
+    index = build_index(corpus)
+    dangling = []
+    ambiguous = []
+    inbound = {doc_id: 0 for doc_id in index['ids']}
+    checked = 0
+
+    for doc in corpus:
+        body = unwrap(doc['data'])
+        for path, scope in REFERENCES.get(doc['type'], []):
+            for field, raw in select(body, path):
+                key = reference_key(raw)
+                if key is None:
+                    continue
+                checked += 1
+                ref = {'from': doc['id'], 'path': doc['path'], 'field': field, 'ref': key}
+                if scope == 'local':
+                    if key not in index['local'].get(doc['path'], ()):
+                        dangling.append(ref)
+                    continue
+                status, targets = resolve(key, index)
+                if status == 'dangling':
+                    dangling.append(ref)
+                    continue
+                if status == 'ambiguous':
+                    ambiguous.append(dict(ref, candidates=targets if len(targets) > 1
+                                          else index['ids'][targets[0]]))
+                for target in targets:
+                    if target != doc['id']:
+                        inbound[target] += 1
+
+    duplicates = {doc_id: paths for doc_id, paths in index['ids'].items() if len(paths) > 1}
+    orphaned = sorted(doc_id for doc_id, count in inbound.items() if count == 0)
+    return {
+        'version': 1,
+        'totals': {
+            'documents': len(index['ids']),
+            'references': checked,
+            'dangling': len(dangling),
+            'ambiguous': len(ambiguous),
+            'orphaned': len(orphaned),
+        },
+        'duplicate_ids': duplicates,
+        'dangling': dangling,
+        'ambiguous': ambiguous,
+        'orphaned': orphaned,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cross-document references")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="content directory")
+    parser.add_argument('--report', default=REPORT_PATH, help="JSON report path")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("REFERENTIAL INTEGRITY")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, DOCUMENT_TYPES)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    report = check_references(corpus)
+    write_json(args.report, report)
+
+    totals = report['totals']
+    print(f"  ✅ {totals['references']} references across {totals['documents']} documents")
+    for label, items in (('dangling', report['dangling']), ('ambiguous', report['ambiguous'])):
+        if not items:
+            continue
+        print(f"\n  ❌ {len(items)} {label} references")
+        for ref in items[:10]:
+            print(f"     - {ref['from']} {ref['field']}: {ref['ref']}")
+        if len(items) > 10:
+            print(f"     ... and {len(items) - 10} more")
+    if report['orphaned']:
+        print(f"\n  ⚠️ {len(report['orphaned'])} documents nothing links to")
+        for doc_id in report['orphaned'][:10]:
+            print(f"     - {doc_id}")
+        if len(report['orphaned']) > 10:
+            print(f"     ... and {len(report['orphaned']) - 10} more")
+    print(f"\n  📄 Report: {args.report}")
+    return 1 if errors or totals['dangling'] or totals['ambiguous'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
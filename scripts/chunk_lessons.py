@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Section-Level Lesson Chunking
+
+A lesson file carries every section's content, deep_dive, career_spotlight,
+memory_hooks, micro_checks and knowledge_check, so the viewer downloads the
+whole 100+ KB document before it can render section one. This stage splits
+each built lesson into:
+
+    chunks/lessons/<lesson_id>/shell.json      metadata, introduction, skill_tree,
+                                               summary, related_content + section index
+    chunks/lessons/<lesson_id>/<section_id>.json   one per section
+    chunks/lessons/<lesson_id>/extras.json     hands_on_activity, what_would_you_do, labs
+    chunks/lessons/index.json                  lesson_id -> shell + chunk paths/sizes/hashes
+
+Sections without a section_id get a stable one from their position
+(e.g. D2-LESSON-004-S01).
+
+Usage:
+    python scripts/chunk_lessons.py [--source build/data] [--minify]
+"""
+
+import argparse
+import os
+import shutil
+
+from content_repo import BUILD_DIR, hash_bytes, load_corpus, write_json
+
+CHUNK_DIR = 'chunks/lessons'
+
+# Rendered after all sections, so fetched on demand with the extras chunk
+DEFERRED_KEYS = ['hands_on_activity', 'what_would_you_do', 'hands_on_labs', 'tools_and_technologies']
+
+
+def section_chunk_id(lesson_id, section, index):
+    return section.get('section_id') or f"{lesson_id}-S{index + 1:02d}"
+
+
+def _write_chunk(output_dir, path, payload, compact):
+    raw = write_json(os.path.join(output_dir, path), payload, compact)
+    return {'path': path, 'bytes': len(raw), 'hash': hash_bytes(raw)}
+
+
+def chunk_lesson(lesson_id, lesson, output_dir, compact=False):
+    """Write one lesson's shell, section and extras chunks. Returns its index entry."""
+    base = f"{CHUNK_DIR}/{lesson_id}"
+    sections = []
+    for index, section in enumerate(lesson.get('sections', [])):
+        section_id = section_chunk_id(lesson_id, section, index)
+        chunk = _write_chunk(output_dir, f"{base}/{section_id}.json",
+                             dict(section, section_id=section_id), compact)
+        sections.append(dict(chunk, section_id=section_id, title=section.get('title', ''),
+                             estimated_time=section.get('estimated_time')))
+
+    extras = {key: lesson[key] for key in DEFERRED_KEYS if key in lesson}
+    extras_chunk = _write_chunk(output_dir, f"{base}/extras.json", extras, compact) if extras else None
+
+    shell = {key: value for key, value in lesson.items()
+             if key != 'sections' and key not in DEFERRED_KEYS}
+    shell['section_index'] = [
+        {k: s[k] for k in ('section_id', 'title', 'estimated_time', 'path')} for s in sections
+    ]
+    shell['extras'] = extras_chunk['path'] if extras_chunk else None
+    shell_chunk = _write_chunk(output_dir, f"{base}/shell.json", shell, compact)
+
+    return {
+        'shell': shell_chunk,
+        'sections': sections,
+        'extras': extras_chunk,
+    }
+
+
+def build_lesson_chunks(corpus, output_dir, options=None):
+    """Build stage: chunk every lesson and write chunks/lessons/index.json"""
+    compact = (options or {}).get('compact', False)
+    memo = (options or {}).get('memo')
+    chunked = memo.setdefault('lesson_chunks', {}) if memo is not None else {}
+    chunk_root = os.path.join(output_dir, CHUNK_DIR)
+    if not chunked:
+        # Start clean so removed lessons/sections leave no stale chunks behind
+        shutil.rmtree(chunk_root, ignore_errors=True)
+    index = {}
+    for doc in corpus:
+        if doc['type'] != 'lesson':
+            continue
+        # In watch mode only lessons whose data changed are re-chunked
+        if doc['id'] in chunked and chunked[doc['id']][0] is doc['data']:
+            index[doc['id']] = chunked[doc['id']][1]
+            continue
+        shutil.rmtree(os.path.join(chunk_root, doc['id']), ignore_errors=True)
+        index[doc['id']] = chunk_lesson(doc['id'], doc['data'], output_dir, compact)
+        if memo is not None:
+            chunked[doc['id']] = (doc['data'], index[doc['id']])
+    for lesson_id in set(chunked) - set(index):
+        shutil.rmtree(os.path.join(chunk_root, lesson_id), ignore_errors=True)
+        del chunked[lesson_id]
+    write_json(os.path.join(output_dir, CHUNK_DIR, 'index.json'), {'version': 1, 'lessons': index}, compact)
+    return index
+
+
+def print_summary(index):
+    for lesson_id, entry in index.items():
+        largest = max((s['bytes'] for s in entry['sections']), default=0)
+        print(f"  ✅ {lesson_id}: shell {entry['shell']['bytes'] / 1024:.1f} KB, "
+              f"{len(entry['sections'])} sections (largest {largest / 1024:.1f} KB)")
+    total_shell = sum(e['shell']['bytes'] for e in index.values())
+    print(f"\n  📦 {len(index)} lessons, {total_shell / 1024:.0f} KB of shells")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split lessons into shell + section chunks")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("LESSON CHUNKS")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, ['lesson'])
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    print_summary(build_lesson_chunks(corpus, args.source, {'compact': args.minify}))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
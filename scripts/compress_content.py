@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Precompressed Content Output
+
+Writes .gz and .br siblings next to every built JSON file so a static
+server can serve them directly. .br needs the `brotli` package; without
+it the CLIs that compress (this one, content_build.py --minify and
+watch.py --minify) refuse to run unless --no-brotli says that .gz only
+is intended, so a missing install never silently ships without .br.
+
+Compression runs across a process pool (--jobs N) and is reused while a
+file's content hash is unchanged. The cache is kept per output directory
+(build/.cache/compress-<dir hash>.json).
+
+Siblings never outlive the bytes they encode: the build drops them when
+it rewrites or removes an output, a .gz-only run drops old .br files, and
+siblings whose JSON is gone are swept on every run.
+
+Reports per file:
+- raw:        size as pretty-printed JSON (indent=2, the repo's format)
+- minified:   size as built (compact when the build ran with --minify)
+- gzip/brotli compressed sizes
+
+Usage:
+    python scripts/compress_content.py [--source build/data] [--jobs N] [--no-brotli]
+"""
+
+import argparse
+import gzip
+import json
+import os
+
+from content_repo import BUILD_DIR, dump_json, hash_bytes, list_json_files, parallel_map, read_json, write_json
+
+try:
+    import brotli
+except ImportError:  # checked by require_brotli() before any CLI compresses
+    brotli = None
+
+CACHE_DIR = os.path.join(BUILD_DIR, '.cache')
+SIBLING_SUFFIXES = ('.gz', '.br')
+
+
+def cache_path_for(output_dir):
+    """One cache per output directory, like content_build's"""
+    key = hash_bytes(os.path.realpath(output_dir).encode('utf-8'))[:12]
+    return os.path.join(CACHE_DIR, f"compress-{key}.json")
+
+
+def compress_file(args):
+    """Compress one file unless its cached hash still matches. Returns its size report."""
+    output_dir, path, cached, use_brotli = args
+    filepath = os.path.join(output_dir, path)
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    content_hash = hash_bytes(raw)
+
+    siblings_exist = os.path.exists(filepath + '.gz') and (not use_brotli or os.path.exists(filepath + '.br'))
+    if cached and cached['hash'] == content_hash and siblings_exist and (cached['brotli'] or not use_brotli):
+        return dict(cached, path=path, cached=True)
+
+    report = {
+        'path': path,
+        'hash': content_hash,
+        'raw': len(dump_json(json.loads(raw.decode('utf-8'))).encode('utf-8')),
+        'minified': len(raw),
+        'gzip': None,
+        'brotli': None,
+        'cached': False,
+    }
+
+    # mtime=0 keeps the .gz bytes stable across builds
+    gz = gzip.compress(raw, compresslevel=9, mtime=0)
+    with open(filepath + '.gz', 'wb') as f:
+        f.write(gz)
+    report['gzip'] = len(gz)
+
+    if use_brotli:
+        br = brotli.compress(raw, quality=11)
+        with open(filepath + '.br', 'wb') as f:
+            f.write(br)
+        report['brotli'] = len(br)
+    elif os.path.exists(filepath + '.br'):
+        # Left by an earlier brotli run: it encodes the previous content
+        os.remove(filepath + '.br')
+
+    return report
+
+
+def compress_outputs(corpus, output_dir, options=None):
+    """Build stage: precompress every JSON file under output_dir (.br unless options['brotli'] is False)"""
+    options = options or {}
+    use_brotli = brotli is not None and options.get('brotli', True)
+    cache_path = cache_path_for(output_dir)
+    try:
+        cache = read_json(cache_path)
+    except (ValueError, OSError):
+        cache = {}
+    remove_orphaned_siblings(output_dir)
+
+    tasks = [(output_dir, path, cache.get(path), use_brotli) for path in list_json_files(output_dir)]
+    reports = parallel_map(compress_file, tasks, options.get('jobs', 1))
+
+    write_json(cache_path, {r['path']: {k: v for k, v in r.items() if k not in ('path', 'cached')}
+                            for r in reports})
+    return reports
+
+
+def require_brotli(no_brotli):
+    """False (after a loud warning) when .br output is wanted but brotli is not installed"""
+    if brotli is not None or no_brotli:
+        return True
+    print("❌ brotli is not installed, so no .br siblings can be written.")
+    print("   Install it (pip install brotli) or pass --no-brotli to ship .gz only.")
+    return False
+
+
+def remove_siblings(filepath):
+    """Drop the .gz/.br siblings of one output file"""
+    for suffix in SIBLING_SUFFIXES:
+        if os.path.exists(filepath + suffix):
+            os.remove(filepath + suffix)
+
+
+def _sibling_files(output_dir):
+    """Every .json.gz / .json.br under output_dir, as absolute paths"""
+    for root, dirs, files in os.walk(output_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for filename in files:
+            if filename.endswith(tuple('.json' + suffix for suffix in SIBLING_SUFFIXES)):
+                yield os.path.join(root, filename)
+
+
+def remove_orphaned_siblings(output_dir):
+    """Drop siblings whose JSON file no longer exists"""
+    for sibling in _sibling_files(output_dir):
+        if not os.path.exists(os.path.splitext(sibling)[0]):
+            os.remove(sibling)
+
+
+def remove_compressed(output_dir):
+    """Drop every .gz/.br sibling so a non-minified build never serves stale bytes"""
+    for sibling in list(_sibling_files(output_dir)):
+        os.remove(sibling)
+
+
+def print_summary(reports):
+    print(f"  {'file':<58} {'raw':>9} {'min':>9} {'gzip':>9} {'br':>9}")
+    for r in reports:
+        br = f"{r['brotli']:>9,}" if r['brotli'] is not None else f"{'-':>9}"
+        flag = "⏭️ " if r['cached'] else "✅"
+        print(f"{flag} {r['path']:<57} {r['raw']:>9,} {r['minified']:>9,} {r['gzip']:>9,} {br}")
+
+    with_brotli = any(r['brotli'] is not None for r in reports)
+    totals = {key: sum(r[key] or 0 for r in reports) for key in ('raw', 'minified', 'gzip', 'brotli')}
+    print(f"\n  📦 {len(reports)} files: raw {totals['raw'] / 1024:.0f} KB → "
+          f"minified {totals['minified'] / 1024:.0f} KB → gzip {totals['gzip'] / 1024:.0f} KB"
+          + (f" / brotli {totals['brotli'] / 1024:.0f} KB" if with_brotli else " (no brotli)"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompress built JSON content")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument('--no-brotli', action='store_true', help="write .gz siblings only")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PRECOMPRESSED CONTENT")
+    print("=" * 80)
+    if not require_brotli(args.no_brotli):
+        return 1
+    print_summary(compress_outputs(None, args.source, {'jobs': args.jobs, 'brotli': not args.no_brotli}))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
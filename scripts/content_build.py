@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Content Build Engine
+
+Replaces running the phase scripts one after another. Each document is
+loaded ONCE, every registered transform runs in memory in a fixed order,
+and the result is written ONCE to the build tree.
+
+Lesson transform order:
+1. d2_enhancements   - phase1_fix_d2_lessons (fills only what is missing)
+2. why_it_matters    - normalize_preserve: STRING → OBJECT
+3. skill_tree        - normalize_preserve: prerequisites/unlocks → OBJECT arrays
+4. subtitle          - normalize_preserve: add ONLY if missing
+5. connection        - normalize_preserve: connection_to_next ONLY if missing
+6. memory_hooks      - normalize_preserve: singular → plural keys
+7. hands_on_activity - phase_a1_hands_on (ONLY if missing)
+8. what_would_you_do - phase_a2_wwyd (ONLY if missing)
+
+All other content types are passed through unchanged.
+
+phase2_normalize_d345 is not run: normalize_preserve (steps 2-6) is its
+preservation-first replacement and covers the same D3-D5 normalisations.
+The two things phase2 did differently are left out on purpose - it replaced
+string why_it_matters with truncated template text, and it flattened
+memory_hooks.common_mistakes objects to strings, which
+enhanced-lesson-viewer.js cannot render (it reads cm.mistake/cm.correction).
+
+Build stages:
+After the document pass, the built corpus is parsed once and handed to
+each registered stage in STAGES (bundles, lesson chunks, catalog, content manifest, ...), which write derived
+artifacts under the output directory. --no-stages skips them.
+
+Minified output:
+--minify writes compact JSON everywhere and then precompresses every
+output to .gz/.br siblings (compress_content.py), in parallel with --jobs.
+Without the brotli package it stops before building; --no-brotli opts in
+to .gz only.
+
+Incremental builds:
+A cache per output directory (build/.cache/content-build-<dir hash>.json)
+records the sha256 of every input file, of the transform tables
+(LESSON_TITLES, SUBTITLES, CONNECTIONS, LESSON_ENHANCEMENTS,
+HANDS_ON_ACTIVITIES, WHAT_WOULD_YOU_DO) and transform code, and of every
+output. A document whose input and output hashes still match - and whose
+tables have not changed - is skipped without being parsed. A source that
+no longer parses, or no longer exists, has its previous output (and its
+.gz/.br siblings) removed, so stages and publish never see a stale copy.
+Deleted sources are found by listing the output tree, since --force and
+a tables change start from an empty cache.
+
+Profiling:
+--profile runs in-process (--jobs 1) with cProfile and tracemalloc around
+the document pass and each stage, times every file and every transform,
+and writes build/profile/content_build/ (see profiling.py). Combine with
+--force, or cached documents show up as near-zero.
+
+Usage:
+    python scripts/content_build.py [--source data] [--output build/data] [--force] [--jobs N] [--minify [--no-brotli]] [--no-stages] [--register-ordinals] [--profile]
+
+--jobs N runs per-document work on N worker processes (0 = one per CPU).
+Reports are merged in path order, so output is identical for any N.
+--register-ordinals writes ordinals for new question ids back to
+<source>/questions/ordinals.json (see question_bank.py); without it the
+registry is only read.
+"""
+
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import time
+
+from analyze_simulations import SCENARIO_TYPES, build_scoring_tables
+from build_bundles import BUNDLE_TYPES, build_bundles
+from catalog import SECTIONS as CATALOG_TYPES, build_catalog
+from chunk_lessons import build_lesson_chunks
+from compress_content import compress_outputs, print_summary as print_compression, remove_compressed, remove_siblings, require_brotli
+from content_manifest import build_content_manifest
+from content_repo import (
+    BUILD_DIR,
+    DATA_DIR,
+    discover_documents,
+    document_id,
+    hash_bytes,
+    hash_file,
+    hash_json,
+    load_corpus,
+    parallel_map,
+    read_json,
+    write_json,
+)
+from curriculum_graph import NODE_TYPES, build_curriculum_graph
+from dedupe_questions import POOL_TYPES as DEDUPE_SOURCES, build_question_dedupe
+from exam_forms import SOURCE_TYPES as EXAM_SOURCES, build_exam_forms
+from glossary_index import SOURCE_ORDER as GLOSSARY_SOURCES, build_glossary_index
+import normalize_preserve
+from normalize_preserve import (
+    CONNECTIONS,
+    LESSON_TITLES,
+    SUBTITLES,
+    add_connection_if_missing,
+    add_subtitle_if_missing,
+    convert_skill_tree_prereqs,
+    convert_skill_tree_unlocks,
+    convert_why_it_matters,
+    normalize_memory_hooks_in_section,
+)
+from phase1_fix_d2_lessons import LESSON_ENHANCEMENTS
+from phase_a1_hands_on import HANDS_ON_ACTIVITIES
+from phase_a2_wwyd import WHAT_WOULD_YOU_DO
+from profiling import Profiler, print_summary as print_profile
+from question_bank import SOURCE_TYPES as QUESTION_SOURCES, build_question_bank
+from search_index import build_search_index
+
+
+# ================================================
+# LESSON TRANSFORMS
+# Each takes (lesson, lesson_id) and returns a list of change labels
+# ================================================
+
+def apply_d2_enhancements(lesson, lesson_id):
+    """Fill every phase1 D2 enhancement ONLY if missing: intro goals and
+    why_it_matters, hands_on_activity, what_would_you_do, section extras and
+    summary.connection_to_next"""
+    enh = LESSON_ENHANCEMENTS.get(lesson_id)
+    if not enh:
+        return []
+
+    changes = []
+    intro = lesson.setdefault('introduction', {})
+    for key in ('learning_goals', 'why_it_matters'):
+        if key in enh and not intro.get(key):
+            intro[key] = enh[key]
+            changes.append(key)
+
+    # Runs before hands_on_activity/what_would_you_do/connection below, so the
+    # phase1 versions win for D2, as they did when phase1 ran first
+    for key in ('hands_on_activity', 'what_would_you_do'):
+        if key in enh and not lesson.get(key):
+            lesson[key] = enh[key]
+            changes.append(key)
+
+    connection = enh.get('summary_addition', {}).get('connection_to_next')
+    summary = lesson.setdefault('summary', {})
+    if connection and not summary.get('connection_to_next'):
+        summary['connection_to_next'] = connection
+        changes.append('connection_to_next')
+
+    for section_id, additions in enh.get('section_additions', {}).items():
+        for section in lesson.get('sections', []):
+            if section.get('section_id') != section_id:
+                continue
+            for key, value in additions.items():
+                if not section.get(key):
+                    section[key] = value
+                    changes.append(f"{section_id}.{key}")
+
+    return changes
+
+
+def _status_change(label, result):
+    changed, status = result
+    return [f"{label}:{status}"] if changed else []
+
+
+def transform_why_it_matters(lesson, lesson_id):
+    return _status_change('why_it_matters', convert_why_it_matters(lesson))
+
+
+def transform_skill_tree(lesson, lesson_id):
+    return (_status_change('prereqs', convert_skill_tree_prereqs(lesson)) +
+            _status_change('unlocks', convert_skill_tree_unlocks(lesson)))
+
+
+def transform_subtitle(lesson, lesson_id):
+    return _status_change('subtitle', add_subtitle_if_missing(lesson, lesson_id))
+
+
+def transform_connection(lesson, lesson_id):
+    return _status_change('connection', add_connection_if_missing(lesson, lesson_id))
+
+
+def transform_memory_hooks(lesson, lesson_id):
+    count = sum(1 for section in lesson.get('sections', [])
+                if normalize_memory_hooks_in_section(section))
+    return [f"memory_hooks:{count}_sections"] if count else []
+
+
+def transform_hands_on(lesson, lesson_id):
+    activity = HANDS_ON_ACTIVITIES.get(lesson_id)
+    if activity and not lesson.get('hands_on_activity'):
+        lesson['hands_on_activity'] = activity
+        return ['hands_on_activity:added']
+    return []
+
+
+def transform_wwyd(lesson, lesson_id):
+    scenario = WHAT_WOULD_YOU_DO.get(lesson_id)
+    if scenario and not lesson.get('what_would_you_do'):
+        lesson['what_would_you_do'] = scenario
+        return ['what_would_you_do:added']
+    return []
+
+
+LESSON_TRANSFORMS = [
+    ('d2_enhancements', apply_d2_enhancements),
+    ('why_it_matters', transform_why_it_matters),
+    ('skill_tree', transform_skill_tree),
+    ('subtitle', transform_subtitle),
+    ('connection', transform_connection),
+    ('memory_hooks', transform_memory_hooks),
+    ('hands_on_activity', transform_hands_on),
+    ('what_would_you_do', transform_wwyd),
+]
+
+# content_type -> ordered transforms
+TRANSFORMS = {
+    'lesson': LESSON_TRANSFORMS,
+}
+
+
+def apply_transforms(doc, content_type, timings=None):
+    """Run the registered transforms for a content type in order
+    When a timings dict is given, seconds per transform name are added to it.
+    """
+    changes = []
+    doc_id = document_id(doc) or ''
+    for name, transform in TRANSFORMS.get(content_type, []):
+        start = time.perf_counter()
+        changes.extend(transform(doc, doc_id))
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+    return changes
+
+
+# ================================================
+# BUILD CACHE
+# ================================================
+
+CACHE_DIR = os.path.join(BUILD_DIR, '.cache')
+
+
+def cache_path_for(output_dir):
+    """One cache per output directory: a hit means the output exists in THAT tree"""
+    key = hash_bytes(os.path.realpath(output_dir).encode('utf-8'))[:12]
+    return os.path.join(CACHE_DIR, f"content-build-{key}.json")
+
+
+def transform_tables_hash(compact=False):
+    """Hash of every table the transforms read, the transform code and order, and the output format"""
+    return hash_json({
+        'format': 'compact' if compact else 'indent2',
+        'transforms': {t: [name for name, _ in steps] for t, steps in TRANSFORMS.items()},
+        'code': {name: inspect.getsource(transform) for steps in TRANSFORMS.values() for name, transform in steps},
+        'normalize_preserve': inspect.getsource(normalize_preserve),
+        'LESSON_TITLES': LESSON_TITLES,
+        'SUBTITLES': SUBTITLES,
+        'CONNECTIONS': CONNECTIONS,
+        'LESSON_ENHANCEMENTS': LESSON_ENHANCEMENTS,
+        'HANDS_ON_ACTIVITIES': HANDS_ON_ACTIVITIES,
+        'WHAT_WOULD_YOU_DO': WHAT_WOULD_YOU_DO,
+    })
+
+
+def load_cache(cache_path, tables_hash):
+    """Return the per-file cache, or {} if missing, unreadable or built from other tables"""
+    try:
+        cache = read_json(cache_path)
+    except (ValueError, OSError):
+        return {}
+    if cache.get('tables_hash') != tables_hash:
+        return {}
+    return cache.get('files', {})
+
+
+def save_cache(cache_path, tables_hash, reports):
+    files = {
+        r['path']: {'input': r['input_hash'], 'output': r['output_hash'], 'changes': r['changes']}
+        for r in reports if not r['error']
+    }
+    write_json(cache_path, {'tables_hash': tables_hash, 'files': files})
+
+
+# ================================================
+# BUILD
+# ================================================
+
+def build_document(entry, source_dir, output_dir, cached=None, compact=False, keep_stale=False):
+    """Load, transform and write a single document. Returns its report entry.
+    keep_stale leaves the previous output of a source that fails in place (watch mode).
+    """
+    start = time.perf_counter()
+    report = {'path': entry['path'], 'type': entry['type'], 'changes': [], 'error': None,
+              'cached': False, 'input_hash': None, 'output_hash': None, 'seconds': 0.0, 'timings': {}}
+    output_path = os.path.join(output_dir, entry['path'])
+    try:
+        with open(os.path.join(source_dir, entry['path']), 'rb') as f:
+            raw = f.read()
+        report['input_hash'] = hash_bytes(raw)
+
+        if (cached and cached['input'] == report['input_hash']
+                and hash_file(output_path) == cached['output']):
+            report.update(cached=True, output_hash=cached['output'], changes=cached['changes'],
+                          seconds=time.perf_counter() - start)
+            return report
+
+        doc = json.loads(raw.decode('utf-8'))
+    except (ValueError, OSError) as e:
+        report['error'] = str(e)
+        # Never leave the last good output behind for a source that now fails
+        if not keep_stale and os.path.exists(output_path):
+            os.remove(output_path)
+            remove_siblings(output_path)
+            report['stale_removed'] = True
+        return report
+
+    report['changes'] = apply_transforms(doc, entry['type'], report['timings'])
+    report['output_hash'] = hash_bytes(write_json(output_path, doc, compact))
+    # The siblings encode the previous bytes; the compress stage rewrites them
+    remove_siblings(output_path)
+    report['seconds'] = time.perf_counter() - start
+    return report
+
+
+def _build_task(args):
+    return build_document(*args)
+
+
+def run_build(source_dir=DATA_DIR, output_dir=os.path.join(BUILD_DIR, 'data'),
+              cache_path=None, force=False, jobs=1, compact=False):
+    """Build every document under source_dir into output_dir, skipping unchanged inputs"""
+    cache_path = cache_path or cache_path_for(output_dir)
+    tables_hash = transform_tables_hash(compact)
+    cache = {} if force else load_cache(cache_path, tables_hash)
+    entries = discover_documents(source_dir)
+
+    tasks = [(entry, source_dir, output_dir, cache.get(entry['path']), compact) for entry in entries]
+    reports = parallel_map(_build_task, tasks, jobs)
+
+    # Drop outputs whose source file no longer exists. List the output tree
+    # rather than the cache, which is empty under --force or new tables.
+    current = {entry['path'] for entry in entries}
+    for entry in discover_documents(output_dir):
+        if entry['path'] not in current:
+            stale = os.path.join(output_dir, entry['path'])
+            os.remove(stale)
+            remove_siblings(stale)
+
+    save_cache(cache_path, tables_hash, reports)
+    return reports
+
+
+# ================================================
+# BUILD STAGES
+# Each takes (corpus, output_dir, options) and returns a summary
+# options: {'compact': bool, 'jobs': int, 'profiler': Profiler, 'memo': dict,
+#           'source_dir': str, 'register_ordinals': bool}
+# ================================================
+
+STAGES = [
+    ('bundles', build_bundles),
+    ('lesson_chunks', build_lesson_chunks),
+    ('search_index', build_search_index),
+    ('glossary', build_glossary_index),
+    # Writes bank/duplicates.json, which question_bank and exam_forms read
+    ('question_dedupe', build_question_dedupe),
+    ('question_bank', build_question_bank),
+    ('exam_forms', build_exam_forms),
+    ('curriculum_graph', build_curriculum_graph),
+    ('scoring_tables', build_scoring_tables),
+    ('catalog', build_catalog),
+    # The manifest lists the artifacts above, so it runs after them
+    ('manifest', build_content_manifest),
+]
+
+# Content types each stage reads; stages not listed (the manifest) always run.
+# Watch mode uses this to rerun only the stages a change can affect.
+STAGE_INPUTS = {
+    'bundles': set(BUNDLE_TYPES),
+    'lesson_chunks': {'lesson'},
+    'search_index': {'lesson', 'simulation', 'remediation', 'tool_lab', 'glossary'},
+    'glossary': set(GLOSSARY_SOURCES),
+    'question_dedupe': set(DEDUPE_SOURCES),
+    # Both also depend on the dedupe result, so they rerun whenever it does
+    'question_bank': set(QUESTION_SOURCES) | set(DEDUPE_SOURCES),
+    'exam_forms': set(EXAM_SOURCES) | set(DEDUPE_SOURCES),
+    'curriculum_graph': set(NODE_TYPES),
+    'scoring_tables': set(SCENARIO_TYPES),
+    'catalog': set(CATALOG_TYPES),
+}
+
+
+def run_stages(output_dir, options=None, corpus=None, changed_types=None):
+    """Parse the built corpus once and run every stage over it
+    options['profiler'] (a profiling.Profiler) profiles each stage separately.
+    A caller that keeps the corpus in memory passes it in, and changed_types
+    limits the run to stages whose STAGE_INPUTS include a changed type.
+    """
+    options = options or {}
+    profiler = options.get('profiler')
+
+    def profiled(name):
+        return profiler.stage(name) if profiler else contextlib.nullcontext()
+
+    if corpus is None:
+        with profiled('load_corpus'):
+            corpus, errors = load_corpus(output_dir)
+    results = {}
+    for name, stage in STAGES:
+        inputs = STAGE_INPUTS.get(name)
+        if changed_types is not None and inputs is not None and not inputs & set(changed_types):
+            continue
+        with profiled(name):
+            results[name] = stage(corpus, output_dir, options)
+    # Compression always runs last so it sees every artifact
+    with profiled('compress'):
+        if options.get('compact'):
+            results['compress'] = compress_outputs(corpus, output_dir, options)
+        else:
+            remove_compressed(output_dir)
+    return results
+
+
+def print_report(reports, output_dir):
+    changed = [r for r in reports if r['changes'] and not r['cached']]
+    cached = [r for r in reports if r['cached']]
+    errors = [r for r in reports if r['error']]
+
+    for r in changed:
+        print(f"✅ {r['path']}")
+        print(f"   Changes: {', '.join(r['changes'])}")
+    for r in errors:
+        note = " (previous output removed)" if r.get('stale_removed') else ""
+        print(f"❌ {r['path']}: {r['error']}{note}")
+
+    print("\n" + "=" * 80)
+    print(f"COMPLETE: {len(reports)} documents, {len(reports) - len(cached) - len(errors)} built, "
+          f"{len(cached)} unchanged (cached), {len(changed)} transformed, {len(errors)} errors")
+    print(f"Output: {output_dir}")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-pass content build")
+    parser.add_argument('--source', default=DATA_DIR, help="content source directory")
+    parser.add_argument('--output', default=os.path.join(BUILD_DIR, 'data'), help="build output directory")
+    parser.add_argument('--force', action='store_true', help="ignore the build cache and rebuild everything")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON plus .gz/.br siblings")
+    parser.add_argument('--no-brotli', action='store_true', help="with --minify, write .gz siblings only")
+    parser.add_argument('--no-stages', action='store_true', help="only run the document pass")
+    parser.add_argument('--register-ordinals', action='store_true',
+                        help="save ordinals for new question ids to <source>/questions/ordinals.json")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile each stage (implies --jobs 1), report under build/profile/")
+    args = parser.parse_args()
+    profiler = Profiler('content_build') if args.profile else None
+    if profiler and args.jobs != 1:
+        print("⚠️ --profile runs in-process: using --jobs 1")
+        args.jobs = 1
+
+    print("=" * 80)
+    print("CONTENT BUILD")
+    print("=" * 80)
+    print(f"Transforms: {', '.join(name for name, _ in LESSON_TRANSFORMS)}\n")
+    if args.minify and not args.no_stages and not require_brotli(args.no_brotli):
+        return 1
+
+    with profiler.stage('documents') if profiler else contextlib.nullcontext():
+        reports = run_build(args.source, args.output, force=args.force, jobs=args.jobs, compact=args.minify)
+    print_report(reports, args.output)
+
+    if not args.no_stages:
+        print(f"\nStages: {', '.join(name for name, _ in STAGES)}")
+        results = run_stages(args.output, {'compact': args.minify, 'brotli': not args.no_brotli, 'jobs': args.jobs,
+                                           'profiler': profiler, 'source_dir': args.source,
+                                           'register_ordinals': args.register_ordinals})
+        for name in results:
+            print(f"  ✅ {name}")
+        if 'compress' in results:
+            print()
+            print_compression(results['compress'])
+
+    if profiler:
+        for r in reports:
+            profiler.record_file('documents', r['path'], r['seconds'])
+            for name, seconds in r['timings'].items():
+                profiler.record_transform(name, seconds)
+        print_profile(profiler.write())
+    return 1 if any(r['error'] for r in reports) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Generated Content Manifest
+
+File lists are hand-maintained in DataLoader.get*Files(), SIMULATION_FILE_MAP
+in app.js and old files/content-manifest.js, and they drift. This stage scans
+the built tree and writes content-manifest.json with, for every document:
+
+    id, path, type, domain, title, bytes, compressed_bytes (gzip), hash (sha256)
+
+plus per-type listings (by_type) and every derived artifact written by the
+earlier stages (bundles, chunks, ...), so loaders can plan fetches and skip
+anything whose hash they already have cached.
+
+Usage:
+    python scripts/content_manifest.py [--source build/data] [--jobs N]
+"""
+
+import argparse
+import gzip
+import os
+
+from content_repo import BUILD_DIR, hash_bytes, hash_file, list_json_files, load_corpus, memo_map, unwrap, write_json
+
+MANIFEST_NAME = 'content-manifest.json'
+
+
+def measure_file(filepath):
+    """Byte size, gzip size and sha256 of one file"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return {
+        'bytes': len(raw),
+        'compressed_bytes': len(gzip.compress(raw, compresslevel=9, mtime=0)),
+        'hash': hash_bytes(raw),
+    }
+
+
+def document_title(data):
+    body = unwrap(data)
+    if isinstance(body, dict):
+        return body.get('title') or body.get('tool_name') or ''
+    return ''
+
+
+def build_content_manifest(corpus, output_dir, options=None):
+    """Build stage: write content-manifest.json for the built tree. Returns the manifest."""
+    options = options or {}
+    document_paths = [doc['path'] for doc in corpus]
+    known = set(document_paths) | {MANIFEST_NAME}
+    artifact_paths = [p for p in list_json_files(output_dir) if p not in known]
+
+    # In watch mode files whose bytes are unchanged keep their measurements
+    measured = memo_map(measure_file,
+                        [os.path.join(output_dir, p) for p in document_paths + artifact_paths],
+                        options, 'manifest', lambda path: (path, hash_file(path)))
+    sizes = dict(zip(document_paths + artifact_paths, measured))
+
+    documents = []
+    by_type = {}
+    for doc in corpus:
+        documents.append(dict({
+            'id': doc['id'],
+            'path': doc['path'],
+            'type': doc['type'],
+            'domain': doc['domain'],
+            'title': document_title(doc['data']),
+        }, **sizes[doc['path']]))
+        by_type.setdefault(doc['type'], []).append(doc['path'])
+
+    artifacts = [dict({'path': p, 'kind': p.split('/', 1)[0]}, **sizes[p]) for p in artifact_paths]
+
+    manifest = {
+        'version': 1,
+        'totals': {
+            'documents': len(documents),
+            'bytes': sum(d['bytes'] for d in documents),
+            'compressed_bytes': sum(d['compressed_bytes'] for d in documents),
+            'artifacts': len(artifacts),
+        },
+        'by_type': by_type,
+        'documents': documents,
+        'artifacts': artifacts,
+    }
+    write_json(os.path.join(output_dir, MANIFEST_NAME), manifest, options.get('compact', False))
+    return manifest
+
+
+def print_summary(manifest):
+    counts = {}
+    for doc in manifest['documents']:
+        stats = counts.setdefault(doc['type'], [0, 0, 0])
+        stats[0] += 1
+        stats[1] += doc['bytes']
+        stats[2] += doc['compressed_bytes']
+    for content_type, (count, size, compressed) in sorted(counts.items()):
+        print(f"  ✅ {content_type}: {count} documents, {size / 1024:.0f} KB ({compressed / 1024:.0f} KB gzip)")
+    totals = manifest['totals']
+    print(f"\n  📦 {totals['documents']} documents, {totals['bytes'] / 1024:.0f} KB; "
+          f"{totals['artifacts']} derived artifacts")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate content-manifest.json")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONTENT MANIFEST")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    print_summary(build_content_manifest(corpus, args.source, {'jobs': args.jobs}))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
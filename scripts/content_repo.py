@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Content Repository Helpers
+
+Shared discovery and I/O for the content build scripts:
+- Locates the data/ tree and the build/ output tree relative to the repo
+- Classifies every JSON document under data/ by content type
+- Resolves document IDs and domains across the different schemas
+  (lesson_id, scenario_id, simulation_id, {"scenario": {"id": ...}}, lab_id, guide_id)
+- Reads and writes JSON the same way the phase scripts always have
+- Fans per-file work out across a process pool (--jobs N), optionally
+  memoised per item for long-running processes (watch mode)
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+BUILD_DIR = os.path.join(ROOT_DIR, 'build')
+
+# Content subdirectories under data/, in load order
+CONTENT_DIRS = ['lessons', 'simulations', 'remediation', 'questions', 'tools']
+
+# (content_type, subdirectory, filename marker) - first match wins
+CONTENT_RULES = [
+    ('lesson', 'lessons', '-LESSON-'),
+    ('glossary', 'lessons', 'glossary'),
+    ('simulation', 'simulations', '-SIM-'),
+    ('simulation_collection', 'simulations', 'simulations'),
+    ('remediation', 'remediation', '-REM-'),
+    ('question_bank', 'questions', 'questionbank'),
+    ('questions', 'questions', 'questions'),
+    ('pbqs', 'questions', 'pbqs'),
+    ('tool_lab', 'tools', 'TOOL-LAB-'),
+    ('guide', 'tools', 'LINUX-GUIDE-'),
+]
+
+# ID fields in the order they are tried
+ID_KEYS = ['lesson_id', 'scenario_id', 'simulation_id', 'lab_id', 'guide_id', 'id']
+
+DOMAIN_PATTERN = re.compile(r'^D(\d)-')
+
+
+def classify(subdir, filename):
+    """Return the content type for a file under data/, or None"""
+    for content_type, rule_dir, marker in CONTENT_RULES:
+        if subdir == rule_dir and marker in filename:
+            return content_type
+    return None
+
+
+def discover_documents(data_dir=DATA_DIR, content_types=None):
+    """
+    List every known JSON document under data_dir
+    Returns sorted entries: {'path', 'type', 'filename', 'domain'}
+    """
+    entries = []
+    for subdir in CONTENT_DIRS:
+        full_dir = os.path.join(data_dir, subdir)
+        if not os.path.isdir(full_dir):
+            continue
+        for filename in sorted(os.listdir(full_dir)):
+            if not filename.endswith('.json'):
+                continue
+            content_type = classify(subdir, filename)
+            if content_type is None:
+                continue
+            if content_types and content_type not in content_types:
+                continue
+            entries.append({
+                'path': f"{subdir}/{filename}",
+                'type': content_type,
+                'filename': filename,
+                'domain': domain_from_filename(filename),
+            })
+    return entries
+
+
+def load_corpus(data_dir=DATA_DIR, content_types=None):
+    """
+    Parse every known document under data_dir once for the build stages
+    Returns (documents, errors): documents are discovery entries plus
+    'id' and 'data'; errors are {'path', 'error'} for unreadable files.
+    """
+    documents = []
+    errors = []
+    for entry in discover_documents(data_dir, content_types):
+        try:
+            documents.append(load_document(data_dir, entry))
+        except (ValueError, OSError) as e:
+            errors.append({'path': entry['path'], 'error': str(e)})
+    return documents, errors
+
+
+def load_document(data_dir, entry):
+    """Parse one discovered document into a corpus entry (raises ValueError/OSError)"""
+    data = read_json(os.path.join(data_dir, entry['path']))
+    doc = dict(entry)
+    doc['id'] = document_id(data, entry['filename'])
+    doc['data'] = data
+    if doc['domain'] is None:
+        doc['domain'] = document_domain(data)
+    return doc
+
+
+def list_json_files(output_dir):
+    """Every .json under output_dir, relative and sorted"""
+    paths = []
+    for root, dirs, files in os.walk(output_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for filename in sorted(files):
+            if filename.endswith('.json'):
+                paths.append(os.path.relpath(os.path.join(root, filename), output_dir).replace(os.sep, '/'))
+    return paths
+
+
+def domain_from_filename(filename):
+    """D3-LESSON-006_Cryptography.json -> 3"""
+    match = DOMAIN_PATTERN.match(filename)
+    return int(match.group(1)) if match else None
+
+
+def unwrap(doc):
+    """Some simulations/remediation files nest everything under 'scenario'"""
+    if isinstance(doc, dict) and len(doc) == 1 and isinstance(doc.get('scenario'), dict):
+        return doc['scenario']
+    return doc
+
+
+def document_id(doc, filename=None):
+    """Resolve the document ID across the different content schemas"""
+    body = unwrap(doc)
+    if isinstance(body, dict):
+        for key in ID_KEYS:
+            if isinstance(body.get(key), str) and body[key]:
+                return body[key]
+    if filename:
+        return filename.split('_', 1)[0].replace('.json', '')
+    return None
+
+
+def document_domain(doc, filename=None):
+    """Resolve the domain number, preferring the ID prefix over the 'domain' field"""
+    domain = domain_from_filename(filename) if filename else None
+    if domain is None:
+        domain = domain_from_filename(document_id(doc) or '')
+    if domain is None:
+        value = unwrap(doc).get('domain') if isinstance(unwrap(doc), dict) else None
+        if isinstance(value, int):
+            domain = value
+        elif isinstance(value, str) and value[:1].isdigit():
+            domain = int(value[0])
+    return domain
+
+
+def read_json(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_json(data, compact=False):
+    """Serialize to text using the repo's formatting (or minified)"""
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def write_text(filepath, text):
+    """Write UTF-8 text, creating parent directories as needed. Returns the bytes written."""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    raw = text.encode('utf-8')
+    with open(filepath, 'wb') as f:
+        f.write(raw)
+    return raw
+
+
+def write_json(filepath, data, compact=False):
+    """Write JSON, creating parent directories as needed. Returns the bytes written."""
+    return write_text(filepath, dump_json(data, compact))
+
+
+# ================================================
+# CONTENT HASHING
+# ================================================
+
+def hash_bytes(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def hash_file(filepath):
+    """sha256 of a file's bytes, or None if it does not exist"""
+    try:
+        with open(filepath, 'rb') as f:
+            return hash_bytes(f.read())
+    except OSError:
+        return None
+
+
+def hash_json(data):
+    """Stable hash of a JSON-serialisable value (key order independent)"""
+    return hash_bytes(json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+
+
+# ================================================
+# PARALLEL EXECUTION
+# ================================================
+
+def resolve_jobs(jobs):
+    """--jobs 0 means one worker per CPU"""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def parallel_map(func, items, jobs=1):
+    """
+    Map func over items, across a process pool when jobs > 1
+    func must be a module-level function. Results keep input order,
+    so output stays deterministic regardless of worker scheduling.
+    """
+    items = list(items)
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1 or len(items) < 2:
+        return [func(item) for item in items]
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(func, items, chunksize=chunksize))
+
+
+def memo_map(func, items, options, stage, key):
+    """
+    parallel_map with a per-item result cache for long-running processes
+    options['memo'] is a dict owned by the caller (watch.py keeps one for
+    its lifetime); key(item) returns (cache_key, token) and a cached result
+    is reused while its token is the same object or compares equal. Without
+    a memo this is plain parallel_map.
+    """
+    items = list(items)
+    jobs = options.get('jobs', 1)
+    memo = options.get('memo')
+    if memo is None:
+        return parallel_map(func, items, jobs)
+    cache = memo.setdefault(stage, {})
+    keys = [key(item) for item in items]
+    missing = [i for i, (cache_key, token) in enumerate(keys)
+               if cache_key not in cache or not (cache[cache_key][0] is token or cache[cache_key][0] == token)]
+    for i, result in zip(missing, parallel_map(func, [items[i] for i in missing], jobs)):
+        cache[keys[i][0]] = (keys[i][1], result)
+    return [cache[cache_key][1] for cache_key, _ in keys]
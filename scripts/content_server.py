@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Local Content Server
+
+Ad hoc static servers (python -m http.server, editor preview servers)
+ignore caching, so they cannot reproduce what learners get from the
+production CDN. This serves the app (index.html, js/, css/) with /data/
+mapped to the build tree, the way production does:
+
+- Strong ETags from each file's sha256 and If-None-Match -> 304
+- Accept-Encoding negotiation over the precompressed .br / .gz siblings
+  that content_build.py --minify writes; the encoded representation gets
+  its own ETag (hash plus -br / -gzip) and Vary: Accept-Encoding. Only
+  the base path is negotiated; a .br / .gz sibling requested by name is
+  served as application/octet-stream with no Content-Encoding
+- Single byte ranges (bytes=a-b, a-, -n) -> 206, 416 when unsatisfiable;
+  If-Range is honoured and multi-range requests get the full body
+- HTTP/1.1 keep-alive with an idle timeout, a thread per connection
+- An LRU cache of file bodies and hashes bounded by --cache-mb; entries are
+  revalidated against (mtime, size) on every request, so a rebuild is
+  picked up without a restart
+
+GET /__stats returns request, cache and byte counters as JSON, for the
+load-test harness and for comparing configurations.
+
+Usage:
+    python scripts/content_server.py [--port 8080] [--data build/data] [--cache-mb 64] [--max-age 0]
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from content_repo import BUILD_DIR, ROOT_DIR
+
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_MB = 64
+KEEPALIVE_TIMEOUT = 30
+STATS_PATH = '/__stats'
+# Server preference when the client accepts both equally
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+ENCODED_SUFFIXES = tuple(suffix for _, suffix in ENCODINGS)
+COMPRESSIBLE = ('application/json', 'application/javascript', 'text/')
+
+mimetypes.add_type('application/json', '.json')
+mimetypes.add_type('application/javascript', '.js')
+
+
+# ================================================
+# FILE CACHE
+# ================================================
+
+class FileCache:
+    """LRU of {body, etag} keyed by path, revalidated by (mtime, size)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, filepath):
+        """Entry for a file, or None if it does not exist"""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if not os.path.isfile(filepath):
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entry = self.entries.get(filepath)
+            if entry and entry['version'] == version:
+                self.entries.move_to_end(filepath)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        with open(filepath, 'rb') as f:
+            body = f.read()
+        entry = {
+            'version': version,
+            'body': body,
+            'etag': hashlib.sha256(body).hexdigest()[:32],
+            'mtime': stat.st_mtime,
+        }
+        # Files too big to be worth caching are served straight from disk
+        if len(body) <= self.max_bytes // 4:
+            with self.lock:
+                previous = self.entries.pop(filepath, None)
+                if previous:
+                    self.bytes -= len(previous['body'])
+                self.entries[filepath] = entry
+                self.bytes += len(body)
+                while self.bytes > self.max_bytes:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.bytes -= len(evicted['body'])
+        return entry
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+# ================================================
+# REQUEST HANDLING
+# ================================================
+
+def accepted_encodings(header):
+    """{coding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for part in (header or '').split(','):
+        fields = part.strip().split(';')
+        coding = fields[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single satisfiable range, None to ignore, 'invalid' for 416"""
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                return 'invalid'
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return 'invalid'
+    return start, min(end, size - 1)
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # If-None-Match uses the weak comparison
+    return etag in (tag.strip().removeprefix('W/') for tag in header.split(','))
+
+
+class ContentServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, address, root_dir, data_dir, cache_bytes, max_age, verbose=False):
+        super().__init__(address, ContentHandler)
+        self.verbose = verbose
+        self.root_dir = os.path.realpath(root_dir)
+        self.data_dir = os.path.realpath(data_dir)
+        self.cache = FileCache(cache_bytes)
+        self.cache_control = f"public, max-age={max_age}" if max_age else 'no-cache'
+        self.counters = {'requests': 0, 'ok': 0, 'partial': 0, 'not_modified': 0, 'not_found': 0, 'unsatisfiable': 0,
+                         'bytes_sent': 0, 'encoded': {'br': 0, 'gzip': 0, 'identity': 0}}
+        self.counter_lock = threading.Lock()
+
+    def count(self, key, encoding=None, sent=0):
+        with self.counter_lock:
+            self.counters['requests'] += 1
+            self.counters[key] += 1
+            self.counters['bytes_sent'] += sent
+            if encoding:
+                self.counters['encoded'][encoding] += 1
+
+    def resolve(self, url_path):
+        """Filesystem path for a URL path, or None if it is outside the served trees"""
+        path = unquote(url_path)
+        # Never serve dotfiles (.git, .cache) from the repo root
+        if any(segment.startswith('.') for segment in path.split('/')):
+            return None
+        if path.startswith('/data/'):
+            base, relative = self.data_dir, path[len('/data/'):]
+        else:
+            base, relative = self.root_dir, path.lstrip('/')
+        filepath = os.path.realpath(os.path.join(base, relative))
+        if filepath != base and not filepath.startswith(base + os.sep):
+            return None
+        if os.path.isdir(filepath):
+            filepath = os.path.join(filepath, 'index.html')
+        return filepath
+
+    def stats(self):
+        with self.counter_lock:
+            counters = dict(self.counters, encoded=dict(self.counters['encoded']))
+        return dict(counters, cache=self.cache.stats())
+
+
+class ContentHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body go out as separate writes; with Nagle on, each small
+    # response waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = 'ContentServer/1'
+
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def serve(self, send_body):
+        url_path = urlsplit(self.path).path
+        if url_path == STATS_PATH:
+            return self.send_bytes(200, json.dumps(self.server.stats()).encode('utf-8'),
+                                   {'Content-Type': 'application/json', 'Cache-Control': 'no-store'}, send_body)
+
+        filepath = self.server.resolve(url_path)
+        entry = self.server.cache.get(filepath) if filepath else None
+        if entry is None:
+            self.server.count('not_found')
+            return self.send_bytes(404, b'Not Found', {'Content-Type': 'text/plain'}, send_body)
+
+        if filepath.endswith(ENCODED_SUFFIXES):
+            # guess_type() would report foo.json.gz as application/json
+            content_type = 'application/octet-stream'
+        else:
+            content_type = mimetypes.guess_type(filepath)[0] or 'application/octet-stream'
+        headers = {
+            'Content-Type': content_type + ('; charset=utf-8' if content_type.startswith('text/') else ''),
+            'Cache-Control': self.server.cache_control,
+            'Accept-Ranges': 'bytes',
+            'Last-Modified': self.date_time_string(entry['mtime']),
+        }
+        body, etag, encoding = entry['body'], f'"{entry["etag"]}"', 'identity'
+        if content_type.startswith(COMPRESSIBLE):
+            headers['Vary'] = 'Accept-Encoding'
+            accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+            for coding, suffix in sorted(ENCODINGS, key=lambda e: -accepted.get(e[0], 0)):
+                if accepted.get(coding, 0) <= 0:
+                    continue
+                sibling = self.server.cache.get(filepath + suffix)
+                if sibling is not None:
+                    body, etag, encoding = sibling['body'], f'"{entry["etag"]}-{coding}"', coding
+                    headers['Content-Encoding'] = coding
+                    break
+        headers['ETag'] = etag
+
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.server.count('not_modified', encoding)
+            return self.send_bytes(304, b'', headers, send_body=False)
+
+        byte_range = None
+        if_range = self.headers.get('If-Range')
+        if not if_range or if_range.strip() == etag:
+            byte_range = parse_range(self.headers.get('Range'), len(body))
+        if byte_range == 'invalid':
+            headers['Content-Range'] = f"bytes */{len(body)}"
+            self.server.count('unsatisfiable')
+            return self.send_bytes(416, b'', headers, send_body)
+        if byte_range:
+            start, end = byte_range
+            headers['Content-Range'] = f"bytes {start}-{end}/{len(body)}"
+            self.server.count('partial', encoding, end - start + 1 if send_body else 0)
+            return self.send_bytes(206, body[start:end + 1], headers, send_body)
+
+        self.server.count('ok', encoding, len(body) if send_body else 0)
+        return self.send_bytes(200, body, headers, send_body)
+
+    def send_bytes(self, status, body, headers, send_body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host='127.0.0.1', port=DEFAULT_PORT, root_dir=ROOT_DIR, data_dir=os.path.join(BUILD_DIR, 'data'),
+                cache_mb=DEFAULT_CACHE_MB, max_age=0, verbose=False):
+    return ContentServer((host, port), root_dir, data_dir, cache_mb * 1024 * 1024, max_age, verbose)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the app and built content with production caching")
+    parser.add_argument('--host', default='127.0.0.1', help="bind address")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port")
+    parser.add_argument('--root', default=ROOT_DIR, help="app directory (index.html, js/, css/)")
+    parser.add_argument('--data', default=os.path.join(BUILD_DIR, 'data'), help="directory served at /data/")
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB, help="in-memory LRU cache size")
+    parser.add_argument('--max-age', type=int, default=0, help="Cache-Control max-age (0 = always revalidate)")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONTENT SERVER")
+    print("=" * 80)
+
+    server = make_server(args.host, args.port, args.root, args.data, args.cache_mb, args.max_age, args.verbose)
+    print(f"  🌐 http://{args.host}:{args.port}/  (/data/ -> {args.data})")
+    print(f"  📦 LRU cache {args.cache_mb} MB, stats at {STATS_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        stats = server.stats()
+        print(f"\n  👋 stopped after {stats['requests']} requests, {stats['bytes_sent'] / 1048576:.1f} MB sent, "
+              f"cache {stats['cache']['hits']} hits / {stats['cache']['misses']} misses")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Curriculum Graph Compiler
+
+Prerequisites and unlocks are scattered across the corpus and resolved ad
+hoc by the lesson viewer. This stage compiles them into one directed graph
+(edge u -> v means "study u before v"):
+
+- lesson skill_tree.prerequisites   prerequisite -> lesson
+- lesson skill_tree.unlocks         lesson -> unlocked content
+- lesson related_content            previous_lesson -> lesson -> next_lesson
+- lesson skill_tree.builds_toward   lesson -> target (when it names content;
+                                    certifications/roles are kept as goals)
+- remediation prerequisites         prerequisite -> remediation
+- remediation unlocks               remediation -> simulation (`_retry` dropped)
+- remediation next_recommended      remediation -> target
+
+Output: graph/curriculum.json with
+    nodes            ordinal-numbered {id, type, domain, path, goals}
+    edges            [from, to, kind] by ordinal
+    order            topological order (cycles collapsed, members together)
+    requires/unlocks transitive prerequisite / unlock sets per node as
+                     hex bitsets: bit i set <=> node with ordinal i is in
+                     the set, so "what do I still need" is
+                     requires[x] & ~completed
+    study_paths      shortest prerequisite chain from a starting node
+    cycles           strongly connected components larger than one node
+    unresolved       references to IDs that are not in the corpus
+
+Usage:
+    python scripts/curriculum_graph.py [--source build/data] [--path FROM TO]
+"""
+
+import argparse
+import heapq
+import os
+from collections import deque
+
+from content_repo import BUILD_DIR, load_corpus, unwrap, write_json
+
+GRAPH_PATH = 'graph/curriculum.json'
+NODE_TYPES = ['lesson', 'simulation', 'remediation', 'tool_lab', 'guide']
+RETRY_SUFFIX = '_retry'
+
+
+# ================================================
+# EXTRACTION
+# ================================================
+
+def _ref_id(ref):
+    """Target ID from a string or {lesson_id|id: ...} reference"""
+    if isinstance(ref, dict):
+        ref = ref.get('lesson_id') or ref.get('id')
+    if not isinstance(ref, str) or not ref.strip():
+        return None
+    ref = ref.strip()
+    return ref[:-len(RETRY_SUFFIX)] if ref.endswith(RETRY_SUFFIX) else ref
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def iter_references(doc):
+    """Yield (from_id, to_id, kind) for every ordering reference in a document"""
+    body = unwrap(doc['data'])
+    if not isinstance(body, dict):
+        return
+    me = doc['id']
+    if doc['type'] == 'lesson':
+        tree = body.get('skill_tree') or {}
+        for ref in _as_list(tree.get('prerequisites')):
+            yield _ref_id(ref), me, 'prerequisite'
+        for ref in _as_list(tree.get('unlocks')):
+            yield me, _ref_id(ref), 'unlocks'
+        for ref in _as_list(tree.get('builds_toward', body.get('builds_toward'))):
+            yield me, _ref_id(ref), 'builds_toward'
+        related = body.get('related_content') or {}
+        if related.get('previous_lesson'):
+            yield _ref_id(related['previous_lesson']), me, 'sequence'
+        if related.get('next_lesson'):
+            yield me, _ref_id(related['next_lesson']), 'sequence'
+    elif doc['type'] == 'remediation':
+        for ref in _as_list(body.get('prerequisites')):
+            yield _ref_id(ref), me, 'prerequisite'
+        for ref in _as_list(body.get('unlocks')):
+            yield me, _ref_id(ref), 'unlocks'
+        for ref in _as_list(body.get('next_recommended')):
+            yield me, _ref_id(ref), 'recommended'
+
+
+def extract_graph(corpus):
+    """Nodes (sorted by id), deduplicated edges and unresolved references"""
+    docs = sorted((doc for doc in corpus if doc['type'] in NODE_TYPES and doc['id']),
+                  key=lambda doc: doc['id'])
+    nodes = []
+    ordinal = {}
+    for doc in docs:
+        if doc['id'] in ordinal:
+            continue
+        ordinal[doc['id']] = len(nodes)
+        nodes.append({'id': doc['id'], 'type': doc['type'], 'domain': doc['domain'],
+                      'path': doc['path'], 'goals': []})
+
+    edges = {}
+    unresolved = []
+    for doc in docs:
+        for source, target, kind in iter_references(doc):
+            if source is None or target is None or source == target:
+                continue
+            if source in ordinal and target in ordinal:
+                edges.setdefault((ordinal[source], ordinal[target]), kind)
+            elif kind == 'builds_toward':
+                nodes[ordinal[source]]['goals'].append(target)
+            else:
+                missing = target if source in ordinal else source
+                unresolved.append({'in': doc['id'], 'ref': missing, 'kind': kind})
+    edge_list = sorted([a, b, kind] for (a, b), kind in edges.items())
+    return nodes, edge_list, unresolved
+
+
+# ================================================
+# ANALYSIS
+# ================================================
+
+def adjacency(size, edges):
+    succ = [[] for _ in range(size)]
+    pred = [[] for _ in range(size)]
+    for a, b, _ in edges:
+        succ[a].append(b)
+        pred[b].append(a)
+    return succ, pred
+
+
+def strongly_connected(succ):
+    """Iterative Tarjan; returns component number per node"""
+    size = len(succ)
+    index = [None] * size
+    low = [0] * size
+    on_stack = [False] * size
+    stack = []
+    component = [None] * size
+    counter = 0
+    components = 0
+
+    for root in range(size):
+        if index[root] is not None:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, child = work.pop()
+            if child == 0:
+                index[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            if child < len(succ[node]):
+                work.append((node, child + 1))
+                nxt = succ[node][child]
+                if index[nxt] is None:
+                    work.append((nxt, 0))
+                elif on_stack[nxt]:
+                    low[node] = min(low[node], index[nxt])
+                continue
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = components
+                    if member == node:
+                        break
+                components += 1
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+    return component
+
+
+def topological_order(nodes, succ, component):
+    """Kahn's algorithm over the condensation, ties broken by node id"""
+    members = {}
+    for node, comp in enumerate(component):
+        members.setdefault(comp, []).append(node)
+    comp_succ = {comp: set() for comp in members}
+    indegree = {comp: 0 for comp in members}
+    for node, targets in enumerate(succ):
+        for target in targets:
+            a, b = component[node], component[target]
+            if a != b and b not in comp_succ[a]:
+                comp_succ[a].add(b)
+                indegree[b] += 1
+
+    def key(comp):
+        return min(nodes[n]['id'] for n in members[comp])
+
+    ready = [(key(comp), comp) for comp, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    order = []
+    comp_order = []
+    while ready:
+        _, comp = heapq.heappop(ready)
+        comp_order.append(comp)
+        order.extend(sorted(members[comp], key=lambda n: nodes[n]['id']))
+        for nxt in comp_succ[comp]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                heapq.heappush(ready, (key(nxt), nxt))
+    return order, comp_order, members
+
+
+def closures(succ, pred, component, comp_order, members):
+    """Transitive prerequisite and unlock sets as int bitsets"""
+    size = len(succ)
+    requires = [0] * size
+    unlocks = [0] * size
+
+    for comp in comp_order:
+        group = members[comp]
+        mask = 0
+        for node in group:
+            for p in pred[node]:
+                if component[p] != comp:
+                    mask |= requires[p] | (1 << p)
+        if len(group) > 1:
+            for node in group:
+                mask |= 1 << node
+        for node in group:
+            requires[node] = mask & ~(1 << node)
+
+    for comp in reversed(comp_order):
+        group = members[comp]
+        mask = 0
+        for node in group:
+            for s in succ[node]:
+                if component[s] != comp:
+                    mask |= unlocks[s] | (1 << s)
+        if len(group) > 1:
+            for node in group:
+                mask |= 1 << node
+        for node in group:
+            unlocks[node] = mask & ~(1 << node)
+    return requires, unlocks
+
+
+def shortest_path(succ, start, goal):
+    """BFS over study edges; list of ordinals or None"""
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == goal:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = previous[node]
+            return path[::-1]
+        for nxt in succ[node]:
+            if nxt not in previous:
+                previous[nxt] = node
+                queue.append(nxt)
+    return None
+
+
+def study_paths(pred):
+    """Shortest chain from any node without prerequisites to each node"""
+    paths = []
+    for target in range(len(pred)):
+        previous = {target: None}
+        queue = deque([target])
+        path = [target]
+        while queue:
+            node = queue.popleft()
+            if not pred[node]:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                break
+            for p in sorted(pred[node]):
+                if p not in previous:
+                    previous[p] = node
+                    queue.append(p)
+        paths.append(path)
+    return paths
+
+
+def compile_graph(corpus):
+    nodes, edges, unresolved = extract_graph(corpus)
+    succ, pred = adjacency(len(nodes), edges)
+    component = strongly_connected(succ)
+    order, comp_order, members = topological_order(nodes, succ, component)
+    requires, unlocks = closures(succ, pred, component, comp_order, members)
+
+    cycles = [sorted(nodes[n]['id'] for n in group)
+              for group in members.values() if len(group) > 1]
+    for number, node in enumerate(nodes):
+        node['n'] = number
+    return {
+        'version': 1,
+        'encoding': 'hex bitset, bit i = node ordinal i',
+        'nodes': nodes,
+        'edges': edges,
+        'order': order,
+        'requires': [format(mask, 'x') for mask in requires],
+        'unlocks': [format(mask, 'x') for mask in unlocks],
+        'study_paths': study_paths(pred),
+        'cycles': sorted(cycles),
+        'unresolved': unresolved,
+    }
+
+
+def build_curriculum_graph(corpus, output_dir, options=None):
+    """Build stage: write graph/curriculum.json. Returns the graph."""
+    compact = (options or {}).get('compact', False)
+    graph = compile_graph(corpus)
+    write_json(os.path.join(output_dir, GRAPH_PATH), graph, compact)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the curriculum dependency graph")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--path', nargs=2, metavar=('FROM', 'TO'), help="print the shortest study path")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CURRICULUM GRAPH")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, NODE_TYPES)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    graph = build_curriculum_graph(corpus, args.source, {'compact': args.minify})
+
+    print(f"  ✅ {len(graph['nodes'])} nodes, {len(graph['edges'])} edges")
+    if graph['cycles']:
+        print(f"  ⚠️ {len(graph['cycles'])} cycles")
+        for cycle in graph['cycles'][:5]:
+            print(f"     - {' <-> '.join(cycle)}")
+    if graph['unresolved']:
+        print(f"  ⚠️ {len(graph['unresolved'])} unresolved references")
+        for ref in graph['unresolved'][:5]:
+            print(f"     - {ref['in']}: {ref['kind']} {ref['ref']}")
+        if len(graph['unresolved']) > 5:
+            print(f"     ... and {len(graph['unresolved']) - 5} more")
+
+    if args.path:
+        ordinal = {node['id']: node['n'] for node in graph['nodes']}
+        missing = [ref for ref in args.path if ref not in ordinal]
+        if missing:
+            print(f"\n  ❌ Unknown ID: {', '.join(missing)}")
+            return 1
+        succ, _ = adjacency(len(graph['nodes']), graph['edges'])
+        path = shortest_path(succ, ordinal[args.path[0]], ordinal[args.path[1]])
+        if path is None:
+            print(f"\n  ❌ No study path from {args.path[0]} to {args.path[1]}")
+        else:
+            print(f"\n  📍 {' -> '.join(graph['nodes'][n]['id'] for n in path)}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
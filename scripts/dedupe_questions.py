@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Question Detection (MinHash + LSH)
+
+The question pool is assembled from the unified bank (questions.json and
+the expanded SY0-701 bank), lesson knowledge_check / micro_checks and
+tool-lab knowledge_check arrays, and duplicates creep in. Pairwise
+comparison is quadratic, so this stage:
+
+1. Shingles each item (word 3-grams of stem + options/answer) and hashes
+   the shingles once with crc32
+2. Builds a one-permutation MinHash signature (NUM_BINS bins, empty bins
+   densified by rotation) - O(shingles) per item instead of O(shingles x k)
+3. Buckets signatures by LSH band (BANDS x ROWS) so only items sharing a
+   band are ever compared
+4. Verifies candidates with exact Jaccard >= --threshold and clusters them
+   with union-find
+
+Oversized buckets are compared against their first member only, so
+templated stems cannot make a bucket quadratic.
+
+As a build stage (before question_bank and exam_forms) it writes
+bank/duplicates.json: the clusters (refs only) and `dropped`, every bank
+question of a cluster except the lowest-ordinal one. The question_bank
+stage leaves dropped ids out of bank/questions.json (their ordinals stay
+retired, so nothing is renumbered) and exam forms never draw them.
+
+Run standalone it also writes build/reports/question-duplicates.json with
+the full stems; --emit-bank then rewrites bank/questions.json the same way
+the stage pipeline does.
+
+Usage:
+    python scripts/dedupe_questions.py [--source build/data] [--threshold 0.8] [--emit-bank]
+"""
+
+import argparse
+import os
+import re
+import time
+import zlib
+
+from content_repo import BUILD_DIR, load_corpus, unwrap, write_json
+from question_bank import (
+    DUPLICATES_PATH,
+    SOURCE_TYPES as QUESTION_SOURCES,
+    compile_questions,
+    published_questions,
+    stage_ordinals,
+    write_bank,
+)
+
+REPORT_PATH = os.path.join(BUILD_DIR, 'reports', 'question-duplicates.json')
+POOL_TYPES = QUESTION_SOURCES + ['lesson', 'tool_lab']
+
+SHINGLE_SIZE = 3
+BIN_BITS = 5
+NUM_BINS = 1 << BIN_BITS          # 32 signature slots
+BANDS = 8
+ROWS = NUM_BINS // BANDS          # 4 rows per band -> candidate threshold ~0.6
+EMPTY = 1 << 32
+DENSIFY_OFFSET = 1 << (32 - BIN_BITS)
+ALL_PAIRS_LIMIT = 64
+DEFAULT_THRESHOLD = 0.8
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+# ================================================
+# QUESTION POOL
+# ================================================
+
+def _as_list(value):
+    if isinstance(value, list):
+        return value
+    return [value] if isinstance(value, dict) else []
+
+
+def _pool_item(source, ref, item):
+    options = item.get('options') or []
+    answer = item.get('answer')
+    extra = [str(o) for o in options] if options else ([str(answer)] if answer else [])
+    return {'source': source, 'ref': ref, 'stem': str(item.get('question', '')), 'options': extra}
+
+
+def collect_pool(corpus, ordinals=None):
+    """Every question-like item in the corpus, in deterministic order"""
+    pool = []
+    for q in compile_questions(corpus, ordinals):
+        pool.append({'source': 'bank', 'ref': q['id'], 'n': q['n'],
+                     'stem': q['question'], 'options': [str(o) for o in q['options']]})
+
+    for doc in corpus:
+        body = unwrap(doc['data'])
+        if doc['type'] == 'lesson':
+            for s_index, section in enumerate(body.get('sections', [])):
+                anchor = section.get('section_id') or f"{doc['id']}-S{s_index + 1:02d}"
+                for key in ('knowledge_check', 'micro_checks'):
+                    for i, item in enumerate(_as_list(section.get(key))):
+                        if isinstance(item, dict) and item.get('question'):
+                            pool.append(_pool_item(key, f"{anchor}/{key}/{i}", item))
+        elif doc['type'] == 'tool_lab':
+            for i, item in enumerate(_as_list(body.get('knowledge_check'))):
+                if isinstance(item, dict) and item.get('question'):
+                    pool.append(_pool_item('tool_lab', f"{doc['id']}/knowledge_check/{i}", item))
+    return pool
+
+
+# ================================================
+# MINHASH / LSH
+# ================================================
+
+def shingle_hashes(text):
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+            for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(hashes):
+    """One-permutation MinHash with rotation densification"""
+    sig = [EMPTY] * NUM_BINS
+    mask = NUM_BINS - 1
+    for h in hashes:
+        slot = h & mask
+        value = h >> BIN_BITS
+        if value < sig[slot]:
+            sig[slot] = value
+
+    if EMPTY in sig and len(set(sig)) > 1:
+        original = list(sig)
+        for i in range(NUM_BINS):
+            if original[i] != EMPTY:
+                continue
+            distance = 1
+            while original[(i + distance) % NUM_BINS] == EMPTY:
+                distance += 1
+            sig[i] = original[(i + distance) % NUM_BINS] + distance * DENSIFY_OFFSET
+    return sig
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def lsh_buckets(hash_sets, rows=ROWS):
+    """Index lists (2+ members) of items whose signatures agree on a band of rows slots.
+    Fewer rows per band means more bands and a lower candidate threshold.
+    """
+    # One table per band; tuple hashes of ints are deterministic and any
+    # collision is caught by the caller's exact Jaccard check
+    bands = [{} for _ in range(NUM_BINS // rows)]
+    for index, hashes in enumerate(hash_sets):
+        if not hashes:
+            continue
+        sig = signature(hashes)
+        for band, table in enumerate(bands):
+            key = hash(tuple(sig[band * rows:(band + 1) * rows]))
+            members = table.get(key)
+            if members is None:
+                table[key] = index
+            elif isinstance(members, list):
+                members.append(index)
+            else:
+                table[key] = [members, index]
+    return [members for table in bands for members in table.values() if isinstance(members, list)]
+
+
+def candidate_pairs(buckets):
+    """(a, b) pairs to verify; oversized buckets pair their first member with the rest"""
+    for members in buckets:
+        if len(members) <= ALL_PAIRS_LIMIT:
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    yield a, b
+        else:
+            for b in members[1:]:
+                yield members[0], b
+
+
+def find_clusters(pool, threshold=DEFAULT_THRESHOLD):
+    """Cluster near-duplicate items. Returns (clusters, stats)."""
+    shingles = [shingle_hashes(item['stem'] + ' ' + ' '.join(item['options'])) for item in pool]
+    buckets = lsh_buckets(shingles)
+
+    uf = UnionFind(len(pool))
+    best = {}
+    compared = 0
+
+    def check(a, b):
+        nonlocal compared
+        if uf.find(a) == uf.find(b):
+            return
+        compared += 1
+        score = jaccard(shingles[a], shingles[b])
+        if score >= threshold:
+            uf.union(a, b)
+            best[(a, b)] = score
+
+    for a, b in candidate_pairs(buckets):
+        check(a, b)
+
+    groups = {}
+    for index in range(len(pool)):
+        if shingles[index]:
+            groups.setdefault(uf.find(index), []).append(index)
+
+    scores = {}
+    for (a, b), score in best.items():
+        root = uf.find(a)
+        scores[root] = min(scores.get(root, 1.0), score)
+
+    clusters = []
+    for root, members in sorted(groups.items()):
+        if len(members) < 2:
+            continue
+        clusters.append({
+            'size': len(members),
+            'min_similarity': round(scores.get(root, 1.0), 3),
+            'members': [{k: pool[i][k] for k in ('source', 'ref', 'stem')} for i in members],
+            'indexes': members,
+        })
+    stats = {'items': len(pool), 'candidate_buckets': len(buckets), 'comparisons': compared, 'clusters': len(clusters)}
+    return clusters, stats
+
+
+# ================================================
+# OUTPUT
+# ================================================
+
+def dropped_bank_ids(pool, clusters):
+    """Every bank question in a cluster except the lowest-ordinal one"""
+    drop = set()
+    for cluster in clusters:
+        bank_members = sorted((pool[i]['n'], i) for i in cluster['indexes'] if pool[i]['source'] == 'bank')
+        drop.update(pool[i]['ref'] for _, i in bank_members[1:])
+    return sorted(drop)
+
+
+def build_question_dedupe(corpus, output_dir, options=None):
+    """Build stage: write bank/duplicates.json. Returns it, with the full clusters under 'report'."""
+    options = options or {}
+    threshold = options.get('dedupe_threshold', DEFAULT_THRESHOLD)
+    pool = collect_pool(corpus, stage_ordinals(options))
+    clusters, stats = find_clusters(pool, threshold)
+    duplicates = {
+        'version': 1,
+        'threshold': threshold,
+        'stats': stats,
+        'dropped': dropped_bank_ids(pool, clusters),
+        'clusters': [{'min_similarity': c['min_similarity'], 'refs': [m['ref'] for m in c['members']]}
+                     for c in clusters],
+    }
+    write_json(os.path.join(output_dir, DUPLICATES_PATH), duplicates, options.get('compact', False))
+    return dict(duplicates, report=clusters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect near-duplicate questions with MinHash/LSH")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Jaccard similarity threshold")
+    parser.add_argument('--emit-bank', action='store_true', help="rewrite bank/questions.json without the dropped questions")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("NEAR-DUPLICATE QUESTIONS")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, POOL_TYPES)
+
+    start = time.perf_counter()
+    duplicates = build_question_dedupe(corpus, args.source, {'dedupe_threshold': args.threshold})
+    elapsed = time.perf_counter() - start
+    clusters, stats = duplicates['report'], duplicates['stats']
+
+    write_json(REPORT_PATH, {'threshold': args.threshold, 'stats': stats,
+                             'clusters': [{k: v for k, v in c.items() if k != 'indexes'} for c in clusters]})
+
+    print(f"  ✅ {stats['items']} items, {stats['comparisons']} candidate comparisons in {elapsed:.2f}s")
+    print(f"  {'⚠️' if clusters else '🎉'} {len(clusters)} duplicate clusters")
+    for cluster in clusters[:5]:
+        refs = ', '.join(m['ref'] for m in cluster['members'][:4])
+        print(f"     - {cluster['size']} items (≥{cluster['min_similarity']}): {refs}")
+    if len(clusters) > 5:
+        print(f"     ... and {len(clusters) - 5} more")
+    print(f"  📄 Report: {REPORT_PATH}")
+    print(f"  📄 {DUPLICATES_PATH}: {len(duplicates['dropped'])} bank questions dropped")
+
+    if args.emit_bank:
+        bank = write_bank(published_questions(corpus, args.source), args.source)
+        print(f"  📦 Deduplicated bank: {bank['total_questions']} questions")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
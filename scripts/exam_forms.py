@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Precomputed Mock-Exam Forms
+
+generateAdaptivePracticeExam (adaptive-learning.js) rebuilds a 90-question
+exam in the browser every time, from whatever question file loaded, so no
+two learners sit a comparable exam. This stage draws a fixed set of forms
+from the unified question bank at build time (minus the near-duplicates
+the dedupe stage dropped):
+
+- Length 90, domain quotas from the SY0-701 weights (12/22/18/28/20%)
+  split by largest remainder, so every form has the same blueprint
+- PBQ_SLOTS performance-based questions from pbqs.json lead each form and
+  count towards their domain's quota
+- Within a domain, DIFFICULTY_MIX is filled from the rated strata first;
+  slots a stratum cannot fill (today: all of them, the bank is unrated)
+  are backfilled from the rest of the pool
+- No two questions in a form share a concept. Concepts are clusters of
+  questions whose question + correct-answer terms overlap (Jaccard >=
+  CONCEPT_SIMILARITY), e.g. two wordings of "what does NAC enforce".
+  Candidate pairs come from dedupe_questions' MinHash/LSH buckets (with
+  narrower bands, for the lower threshold) and are confirmed with exact
+  Jaccard, so the bank is never compared pairwise
+- Form k uses random.Random(base_seed + k): the same seed and bank always
+  give the same form
+
+Output under exams/:
+    index.json             blueprint, bank hash, pages, exposure stats
+    forms/<page>.json      FORMS_PER_PAGE forms of {form, seed, pbqs[], questions[], domains}
+
+questions[] are bank ordinals: bank/questions.json questions[n]. Ordinals
+come from the committed registry (see question_bank.py) and are never
+renumbered, so a saved form keeps resolving after questions are added;
+bank_hash covers the bank's uids in ordinal order, so a client can still
+tell when the forms were drawn from a different pool.
+
+Usage:
+    python scripts/exam_forms.py [--source build/data] [--forms 2000] [--seed 1] [--minify]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import zlib
+
+from content_repo import BUILD_DIR, hash_json, load_corpus, write_json
+from dedupe_questions import candidate_pairs, jaccard, lsh_buckets
+from question_bank import SOURCE_TYPES as QUESTION_SOURCES, published_questions, stage_ordinals
+from search_index import STOPWORDS, tokenize
+
+EXAMS_DIR = 'exams'
+SOURCE_TYPES = QUESTION_SOURCES + ['pbqs']
+EXAM_LENGTH = 90
+PBQ_SLOTS = 3
+DEFAULT_FORMS = 2000
+DEFAULT_SEED = 1
+FORMS_PER_PAGE = 100
+# Same weights as generateAdaptivePracticeExam's baseWeights
+DOMAIN_WEIGHTS = {1: 0.12, 2: 0.22, 3: 0.18, 4: 0.28, 5: 0.20}
+DIFFICULTY_MIX = {'easy': 0.30, 'medium': 0.50, 'hard': 0.20}
+CONCEPT_SIMILARITY = 0.5
+# LSH rows per band for concept candidates: 16 bands of 2 rows put a pair at
+# CONCEPT_SIMILARITY in a shared bucket with probability ~0.99
+CONCEPT_ROWS = 2
+# Question-stem words that say nothing about the concept being tested
+STEM_WORDS = frozenset("best describes following main most primary purpose should type what which".split())
+
+
+# ================================================
+# BLUEPRINT
+# ================================================
+
+def largest_remainder(total, weights):
+    """Split total into integer counts proportional to weights"""
+    exact = {key: total * weight / sum(weights.values()) for key, weight in weights.items()}
+    counts = {key: int(value) for key, value in exact.items()}
+    by_remainder = sorted(exact, key=lambda key: (-(exact[key] - counts[key]), str(key)))
+    for key in by_remainder[:total - sum(counts.values())]:
+        counts[key] += 1
+    return counts
+
+
+def concept_terms(question):
+    answer = question['options'][question['correct']] if question['correct'] is not None else ''
+    return frozenset(term for term in tokenize(f"{question['question']} {answer}")
+                     if term not in STOPWORDS and term not in STEM_WORDS)
+
+
+def concept_clusters(questions):
+    """Concept id per question: union of every LSH candidate pair above CONCEPT_SIMILARITY"""
+    parent = list(range(len(questions)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    terms = [concept_terms(q) for q in questions]
+    hashes = [{zlib.crc32(term.encode('utf-8')) for term in item} for item in terms]
+    for i, j in candidate_pairs(lsh_buckets(hashes, CONCEPT_ROWS)):
+        if find(i) != find(j) and jaccard(terms[i], terms[j]) >= CONCEPT_SIMILARITY:
+            parent[find(i)] = find(j)
+    return [find(i) for i in range(len(questions))]
+
+
+# ================================================
+# FORM GENERATION
+# ================================================
+
+def draw(rng, candidates, count, used_concepts, concepts):
+    """Up to count questions from candidates, at most one per concept"""
+    picked = []
+    for n in rng.sample(candidates, len(candidates)):
+        if len(picked) == count:
+            break
+        if concepts[n] not in used_concepts:
+            used_concepts.add(concepts[n])
+            picked.append(n)
+    return picked
+
+
+def generate_form(seed, pools, pbqs, concepts, quotas):
+    """One form from random.Random(seed); pools is {domain: {difficulty: [n...]}}"""
+    rng = random.Random(seed)
+    form_pbqs = rng.sample(pbqs, min(PBQ_SLOTS, len(pbqs)))
+    remaining = dict(quotas)
+    for pbq in form_pbqs:
+        if remaining.get(pbq['domain'], 0) > 0:
+            remaining[pbq['domain']] -= 1
+
+    used_concepts = set()
+    questions = []
+    domains = {}
+    for domain in sorted(remaining):
+        strata = pools.get(domain, {})
+        rated = {d: w for d, w in DIFFICULTY_MIX.items() if strata.get(d)}
+        picked = []
+        for difficulty, count in largest_remainder(remaining[domain], rated).items() if rated else []:
+            picked += draw(rng, strata[difficulty], count, used_concepts, concepts)
+        # Backfill from the whole domain: unrated questions and strata that ran short
+        leftovers = [n for stratum in strata.values() for n in stratum if n not in picked]
+        picked += draw(rng, leftovers, remaining[domain] - len(picked), used_concepts, concepts)
+        questions += picked
+        domains[str(domain)] = len(picked) + sum(1 for pbq in form_pbqs if pbq['domain'] == domain)
+    rng.shuffle(questions)
+    return {'pbqs': [pbq['id'] for pbq in form_pbqs], 'questions': questions, 'domains': domains}
+
+
+def load_pbqs(corpus):
+    pbqs = []
+    for doc in corpus:
+        if doc['type'] == 'pbqs' and isinstance(doc['data'], list):
+            for item in doc['data']:
+                if isinstance(item, dict) and item.get('id'):
+                    domain = str(item.get('domain', ''))
+                    pbqs.append({'id': item['id'], 'domain': int(domain) if domain.isdigit() else None})
+    return sorted(pbqs, key=lambda pbq: pbq['id'])
+
+
+def build_exam_forms(corpus, output_dir, options=None):
+    """Build stage: write exams/index.json and the form pages. Returns the index."""
+    options = options or {}
+    compact = options.get('compact', False)
+    total_forms = options.get('exam_forms', DEFAULT_FORMS)
+    base_seed = options.get('exam_seed', DEFAULT_SEED)
+
+    questions = [q for q in published_questions(corpus, output_dir, stage_ordinals(options))
+                 if q['correct'] is not None]
+    pbqs = load_pbqs(corpus)
+    concepts = {}
+    for question, concept in zip(questions, concept_clusters(questions)):
+        concepts[question['n']] = concept
+    pools = {}
+    for q in questions:
+        pools.setdefault(q['domain'], {}).setdefault(q['difficulty'], []).append(q['n'])
+    quotas = largest_remainder(EXAM_LENGTH, DOMAIN_WEIGHTS)
+
+    exams_dir = os.path.join(output_dir, EXAMS_DIR)
+    shutil.rmtree(os.path.join(exams_dir, 'forms'), ignore_errors=True)
+    exposure = {q['n']: 0 for q in questions}
+    short_forms = 0
+    pages = []
+    for start in range(0, total_forms, FORMS_PER_PAGE):
+        forms = []
+        for k in range(start, min(start + FORMS_PER_PAGE, total_forms)):
+            form = dict({'form': f"F{k + 1:05d}", 'seed': base_seed + k},
+                        **generate_form(base_seed + k, pools, pbqs, concepts, quotas))
+            for n in form['questions']:
+                exposure[n] += 1
+            if len(form['questions']) + len(form['pbqs']) < EXAM_LENGTH:
+                short_forms += 1
+            forms.append(form)
+        path = f"{EXAMS_DIR}/forms/{start // FORMS_PER_PAGE:03d}.json"
+        raw = write_json(os.path.join(output_dir, path), forms, compact)
+        pages.append({'path': path, 'first': forms[0]['form'], 'forms': len(forms), 'bytes': len(raw)})
+    difficulty_counts = {}
+    for q in questions:
+        difficulty_counts[q['difficulty']] = difficulty_counts.get(q['difficulty'], 0) + 1
+
+    seen = sorted(exposure.values())
+    index = {
+        'version': 1,
+        'bank_hash': hash_json([q['uid'] for q in questions])[:16],
+        'blueprint': {
+            'length': EXAM_LENGTH,
+            'pbq_slots': min(PBQ_SLOTS, len(pbqs)),
+            'domain_quotas': {str(domain): count for domain, count in sorted(quotas.items())},
+            'difficulty_mix': DIFFICULTY_MIX,
+            'concept_similarity': CONCEPT_SIMILARITY,
+        },
+        'base_seed': base_seed,
+        'total_forms': total_forms,
+        'short_forms': short_forms,
+        'pool': {
+            'questions': len(questions),
+            'concepts': len(set(concepts.values())),
+            'pbqs': len(pbqs),
+            'by_difficulty': dict(sorted(difficulty_counts.items())),
+        },
+        'exposure': {
+            'min': seen[0] if seen else 0,
+            'max': seen[-1] if seen else 0,
+            'mean': round(sum(seen) / len(seen), 2) if seen else 0,
+        },
+        'pages': pages,
+    }
+    write_json(os.path.join(exams_dir, 'index.json'), index, compact)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute seeded mock-exam forms from the question bank")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--forms', type=int, default=DEFAULT_FORMS, help="number of forms")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="seed of the first form")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("MOCK-EXAM FORMS")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, SOURCE_TYPES)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    index = build_exam_forms(corpus, args.source, {'compact': args.minify, 'exam_forms': args.forms,
+                                                   'exam_seed': args.seed})
+
+    pool = index['pool']
+    quotas = ', '.join(f"D{d}: {c}" for d, c in index['blueprint']['domain_quotas'].items())
+    print(f"  ✅ {index['total_forms']} forms (seeds {index['base_seed']}-{index['base_seed'] + index['total_forms'] - 1})")
+    print(f"  📊 Blueprint {index['blueprint']['length']} questions, {index['blueprint']['pbq_slots']} PBQs; {quotas}")
+    print(f"  📊 Pool {pool['questions']} questions in {pool['concepts']} concepts, {pool['pbqs']} PBQs")
+    exposure = index['exposure']
+    print(f"  📊 Exposure per question: {exposure['min']}-{exposure['max']} forms (mean {exposure['mean']})")
+    if set(pool['by_difficulty']) - set(DIFFICULTY_MIX):
+        print(f"  ⚠️ Difficulty mix backfilled: {pool['by_difficulty']}")
+    if index['short_forms']:
+        print(f"  ⚠️ {index['short_forms']} forms short of {index['blueprint']['length']} questions")
+    size = sum(page['bytes'] for page in index['pages'])
+    print(f"\n  📦 {len(index['pages'])} pages, {size / 1024:.0f} KB")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Precomputed Glossary Index
+
+DataLoader.loadLessons walks every section of every lesson to collect
+glossary_terms, then loadGlossary merges data/lessons/glossary.json (which
+is keyed by domain number, not an array) over the top; simulations carry
+their own `glossary` dicts that are never merged at all. This stage does
+the merge once at build time, deterministically.
+
+Sources, in precedence order (first definition wins, later ones that
+differ are recorded as conflicts):
+1. lesson sections[].glossary_terms   {term, definition, exam_note}
+2. data/lessons/glossary.json         {"<domain>": [{term, definition}]}
+3. simulation/remediation `glossary`  {"snake_case_term": "definition"}
+
+Output under glossary/:
+    index.json      lowercase term -> {term, definition, exam_note, domain,
+                    lesson_id, sources[], conflicts[]}
+    D<n>.json       terms whose primary domain is n
+    shared.json     terms with no domain
+
+Usage:
+    python scripts/glossary_index.py [--source build/data]
+"""
+
+import argparse
+import os
+import shutil
+
+from content_repo import BUILD_DIR, load_corpus, unwrap, write_json
+
+GLOSSARY_DIR = 'glossary'
+SOURCE_ORDER = ['lesson', 'glossary', 'simulation', 'remediation']
+
+
+def normalize_term(term):
+    """'Zero  Trust' / 'zero_trust' -> 'zero trust'"""
+    return ' '.join(term.replace('_', ' ').lower().split())
+
+
+def _same_definition(a, b):
+    return ' '.join(a.lower().split()) == ' '.join(b.lower().split())
+
+
+def iter_glossary_entries(doc):
+    """Yield (term, definition, exam_note, domain) from one document"""
+    body = unwrap(doc['data'])
+    if doc['type'] == 'lesson':
+        for section in body.get('sections', []):
+            for item in section.get('glossary_terms') or []:
+                if isinstance(item, dict) and item.get('term'):
+                    yield item['term'], item.get('definition', ''), item.get('exam_note', ''), doc['domain']
+    elif doc['type'] == 'glossary':
+        for domain, items in sorted(body.items()):
+            for item in items:
+                if isinstance(item, dict) and item.get('term'):
+                    number = int(domain) if str(domain).isdigit() else None
+                    yield item['term'], item.get('definition', ''), item.get('exam_note', ''), number
+    elif doc['type'] in ('simulation', 'remediation'):
+        glossary = body.get('glossary') if isinstance(body, dict) else None
+        if isinstance(glossary, dict):
+            for term, definition in glossary.items():
+                if isinstance(definition, str):
+                    yield term.replace('_', ' '), definition, '', doc['domain']
+
+
+def merge_glossary(corpus):
+    """Merge every source into one index keyed by normalized term"""
+    ordered = sorted(
+        (doc for doc in corpus if doc['type'] in SOURCE_ORDER),
+        key=lambda doc: SOURCE_ORDER.index(doc['type']),
+    )
+    index = {}
+    for doc in ordered:
+        for term, definition, exam_note, domain in iter_glossary_entries(doc):
+            key = normalize_term(term)
+            source = {'type': doc['type'], 'id': doc['id'], 'domain': domain}
+            entry = index.get(key)
+            if entry is None:
+                index[key] = {
+                    'term': term,
+                    'definition': definition,
+                    'exam_note': exam_note,
+                    'domain': domain,
+                    'lesson_id': doc['id'] if doc['type'] == 'lesson' else None,
+                    'sources': [source],
+                    'conflicts': [],
+                }
+                continue
+            entry['sources'].append(source)
+            if not entry['exam_note'] and exam_note:
+                entry['exam_note'] = exam_note
+            if definition and not _same_definition(definition, entry['definition']):
+                if not any(_same_definition(definition, c['definition']) for c in entry['conflicts']):
+                    entry['conflicts'].append(dict(source, definition=definition))
+    return dict(sorted(index.items()))
+
+
+def build_glossary_index(corpus, output_dir, options=None):
+    """Build stage: write glossary/index.json and per-domain shards. Returns the index."""
+    compact = (options or {}).get('compact', False)
+    index = merge_glossary(corpus)
+
+    shards = {}
+    for key, entry in index.items():
+        name = f"D{entry['domain']}" if entry['domain'] else 'shared'
+        shards.setdefault(name, {})[key] = entry
+
+    glossary_dir = os.path.join(output_dir, GLOSSARY_DIR)
+    shutil.rmtree(glossary_dir, ignore_errors=True)
+    for name, terms in sorted(shards.items()):
+        write_json(os.path.join(glossary_dir, f"{name}.json"), terms, compact)
+    write_json(os.path.join(glossary_dir, 'index.json'), {
+        'version': 1,
+        'total_terms': len(index),
+        'conflicts': sum(1 for entry in index.values() if entry['conflicts']),
+        'shards': {name: len(terms) for name, terms in sorted(shards.items())},
+        'terms': index,
+    }, compact)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the merged glossary index")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("GLOSSARY INDEX")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source, SOURCE_ORDER)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    index = build_glossary_index(corpus, args.source, {'compact': args.minify})
+
+    conflicted = [key for key, entry in index.items() if entry['conflicts']]
+    print(f"  ✅ {len(index)} terms merged")
+    if conflicted:
+        print(f"  ⚠️ {len(conflicted)} terms with conflicting definitions")
+        for key in conflicted[:5]:
+            print(f"     - {key}")
+        if len(conflicted) > 5:
+            print(f"     ... and {len(conflicted) - 5} more")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Reader
+
+json.load materialises a whole file, so combined artifacts (bundles,
+enhanced_simulations.json, the question banks) cost memory proportional to
+their size. This reader yields the items under one path of a document
+while holding at most one item plus one read chunk in memory:
+
+    for doc in iter_items('build/data/bundles/D1.lessons.json', 'documents.item'):
+        ...
+
+Prefixes use dotted segments: an object key, `item` for each element of an
+array, or `*` for every value of an object. STREAM_PREFIXES gives the
+prefix for each combined content type (and bundles); iter_content_items
+picks the one that matches the file's top-level shape. question_bank.py
+reads its sources this way when run standalone.
+
+How it works: the file is read in chunks; containers on the path are
+walked token by token, siblings off the path are skipped by scanning for
+brackets and strings without building objects (and released as they are
+passed, each character scanned once), and each matching item is
+decoded with the C json decoder (raw_decode) straight from the buffer.
+When an item straddles a chunk boundary the read size doubles, so large
+items still decode in linear time.
+
+Usage:
+    python scripts/json_stream.py FILE [--prefix documents.item | --type questions]
+"""
+
+import argparse
+import json
+import re
+import time
+import tracemalloc
+
+CHUNK_SIZE = 64 * 1024
+WILDCARD = '*'
+ITEM = 'item'
+
+STREAM_PREFIXES = {
+    'questions': ['item', 'questions.item'],
+    'pbqs': ['item'],
+    'question_bank': ['domains.item.questions.item'],
+    'simulation_collection': ['item', 'simulations.item'],
+    'bundle': ['documents.item'],
+}
+
+DECODER = json.JSONDecoder()
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+STRUCTURE = re.compile(r'["\[\]{}]')
+NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+class StreamReader:
+    """Buffered cursor over a text file with just enough JSON scanning"""
+
+    def __init__(self, fileobj, chunk_size=CHUNK_SIZE):
+        self.file = fileobj
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def refill(self, size=None):
+        """Append more text; returns False at end of file"""
+        if self.eof:
+            return False
+        text = self.file.read(size or self.chunk_size)
+        if not text:
+            self.eof = True
+            return False
+        self.buf += text
+        return True
+
+    def release(self):
+        """Drop everything before the cursor (call between items)"""
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+
+    def peek(self):
+        """Next non-whitespace character, without consuming it"""
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.refill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, found '{self.buf[self.pos]}'")
+        self.pos += 1
+
+    def decode(self):
+        """Decode the value at the cursor, reading more until it is complete"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buf, self.pos)
+                # A number cut by the chunk boundary decodes as a shorter number
+                truncated = (isinstance(value, (int, float)) and not isinstance(value, bool)
+                             and (end == len(self.buf) or self.buf[end] in NUMBER_CHARS))
+                if self.eof or (end < len(self.buf) and not truncated):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.refill(size)
+            size *= 2
+
+    def skip(self):
+        """Move past the value at the cursor without building it"""
+        first = self.peek()
+        if first not in '[{"':
+            self.decode()
+            return
+        depth = 0
+        while True:
+            match = STRUCTURE.search(self.buf, self.pos)
+            if match is None:
+                # Nothing before the end of the buffer is needed to finish skipping
+                self.pos = len(self.buf)
+                self.release()
+                if not self.refill():
+                    raise ValueError("Unexpected end of JSON input")
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if char == '"':
+                self._skip_string_tail()
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+            if depth == 0:
+                return
+
+    def _skip_string_tail(self):
+        """Move past a string whose opening quote is consumed; each character is scanned once"""
+        scan = self.pos
+        while True:
+            end = self.buf.find('"', scan)
+            if end == -1:
+                # Keep a trailing run of backslashes: its parity decides whether the next quote is escaped
+                self.pos = len(self.buf.rstrip('\\'))
+                self.release()
+                scan = len(self.buf)
+                if not self.refill():
+                    raise ValueError("Unterminated string")
+                continue
+            backslash = end
+            while backslash > self.pos and self.buf[backslash - 1] == '\\':
+                backslash -= 1
+            if (end - backslash) % 2 == 0:
+                self.pos = end + 1
+                return
+            scan = end + 1
+
+
+def _walk(reader, segments):
+    if not segments:
+        yield reader.decode()
+        reader.release()
+        return
+
+    segment, rest = segments[0], segments[1:]
+    opener = reader.peek()
+    if segment == ITEM:
+        if opener != '[':
+            reader.skip()
+            return
+        reader.pos += 1
+        if reader.peek() == ']':
+            reader.pos += 1
+            return
+        while True:
+            yield from _walk(reader, rest)
+            if reader.peek() == ']':
+                reader.pos += 1
+                return
+            reader.expect(',')
+    else:
+        if opener != '{':
+            reader.skip()
+            return
+        reader.pos += 1
+        if reader.peek() == '}':
+            reader.pos += 1
+            return
+        while True:
+            key = reader.decode()
+            reader.expect(':')
+            if segment == WILDCARD or key == segment:
+                yield from _walk(reader, rest)
+            else:
+                reader.skip()
+                reader.release()
+            if reader.peek() == '}':
+                reader.pos += 1
+                return
+            reader.expect(',')
+
+
+def split_prefix(prefix):
+    return [segment for segment in prefix.split('.') if segment] if prefix else []
+
+
+def iter_items(filepath, prefix, chunk_size=CHUNK_SIZE):
+    """Yield each value found at `prefix` without loading the whole file"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        yield from _walk(StreamReader(f, chunk_size), split_prefix(prefix))
+
+
+def _matches_root(prefix, opener):
+    first = split_prefix(prefix)[:1]
+    if not first:
+        return True
+    return opener == ('[' if first[0] == ITEM else '{')
+
+
+def iter_content_items(filepath, content_type, chunk_size=CHUNK_SIZE):
+    """Stream the items of a combined content file, choosing the prefix by its shape"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = StreamReader(f, chunk_size)
+        opener = reader.peek()
+        for prefix in STREAM_PREFIXES[content_type]:
+            if _matches_root(prefix, opener):
+                yield from _walk(reader, split_prefix(prefix))
+                return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream items out of a large JSON file")
+    parser.add_argument('file', help="JSON file to read")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--prefix', default='item', help="dotted path to the items (default: item)")
+    group.add_argument('--type', choices=sorted(STREAM_PREFIXES), help="use the prefix for a content type")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("STREAMING JSON READ")
+    print("=" * 80)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = iter_content_items(args.file, args.type) if args.type else iter_items(args.file, args.prefix)
+    try:
+        count = sum(1 for _ in items)
+    except ValueError as e:
+        print(f"  ❌ {args.file}: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  ✅ {count} items in {elapsed:.2f}s")
+    print(f"  📦 peak traced memory {peak / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
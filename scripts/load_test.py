@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Content Layer Load Test
+
+Simulates a cohort of learners opening the app at once against a content
+server (content_server.py, or any URL). Each virtual user replays what the
+browser really fetches:
+
+    load_all     DataLoader.loadAll: every lesson, simulation and
+                 remediation file in order, then questions, PBQs and the
+                 glossary - one request at a time, as the loader awaits each
+    tool_lab     --labs lazy tool-lab fetches (tool-labs.js), random labs
+    linux_guide  the Linux guide (linux-guide.js)
+    revisit      load_all again with the ETags from the first visit
+                 (If-None-Match), as a returning browser does
+
+The file lists are read from js/data-loader.js itself, so the replay stays
+in step with the app. Users start evenly over --ramp seconds and pause for
+an exponentially distributed think time (mean --think) between scenarios.
+Each user keeps one HTTP/1.1 keep-alive connection and sends
+Accept-Encoding: gzip, br like a browser.
+
+Reports per scenario: requests, status counts, errors (transport failures
+and 5xx), p50/p95/p99 latency per request and per scenario run, throughput
+and bytes on the wire; written to build/reports/load-test.json.
+--spawn-server starts content_server.py in a subprocess for the run.
+
+Usage:
+    python scripts/load_test.py --spawn-server [--users 300] [--ramp 10] [--think 2] [--labs 2] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from content_repo import BUILD_DIR, ROOT_DIR, write_json
+
+DATA_LOADER_JS = os.path.join(ROOT_DIR, 'js', 'data-loader.js')
+REPORT_PATH = os.path.join(BUILD_DIR, 'reports', 'load-test.json')
+SCENARIOS = ['load_all', 'tool_lab', 'linux_guide', 'revisit']
+LINUX_GUIDE = 'tools/LINUX-GUIDE-001_Linux_Security_Fundamentals.json'
+PERCENTILES = [50, 95, 99]
+REQUEST_TIMEOUT = 30
+
+
+# ================================================
+# FETCH PLAN
+# ================================================
+
+def _file_list(source, method):
+    match = re.search(method + r'\(\)\s*\{\s*return\s*\[(.*?)\];', source, re.DOTALL)
+    return re.findall(r"'([^']+\.json)'", match.group(1)) if match else []
+
+
+def fetch_plan(loader_path=DATA_LOADER_JS):
+    """Paths (relative to /data/) for loadAll in order, plus the lazily loaded tool labs"""
+    with open(loader_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    load_all = ([f"lessons/{name}" for name in _file_list(source, 'getLessonFiles')]
+                + [f"simulations/{name}" for name in _file_list(source, 'getSimulationFiles')]
+                + [f"remediation/{name}" for name in _file_list(source, 'getRemediationFiles')]
+                # loadQuestions stops at the first source that has questions
+                + ['questions/questions.json', 'questions/pbqs.json', 'lessons/glossary.json'])
+    labs = [f"tools/{name}" for name in _file_list(source, 'getToolFiles') if name.startswith('TOOL-LAB-')]
+    return {'load_all': load_all, 'tool_labs': labs}
+
+
+# ================================================
+# HTTP CLIENT
+# ================================================
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened when the server closes it"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, path, headers):
+        """GET path. Returns (status, headers, bytes on the wire)."""
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+            lines += [f"{name}: {value}" for name, value in headers.items()]
+            self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+            try:
+                await self.writer.drain()
+                return await self._response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # A keep-alive connection the server already dropped: retry once on a new one
+                await self.close()
+                if attempt:
+                    raise
+
+    async def _response(self):
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        status = int(status_line.split(' ', 2)[1])
+        headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length:
+            await self.reader.readexactly(length)
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, headers, len(head) + length
+
+
+# ================================================
+# VIRTUAL USERS
+# ================================================
+
+class Recorder:
+    def __init__(self):
+        self.requests = {name: [] for name in SCENARIOS}
+        self.runs = {name: [] for name in SCENARIOS}
+        self.bytes = {name: 0 for name in SCENARIOS}
+        self.statuses = {name: {} for name in SCENARIOS}
+        self.errors = {name: 0 for name in SCENARIOS}
+
+    def request(self, scenario, seconds, status, size):
+        self.requests[scenario].append(seconds)
+        self.bytes[scenario] += size
+        self.statuses[scenario][status] = self.statuses[scenario].get(status, 0) + 1
+        # 4xx responses are what the app would get too; they show up in statuses
+        if status >= 500:
+            self.errors[scenario] += 1
+
+
+async def run_scenario(connection, recorder, scenario, paths, base, encoding, etags=None):
+    start = time.perf_counter()
+    for path in paths:
+        headers = {'Accept': 'application/json', 'Accept-Encoding': encoding}
+        if etags is not None and path in etags:
+            headers['If-None-Match'] = etags[path]
+        sent = time.perf_counter()
+        try:
+            status, response_headers, size = await asyncio.wait_for(
+                connection.request(f"{base}/{path}", headers), REQUEST_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            await connection.close()
+            recorder.errors[scenario] += 1
+            continue
+        recorder.request(scenario, time.perf_counter() - sent, status, size)
+        if etags is not None and 'etag' in response_headers:
+            etags[path] = response_headers['etag']
+    recorder.runs[scenario].append(time.perf_counter() - start)
+
+
+async def virtual_user(user, args, plan, recorder, host, port, base):
+    rng = random.Random(f"{args.seed}-{user}")
+    await asyncio.sleep(args.ramp * user / max(args.users, 1))
+
+    async def think():
+        if args.think > 0:
+            await asyncio.sleep(rng.expovariate(1 / args.think))
+
+    connection = Connection(host, port)
+    encoding = 'identity' if args.no_compression else 'gzip, br'
+    etags = {}
+    try:
+        await run_scenario(connection, recorder, 'load_all', plan['load_all'], base, encoding, etags)
+        for _ in range(args.labs if plan['tool_labs'] else 0):
+            await think()
+            await run_scenario(connection, recorder, 'tool_lab', [rng.choice(plan['tool_labs'])], base, encoding)
+        await think()
+        await run_scenario(connection, recorder, 'linux_guide', [LINUX_GUIDE], base, encoding)
+        await think()
+        await run_scenario(connection, recorder, 'revisit', plan['load_all'], base, encoding, etags)
+    finally:
+        await connection.close()
+
+
+async def run_load(args, plan):
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    base = url.path.rstrip('/') + '/data'
+    recorder = Recorder()
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(user, args, plan, recorder, host, port, base)
+                           for user in range(args.users)))
+    return recorder, time.perf_counter() - start
+
+
+# ================================================
+# REPORT
+# ================================================
+
+def percentile(values, p):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, -(-p * len(ordered) // 100) - 1))]
+
+
+def _latency(values):
+    return {f"p{p}_ms": round(percentile(values, p) * 1000, 2) if values else None for p in PERCENTILES}
+
+
+def summarise(recorder, elapsed, args):
+    scenarios = {}
+    for name in SCENARIOS:
+        count = len(recorder.requests[name])
+        scenarios[name] = {
+            'runs': len(recorder.runs[name]),
+            'requests': count,
+            'errors': recorder.errors[name],
+            'statuses': {str(k): v for k, v in sorted(recorder.statuses[name].items())},
+            'request_latency': _latency(recorder.requests[name]),
+            'run_latency': _latency(recorder.runs[name]),
+            'bytes': recorder.bytes[name],
+            'requests_per_second': round(count / elapsed, 1) if elapsed else None,
+        }
+    total_requests = sum(s['requests'] for s in scenarios.values())
+    total_bytes = sum(s['bytes'] for s in scenarios.values())
+    return {
+        'version': 1,
+        'config': {'url': args.url, 'users': args.users, 'ramp': args.ramp, 'think': args.think,
+                   'labs': args.labs, 'seed': args.seed, 'compression': not args.no_compression},
+        'elapsed_seconds': round(elapsed, 3),
+        'totals': {
+            'requests': total_requests,
+            'errors': sum(s['errors'] for s in scenarios.values()),
+            'bytes': total_bytes,
+            'requests_per_second': round(total_requests / elapsed, 1) if elapsed else None,
+            'megabytes_per_second': round(total_bytes / 1048576 / elapsed, 2) if elapsed else None,
+        },
+        'scenarios': scenarios,
+    }
+
+
+def print_summary(report):
+    totals = report['totals']
+    print(f"\n  {'scenario':<13}{'runs':>6}{'reqs':>8}{'err':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'run p95 s':>11}{'MB':>8}")
+    for name, s in report['scenarios'].items():
+        lat, run = s['request_latency'], s['run_latency']
+        run_p95 = f"{run['p95_ms'] / 1000:.2f}" if run['p95_ms'] is not None else '-'
+        print(f"  {name:<13}{s['runs']:>6}{s['requests']:>8}{s['errors']:>6}"
+              f"{lat['p50_ms'] or 0:>9.1f}{lat['p95_ms'] or 0:>9.1f}{lat['p99_ms'] or 0:>9.1f}"
+              f"{run_p95:>11}{s['bytes'] / 1048576:>8.1f}")
+    print(f"\n  📊 {totals['requests']} requests in {report['elapsed_seconds']:.1f}s: "
+          f"{totals['requests_per_second']} req/s, {totals['megabytes_per_second']} MB/s, {totals['errors']} errors")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(data_dir):
+    """Start content_server.py on a free port; returns (process, url)"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content_server.py'),
+         '--port', str(port), '--data', data_dir],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}/"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("content_server.py did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the content server with simulated learners")
+    parser.add_argument('--url', default='http://127.0.0.1:8080/', help="app URL (content under /data/)")
+    parser.add_argument('--spawn-server', action='store_true', help="start content_server.py for the run")
+    parser.add_argument('--data', default=os.path.join(BUILD_DIR, 'data'), help="content for --spawn-server")
+    parser.add_argument('--users', type=int, default=100, help="virtual users")
+    parser.add_argument('--ramp', type=float, default=5.0, help="seconds over which users start")
+    parser.add_argument('--think', type=float, default=2.0, help="mean think time between scenarios (s)")
+    parser.add_argument('--labs', type=int, default=2, help="tool labs opened per user")
+    parser.add_argument('--seed', type=int, default=1, help="random seed (lab choice, think times)")
+    parser.add_argument('--no-compression', action='store_true', help="send Accept-Encoding: identity")
+    parser.add_argument('--report', default=REPORT_PATH, help="JSON report path")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONTENT LOAD TEST")
+    print("=" * 80)
+
+    plan = fetch_plan()
+    server = None
+    if args.spawn_server:
+        server, args.url = spawn_server(args.data)
+    print(f"  👥 {args.users} users over {args.ramp}s against {args.url}")
+    print(f"  📋 load_all: {len(plan['load_all'])} requests, {len(plan['tool_labs'])} tool labs\n")
+    try:
+        recorder, elapsed = asyncio.run(run_load(args, plan))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    report = summarise(recorder, elapsed, args)
+    write_json(args.report, report)
+    print_summary(report)
+    print(f"  📄 Report: {args.report}")
+    return 1 if report['totals']['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Pipeline Profiling Hooks
+
+Shared by the --profile option of content_build.py (normalize + enhance
+transforms and the build stages), validate_content.py and
+build_bundles.py:
+
+    profiler = Profiler('content_build')
+    with profiler.stage('documents'):
+        ...                                   # cProfile + tracemalloc + wall
+    profiler.record_file('documents', path, seconds)
+    profiler.record_transform('why_it_matters', seconds)
+    profiler.write()
+
+Output under build/profile/<name>/:
+    report.json        per stage: wall time, tracemalloc peak, top functions
+                       (cumulative); slowest files and slowest transforms,
+                       ranked
+    <stage>.prof       raw pstats dump (python -m pstats / snakeviz)
+    stacks.collapsed   "caller;callee <microseconds>" lines for flamegraph.pl
+                       or speedscope. cProfile keeps caller->callee edges,
+                       not full stacks, so these are flat two-frame edges:
+                       each function's own time is split across its direct
+                       callers in proportion to the time each call edge
+                       accounts for (functions without a caller stand
+                       alone). Deeper paths would have to be guessed and
+                       enumerating them grows exponentially with the call
+                       graph, so the flame graph is one level deep.
+
+cProfile and tracemalloc only see the current process, so profiled runs
+execute with --jobs 1.
+
+Usage:
+    python scripts/content_build.py --profile
+    python scripts/validate_content.py --profile
+    python scripts/build_bundles.py --profile
+"""
+
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from content_repo import BUILD_DIR, write_json, write_text
+
+PROFILE_DIR = os.path.join(BUILD_DIR, 'profile')
+TOP_FUNCTIONS = 25
+TOP_ITEMS = 20
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+class Profiler:
+    def __init__(self, name, output_dir=None):
+        self.name = name
+        self.output_dir = output_dir or os.path.join(PROFILE_DIR, name)
+        self.stages = {}
+        self.files = []
+        self.transforms = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Profile one pipeline stage (stages must not nest)"""
+        profile = cProfile.Profile()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            self.stages[name] = {'wall': wall, 'peak_bytes': peak, 'profile': profile}
+
+    def record_file(self, stage, path, seconds):
+        self.files.append({'stage': stage, 'path': path, 'seconds': seconds})
+
+    def record_transform(self, name, seconds, calls=1):
+        entry = self.transforms.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += calls
+
+    def write(self):
+        """Write report.json, <stage>.prof and stacks.collapsed. Returns the report."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stages = {}
+        collapsed = {}
+        for name, data in self.stages.items():
+            stats = pstats.Stats(data['profile'])
+            stats.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+            stages[name] = {
+                'wall_seconds': round(data['wall'], 6),
+                'peak_traced_kb': round(data['peak_bytes'] / 1024, 1),
+                'top_functions': top_functions(stats),
+            }
+            for stack, weight in collapse_stacks(stats).items():
+                key = f"{name};{stack}"
+                collapsed[key] = collapsed.get(key, 0) + weight
+
+        report = {
+            'name': self.name,
+            'stages': stages,
+            'slowest_files': [
+                dict(f, seconds=round(f['seconds'], 6))
+                for f in sorted(self.files, key=lambda f: -f['seconds'])[:TOP_ITEMS]
+            ],
+            'slowest_transforms': [
+                {'name': name, 'seconds': round(t['seconds'], 6), 'calls': t['calls'],
+                 'per_call_ms': round(t['seconds'] * 1000 / t['calls'], 4) if t['calls'] else 0}
+                for name, t in sorted(self.transforms.items(), key=lambda item: -item[1]['seconds'])
+            ],
+        }
+        write_json(os.path.join(self.output_dir, 'report.json'), report)
+        write_text(os.path.join(self.output_dir, 'stacks.collapsed'),
+                   ''.join(f"{stack} {weight}\n" for stack, weight in sorted(collapsed.items()) if weight > 0))
+        return report
+
+
+def top_functions(stats, limit=TOP_FUNCTIONS):
+    rows = []
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        rows.append({'function': _label(func), 'calls': nc,
+                     'own_seconds': round(tt, 6), 'cumulative_seconds': round(ct, 6)})
+    return sorted(rows, key=lambda row: -row['cumulative_seconds'])[:limit]
+
+
+def collapse_stacks(stats):
+    """Flat caller;callee edges (microseconds of callee own time), one pass over cProfile's edges"""
+    collapsed = {}
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        edge_total = sum(edge[3] for edge in callers.values())
+        if not callers or edge_total <= 0:
+            stacks = [(_label(func), 1.0)]
+        else:
+            stacks = [(f"{_label(caller)};{_label(func)}", edge[3] / edge_total)
+                      for caller, edge in callers.items()]
+        for stack, share in stacks:
+            collapsed[stack] = collapsed.get(stack, 0) + int(tt * share * 1e6)
+    return collapsed
+
+
+def print_summary(report):
+    print(f"\n  🔬 Profile: {report['name']}")
+    for name, stage in report['stages'].items():
+        print(f"     {name:<18}{stage['wall_seconds']:>9.3f}s  peak {stage['peak_traced_kb']:>9.0f} KB")
+    for f in report['slowest_files'][:5]:
+        print(f"     🐢 {f['stage']}: {f['path']} {f['seconds'] * 1000:.1f} ms")
+    for t in report['slowest_transforms'][:5]:
+        print(f"     🔧 {t['name']}: {t['seconds'] * 1000:.1f} ms over {t['calls']} calls")
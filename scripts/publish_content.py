@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Fingerprinted Publish Step
+
+Paths like data/lessons/D3-LESSON-006_Cryptography.json never change, so
+browsers and the CDN must revalidate everything (or serve stale JSON).
+This step copies every document and artifact listed in the built
+content-manifest.json to a content-addressed name:
+
+    build/public/data/lessons/D3-LESSON-006_Cryptography.3f9a1c0b2e.json
+
+along with its .gz/.br siblings, and writes a rewritten
+build/public/data/content-manifest.json whose entries carry a 'url' for
+the fingerprinted file plus a 'urls' map (logical path -> url) for
+resolving the logical paths used inside bundles and chunk shells.
+
+Unchanged content keeps the same hash and therefore the same name, so
+only edited files get new URLs. Everything except content-manifest.json
+can be served with `Cache-Control: public, max-age=31536000, immutable`;
+the manifest itself must be revalidated.
+
+The fingerprint is checked against the bytes actually being copied: if
+any file no longer matches its manifest hash (say after a --no-stages
+rebuild left the manifest stale), nothing is published, since edited
+content under an old immutable name would stay cached for a year.
+
+Superseded fingerprinted files are kept so clients holding an older
+manifest keep working; --prune removes them.
+
+The built tree is validated first (validate_content.py) and nothing is
+published if any document fails or any source document under data/ is
+missing from the build (e.g. it no longer parses); --skip-validation
+bypasses the gate.
+
+Usage:
+    python scripts/publish_content.py [--source build/data] [--output build/public/data] [--prune]
+"""
+
+import argparse
+import os
+import shutil
+
+from content_manifest import MANIFEST_NAME
+from content_repo import BUILD_DIR, hash_bytes, read_json, write_json
+from validate_content import validate_corpus
+
+PUBLIC_DIR = os.path.join(BUILD_DIR, 'public')
+HASH_LENGTH = 10
+COMPRESSED_SUFFIXES = ['.gz', '.br']
+
+
+def fingerprint_path(path, content_hash):
+    """lessons/X.json + abc123... -> lessons/X.abc123....json"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{content_hash[:HASH_LENGTH]}{ext}"
+
+
+def publish_file(source_dir, output_dir, path, url, raw):
+    """Write one file's verified bytes (and any missing compressed siblings) unless already published"""
+    target = os.path.join(output_dir, url)
+    for suffix in COMPRESSED_SUFFIXES:
+        sibling = os.path.join(source_dir, path + suffix)
+        if os.path.exists(sibling) and not os.path.exists(target + suffix):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(sibling, target + suffix)
+    if os.path.exists(target):
+        return False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(raw)
+    return True
+
+
+def read_verified(source_dir, entries):
+    """({path: bytes}, [paths whose bytes no longer match the manifest hash or are gone])"""
+    contents, stale = {}, []
+    for entry in entries:
+        try:
+            with open(os.path.join(source_dir, entry['path']), 'rb') as f:
+                raw = f.read()
+        except OSError:
+            stale.append(entry['path'])
+            continue
+        if hash_bytes(raw) != entry['hash']:
+            stale.append(entry['path'])
+        contents[entry['path']] = raw
+    return contents, stale
+
+
+def prune(output_dir, keep):
+    """Remove published files that the new manifest no longer references"""
+    removed = 0
+    for root, dirs, files in os.walk(output_dir):
+        for filename in files:
+            rel = os.path.relpath(os.path.join(root, filename), output_dir).replace(os.sep, '/')
+            base = rel
+            for suffix in COMPRESSED_SUFFIXES:
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            if base not in keep:
+                os.remove(os.path.join(root, filename))
+                removed += 1
+    return removed
+
+
+def publish(source_dir=os.path.join(BUILD_DIR, 'data'), output_dir=os.path.join(PUBLIC_DIR, 'data'),
+            prune_stale=False):
+    """Publish every manifest entry under its fingerprinted name. Returns (manifest, copied, removed).
+    Raises ValueError, before writing anything, when the manifest is stale.
+    """
+    manifest = read_json(os.path.join(source_dir, MANIFEST_NAME))
+    entries = manifest['documents'] + manifest['artifacts']
+    contents, stale = read_verified(source_dir, entries)
+    if stale:
+        raise ValueError(f"{len(stale)} files do not match the manifest hash (first: {stale[0]}); "
+                         f"rerun content_build.py with stages to refresh {MANIFEST_NAME}")
+
+    urls = {}
+    copied = 0
+    for entry in entries:
+        entry['url'] = fingerprint_path(entry['path'], entry['hash'])
+        urls[entry['path']] = entry['url']
+        if publish_file(source_dir, output_dir, entry['path'], entry['url'], contents[entry['path']]):
+            copied += 1
+
+    manifest['urls'] = urls
+    manifest['immutable'] = True
+    removed = prune(output_dir, set(urls.values()) | {MANIFEST_NAME}) if prune_stale else 0
+    write_json(os.path.join(output_dir, MANIFEST_NAME), manifest)
+    return manifest, copied, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish built content under fingerprinted names")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--output', default=os.path.join(PUBLIC_DIR, 'data'), help="publish directory")
+    parser.add_argument('--prune', action='store_true', help="remove superseded fingerprinted files")
+    parser.add_argument('--skip-validation', action='store_true', help="publish without validating first")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("FINGERPRINTED PUBLISH")
+    print("=" * 80)
+
+    if not args.skip_validation:
+        report = validate_corpus(args.source)
+        totals = report['totals']
+        if totals['failed']:
+            failed = [result for result in report['documents'] if result['errors']]
+            for result in failed[:10]:
+                print(f"  ❌ {result['path']}: {result['errors'][0][1]}")
+            missing = f", {totals['missing']} missing from the build" if totals['missing'] else ""
+            print(f"  ❌ {totals['failed']} documents fail validation{missing} - nothing published")
+            print("     Run scripts/validate_content.py for details")
+            return 1
+
+    try:
+        manifest, copied, removed = publish(args.source, args.output, args.prune)
+    except ValueError as e:
+        print(f"  ❌ {e} - nothing published")
+        return 1
+    total = len(manifest['urls'])
+    print(f"  ✅ {copied} new files published, {total - copied} unchanged (same name)")
+    if removed:
+        print(f"  🗑️  {removed} superseded files pruned")
+    print(f"  📄 Manifest: {os.path.join(args.output, MANIFEST_NAME)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
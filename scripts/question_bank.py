@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Unified Question Bank Compiler
+
+questions.json (flat list, `correct`) and the expanded SY0-701 bank
+(nested domains[].questions[], `correct_answer`, domain only on the parent)
+use different schemas, and DataLoader.loadQuestions stops at the first
+source that loads - the expanded bank is never used. This stage merges
+both into one normalised bank:
+
+    {n, id, uid, domain, difficulty, objective, question, options,
+     correct, explanation, sources[]}
+
+- n:    stable ordinal from the committed registry questions/ordinals.json
+        ({id: n}) in the build's source tree (data/ by default); index
+        arrays and exam forms use it. Unseen ids get the next free ordinals
+        in (domain, id) order; ordinals of removed questions are never
+        reused, so adding a question renumbers nothing. New ordinals are
+        only written back with --register-ordinals (here or on
+        content_build.py); other builds, watch mode and scratch trees
+        number them in memory and leave the registry alone
+- id:   the source question ID (e.g. D1-Q001)
+- uid:  hash of question text + options, stable across reorderings
+- Questions with the same id and identical content are merged (sources
+  lists both files); same id with different content keeps both, the later
+  one suffixed with its uid.
+
+Output: bank/questions.json with precomputed index arrays by_domain,
+by_difficulty and by_objective, so quizzes can slice without filtering.
+questions[n] is the question with ordinal n; retired ordinals hold null.
+Ids listed in bank/duplicates.json (written by the dedupe stage, which runs
+first) are left out, so the published bank is deduplicated.
+
+As a build stage it reuses the parsed corpus; run standalone it streams the
+source files with json_stream (one question, or one expanded-bank domain,
+in memory at a time).
+
+Usage:
+    python scripts/question_bank.py [--source build/data] [--sources data] [--register-ordinals]
+"""
+
+import argparse
+import os
+
+from content_repo import BUILD_DIR, DATA_DIR, discover_documents, hash_json, read_json, write_json
+from json_stream import iter_content_items, iter_items
+
+BANK_PATH = 'bank/questions.json'
+SOURCE_TYPES = ['questions', 'question_bank']
+ORDINALS_FILE = os.path.join('questions', 'ordinals.json')
+# Written by the dedupe stage (dedupe_questions.py), which runs first
+DUPLICATES_PATH = 'bank/duplicates.json'
+UNRATED = 'unrated'
+
+
+def normalize_correct(raw, options):
+    """Accept an option index or the option text; return the index or None"""
+    if isinstance(raw, bool):
+        return None
+    if isinstance(raw, int):
+        return raw if 0 <= raw < len(options) else None
+    if isinstance(raw, str):
+        if raw in options:
+            return options.index(raw)
+        if len(raw) == 1 and raw.upper() in 'ABCDEFGH':
+            index = ord(raw.upper()) - ord('A')
+            return index if index < len(options) else None
+    return None
+
+
+def normalize_question(item, domain, source):
+    """Map one source question onto the unified schema"""
+    options = item.get('options') or []
+    correct = item.get('correct', item.get('correct_answer', item.get('answer')))
+    objective = item.get('objective') or item.get('objective_id')
+    return {
+        'id': item.get('id', ''),
+        'uid': hash_json({'question': item.get('question', ''), 'options': options})[:12],
+        'domain': item.get('domain', domain),
+        'difficulty': item.get('difficulty') or UNRATED,
+        'objective': str(objective) if objective else None,
+        'question': item.get('question', ''),
+        'options': options,
+        'correct': normalize_correct(correct, options),
+        'explanation': item.get('explanation', ''),
+        'sources': [source],
+    }
+
+
+def iter_source_questions(doc):
+    """Yield raw questions with their inherited domain from either schema"""
+    data = doc['data']
+    if isinstance(data, list):
+        for item in data:
+            yield item, None
+    elif isinstance(data, dict):
+        for item in data.get('questions', []):
+            yield item, None
+        for domain in data.get('domains', []):
+            for item in domain.get('questions', []):
+                yield item, domain.get('domain_id')
+
+
+def stream_source_questions(data_dir):
+    """Yield (item, domain, path) straight from the source files, one item (or
+    one expanded-bank domain) in memory at a time instead of whole files"""
+    for entry in discover_documents(data_dir, SOURCE_TYPES):
+        filepath = os.path.join(data_dir, entry['path'])
+        if entry['type'] == 'question_bank':
+            # Questions inherit domain_id from their parent, so stream a domain at a time
+            for domain in iter_items(filepath, 'domains.item'):
+                for item in domain.get('questions', []) if isinstance(domain, dict) else []:
+                    yield item, domain.get('domain_id'), entry['path']
+        else:
+            for item in iter_content_items(filepath, entry['type']):
+                yield item, None, entry['path']
+
+
+def corpus_source_questions(corpus):
+    """Yield (item, domain, path) from an already parsed corpus"""
+    for doc in corpus:
+        if doc['type'] in SOURCE_TYPES:
+            for item, domain in iter_source_questions(doc):
+                yield item, domain, doc['path']
+
+
+def ordinals_path(source_dir=DATA_DIR):
+    """The registry lives in the source tree whose questions it numbers"""
+    return os.path.join(source_dir, ORDINALS_FILE)
+
+
+def load_ordinals(path=None):
+    """The persisted {question id: n} registry, or {} if there is none yet"""
+    try:
+        return read_json(path or ordinals_path())
+    except (ValueError, OSError):
+        return {}
+
+
+def stage_ordinals(options):
+    """The registry for a build stage: options['source_dir'] names the source tree"""
+    return load_ordinals(ordinals_path((options or {}).get('source_dir', DATA_DIR)))
+
+
+def save_ordinals(ordinals, path=None):
+    write_json(path or ordinals_path(), dict(sorted(ordinals.items(), key=lambda item: item[1])))
+
+
+def compile_questions(corpus, ordinals=None):
+    """Merge every question source into the normalised list, ordered by n
+    ordinals (the registry) gains an entry for every unseen id; by default it
+    is loaded read-only, so callers that only read the bank agree with it.
+    """
+    return merge_questions(corpus_source_questions(corpus), ordinals)
+
+
+def load_dropped(output_dir):
+    """Ids the dedupe stage dropped as near-duplicates, or an empty set"""
+    try:
+        return set(read_json(os.path.join(output_dir, DUPLICATES_PATH))['dropped'])
+    except (ValueError, OSError, KeyError, TypeError):
+        return set()
+
+
+def published_questions(corpus, output_dir, ordinals=None):
+    """The questions the published bank holds: compiled, minus dropped duplicates"""
+    dropped = load_dropped(output_dir)
+    return [q for q in compile_questions(corpus, ordinals) if q['id'] not in dropped]
+
+
+def merge_questions(items, ordinals=None):
+    """Normalise and merge (item, domain, path) triples from either source"""
+    by_id = {}
+    for item, domain, path in items:
+        if not isinstance(item, dict) or not item.get('question'):
+            continue
+        question = normalize_question(item, domain, path)
+        existing = by_id.get(question['id'])
+        if existing is None:
+            by_id[question['id']] = question
+        elif existing['uid'] == question['uid']:
+            if path not in existing['sources']:
+                existing['sources'].append(path)
+        else:
+            question['id'] = f"{question['id']}-{question['uid']}"
+            by_id[question['id']] = question
+
+    if ordinals is None:
+        ordinals = load_ordinals()
+    next_n = max(ordinals.values(), default=-1) + 1
+    for question in sorted(by_id.values(), key=lambda q: (q['domain'] or 0, q['id'])):
+        if question['id'] not in ordinals:
+            ordinals[question['id']] = next_n
+            next_n += 1
+        question['n'] = ordinals[question['id']]
+    return sorted(by_id.values(), key=lambda q: q['n'])
+
+
+def build_indexes(questions):
+    """Precomputed ordinal arrays for slicing without filtering the pool"""
+    indexes = {'by_domain': {}, 'by_difficulty': {}, 'by_objective': {}}
+    for q in questions:
+        indexes['by_domain'].setdefault(str(q['domain']), []).append(q['n'])
+        indexes['by_difficulty'].setdefault(q['difficulty'], []).append(q['n'])
+        if q['objective']:
+            indexes['by_objective'].setdefault(q['objective'], []).append(q['n'])
+    return {name: dict(sorted(index.items())) for name, index in indexes.items()}
+
+
+def build_question_bank(corpus, output_dir, options=None):
+    """Build stage: write bank/questions.json. Returns the bank.
+    New ordinals are saved to the source tree's registry only with options['register_ordinals'].
+    """
+    options = options or {}
+    path = ordinals_path(options.get('source_dir', DATA_DIR))
+    ordinals = load_ordinals(path)
+    known = len(ordinals)
+    questions = published_questions(corpus, output_dir, ordinals)
+    if options.get('register_ordinals') and len(ordinals) != known:
+        save_ordinals(ordinals, path)
+    return write_bank(questions, output_dir, options.get('compact', False))
+
+
+def bank_document(questions):
+    """The bank wrapper: questions[n] holds ordinal n, null where n is retired"""
+    fields = ['n', 'id', 'uid', 'domain', 'difficulty', 'objective',
+              'question', 'options', 'correct', 'explanation', 'sources']
+    slots = [None] * (max((q['n'] for q in questions), default=-1) + 1)
+    for q in questions:
+        slots[q['n']] = {field: q[field] for field in fields}
+    return {
+        'version': 1,
+        'total_questions': len(questions),
+        'invalid_answers': [q['id'] for q in questions if q['correct'] is None],
+        'indexes': build_indexes(questions),
+        'questions': slots,
+    }
+
+
+def write_bank(questions, output_dir, compact=False):
+    bank = bank_document(questions)
+    write_json(os.path.join(output_dir, BANK_PATH), bank, compact)
+    return bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the unified question bank")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--sources', default=DATA_DIR, help="source tree holding questions/ordinals.json")
+    parser.add_argument('--register-ordinals', action='store_true',
+                        help="save ordinals for new question ids to the registry")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON")
+    args = parser.parse_args()
+    registry = ordinals_path(args.sources)
+
+    print("=" * 80)
+    print("UNIFIED QUESTION BANK")
+    print("=" * 80)
+
+    try:
+        # Standalone runs stream the sources rather than parsing each file whole
+        ordinals = load_ordinals(registry)
+        known = len(ordinals)
+        dropped = load_dropped(args.source)
+        questions = [q for q in merge_questions(stream_source_questions(args.source), ordinals)
+                     if q['id'] not in dropped]
+    except ValueError as e:
+        print(f"  ❌ {e}")
+        return 1
+    if len(ordinals) != known and args.register_ordinals:
+        save_ordinals(ordinals, registry)
+        print(f"  📝 {len(ordinals) - known} new ordinals registered in {registry}")
+    elif len(ordinals) != known:
+        print(f"  ⚠️ {len(ordinals) - known} questions have no registered ordinal; "
+              f"rerun with --register-ordinals to keep their numbers stable")
+    bank = write_bank(questions, args.source, args.minify)
+
+    note = f" ({len(dropped)} near-duplicates dropped)" if dropped else ""
+    print(f"  ✅ {bank['total_questions']} unique questions{note}")
+    for domain, ordinals in bank['indexes']['by_domain'].items():
+        print(f"     Domain {domain}: {len(ordinals)}")
+    if bank['invalid_answers']:
+        print(f"  ⚠️ {len(bank['invalid_answers'])} questions without a valid answer index")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
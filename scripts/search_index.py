@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Build-Time Full-Text Search Index
+
+Client-side search would mean downloading and scanning every JSON file.
+This stage tokenises the built corpus once and writes an inverted index
+sharded by term prefix, so a query only fetches the shards for its terms.
+
+Indexed units (each result points at one):
+- lesson sections          (every string in the section)
+- simulation decision points   (title, situation/narrative/question, options)
+- remediation decision points
+- tool-lab core_concepts and cheat_sheet sections
+- glossary terms           (data/lessons/glossary.json)
+
+Output under search/:
+    index.json             units table, shard list, tokenizer + BM25 stats
+    shards/<prefix>.json   {term: [[unit, [position deltas...]], ...]}
+
+Both are written as compact JSON regardless of --minify: nobody reads
+them by hand, and indenting the postings more than doubled their size.
+
+Positions count every token (stopwords included) so phrase queries can
+check adjacency; stopwords themselves are not indexed. Tokenising runs per
+document across the process pool (--jobs N) and postings are merged in
+corpus order, so build time stays linear in corpus size.
+
+Usage:
+    python scripts/search_index.py [--source build/data] [--jobs N]
+"""
+
+import argparse
+import os
+import re
+import shutil
+
+from content_repo import BUILD_DIR, load_corpus, memo_map, unwrap, write_json
+
+SEARCH_DIR = 'search'
+PREFIX_LENGTH = 2
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how if in into is it its
+of on or that the their then there these this to was were what when which who will with
+you your
+""".split())
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def iter_strings(value):
+    """Every string inside a nested JSON value, in document order"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+
+
+def _decision_units(body, kind):
+    for index, dp in enumerate(body.get('decision_points', [])):
+        if isinstance(dp, dict):
+            anchor = dp.get('id') or f"dp{index + 1}"
+            yield anchor, kind, dp.get('title', ''), dp
+
+
+def extract_units(content_type, doc_id, data):
+    """Yield (anchor, kind, title, value) for each searchable unit of a document"""
+    body = unwrap(data)
+    if content_type == 'lesson':
+        for index, section in enumerate(body.get('sections', [])):
+            anchor = section.get('section_id') or f"{doc_id}-S{index + 1:02d}"
+            yield anchor, 'lesson_section', section.get('title', ''), section
+    elif content_type == 'simulation':
+        yield from _decision_units(body, 'simulation_decision')
+    elif content_type == 'remediation':
+        yield from _decision_units(body, 'remediation_decision')
+    elif content_type == 'tool_lab':
+        for concept in body.get('core_concepts', []):
+            yield concept.get('concept_id', ''), 'tool_concept', concept.get('title', ''), concept
+        cheat_sheet = body.get('cheat_sheet', {})
+        for index, section in enumerate(cheat_sheet.get('sections', []) if isinstance(cheat_sheet, dict) else []):
+            yield f"cheat-{index + 1}", 'tool_cheat_sheet', section.get('title', ''), section
+    elif content_type == 'glossary':
+        for domain, terms in sorted(body.items()):
+            for term in terms:
+                yield term.get('term', ''), 'glossary_term', term.get('term', ''), term
+
+
+def index_document(args):
+    """Tokenise one document into units with per-term, delta-encoded positions"""
+    content_type, doc_id, path, data = args
+    units = []
+    for anchor, kind, title, value in extract_units(content_type, doc_id, data):
+        positions = {}
+        length = 0
+        for text in iter_strings(value):
+            for token in tokenize(text):
+                if token not in STOPWORDS:
+                    positions.setdefault(token, []).append(length)
+                length += 1
+        if length:
+            units.append({
+                'ref': {'doc': doc_id, 'path': path, 'anchor': anchor, 'kind': kind, 'title': title},
+                'length': length,
+                'positions': {term: delta_encode(p) for term, p in positions.items()},
+            })
+    return units
+
+
+def delta_encode(positions):
+    previous = 0
+    deltas = []
+    for position in positions:
+        deltas.append(position - previous)
+        previous = position
+    return deltas
+
+
+def shard_key(term):
+    return term[:PREFIX_LENGTH]
+
+
+def build_search_index(corpus, output_dir, options=None):
+    """Build stage: write search/index.json and the prefix shards. Returns index metadata."""
+    options = options or {}
+    tasks = [(doc['type'], doc['id'], doc['path'], doc['data']) for doc in corpus]
+    # In watch mode only documents whose parsed data changed are re-tokenised
+    per_document = memo_map(index_document, tasks, options, 'search_index', lambda task: (task[2], task[3]))
+
+    units = []
+    shards = {}
+    total_length = 0
+    for doc_units in per_document:
+        for unit in doc_units:
+            unit_no = len(units)
+            units.append(dict(unit['ref'], length=unit['length']))
+            total_length += unit['length']
+            for term, positions in unit['positions'].items():
+                shard = shards.setdefault(shard_key(term), {})
+                shard.setdefault(term, []).append([unit_no, positions])
+
+    search_dir = os.path.join(output_dir, SEARCH_DIR)
+    memo = options.get('memo')
+    written = memo.setdefault('search_shards', {}) if memo is not None else {}
+    if not written:
+        shutil.rmtree(os.path.join(search_dir, 'shards'), ignore_errors=True)
+    shard_list = {}
+    for key in sorted(shards):
+        terms = dict(sorted(shards[key].items()))
+        # In watch mode a shard whose postings are unchanged is not rewritten
+        if key in written and written[key][0] == terms:
+            shard_list[key] = written[key][1]
+            continue
+        # Machine-only artifacts: always compact, --minify or not
+        raw = write_json(os.path.join(search_dir, 'shards', f"{key}.json"), terms, compact=True)
+        shard_list[key] = {'terms': len(terms), 'bytes': len(raw)}
+        if memo is not None:
+            written[key] = (terms, shard_list[key])
+    for key in set(written) - set(shards):
+        os.remove(os.path.join(search_dir, 'shards', f"{key}.json"))
+        del written[key]
+
+    index = {
+        'version': 1,
+        'tokenizer': {
+            'pattern': TOKEN_PATTERN.pattern,
+            'lowercase': True,
+            'stopwords': sorted(STOPWORDS),
+            'prefix_length': PREFIX_LENGTH,
+        },
+        'stats': {
+            'units': len(units),
+            'terms': sum(s['terms'] for s in shard_list.values()),
+            'avg_length': round(total_length / len(units), 2) if units else 0,
+        },
+        'shards': shard_list,
+        'units': units,
+    }
+    write_json(os.path.join(search_dir, 'index.json'), index, compact=True)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the sharded full-text search index")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SEARCH INDEX")
+    print("=" * 80)
+
+    corpus, errors = load_corpus(args.source)
+    for e in errors:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    index = build_search_index(corpus, args.source, {'jobs': args.jobs})
+    stats = index['stats']
+    print(f"  ✅ {stats['units']} units, {stats['terms']} terms, {len(index['shards'])} shards")
+    largest = max(index['shards'].items(), key=lambda item: item[1]['bytes'], default=None)
+    if largest:
+        print(f"  📦 largest shard '{largest[0]}': {largest[1]['bytes'] / 1024:.0f} KB")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Service Worker Precache Manifest
+
+manifest.json declares a standalone PWA, but nothing caches content
+offline. This step derives the offline plan from the files actually
+built and writes, next to the published data/ tree:
+
+    precache-manifest.json   {url, revision, size} split into tiers:
+                             - critical:  fetched at install - only what first
+                               paint needs (catalog, bundle manifest, chunk index)
+                             - on_demand: precached at idle time
+                             totals also count the runtime-only files, which
+                             are cached when first fetched
+    sw-cache-config.json     cache name + per-route strategies matching the
+                             precache tiers
+
+Most content is built in several forms (a lesson is a document, part of a
+domain bundle and a set of chunks), so each item is precached in exactly
+one of them and the others stay runtime-only:
+
+- lessons            chunks (shell, sections, extras)
+- questions, banks   bank/questions.json (+ pbqs.json, which it does not cover)
+- glossary           glossary/index.json
+- simulations, remediation, tool labs    their bundles
+- search shards and exam form pages are fetched per query / per exam, so
+  only search/index.json and exams/index.json are precached
+
+Reads the fingerprinted manifest from publish_content.py when present,
+otherwise the logical build manifest (revisions then carry the content hash).
+
+Usage:
+    python scripts/service_worker_manifest.py [--public build/public] [--build build/data]
+"""
+
+import argparse
+import os
+import re
+
+from chunk_lessons import CHUNK_DIR
+from content_manifest import MANIFEST_NAME
+from content_repo import BUILD_DIR, hash_json, read_json, write_json
+from publish_content import HASH_LENGTH, PUBLIC_DIR
+
+ONE_YEAR = 31536000
+
+
+# Precached at install: what the first screen needs
+CRITICAL_PATHS = {'catalog/catalog.json', 'bundles/manifest.json', f"{CHUNK_DIR}/index.json"}
+# Document types precached through a derived artifact instead (chunks, bank, glossary)
+DERIVED_TYPES = {'lesson', 'questions', 'question_bank', 'glossary'}
+# Bundle types whose content is precached in another form
+RUNTIME_BUNDLE_TYPES = {'lessons', 'questions'}
+# Fetched one file at a time (per search term / per exam), or per-domain
+# splits of glossary/index.json; never precached
+RUNTIME_PREFIXES = ('search/shards/', 'exams/forms/', 'glossary/D', 'glossary/shared')
+
+
+def precache_tier(entry, bundles, bundled_ids):
+    """'critical', 'on_demand' or 'runtime' - one precached representation per content item"""
+    path = entry['path']
+    if path in CRITICAL_PATHS:
+        return 'critical'
+    if path.startswith(RUNTIME_PREFIXES):
+        return 'runtime'
+    if path in bundles:
+        return 'runtime' if bundles[path]['type'] in RUNTIME_BUNDLE_TYPES else 'on_demand'
+    if 'type' in entry and (entry['type'] in DERIVED_TYPES or entry.get('id') in bundled_ids):
+        return 'runtime'
+    return 'on_demand'
+
+
+def build_precache(manifest, bundles, prefix='data/'):
+    """Split every manifest entry into critical / on_demand / runtime tiers"""
+    bundled_ids = {doc_id for path, bundle in bundles.items() if bundle['type'] not in RUNTIME_BUNDLE_TYPES
+                   for doc_id in bundle.get('ids', [])}
+    tiers = {'critical': [], 'on_demand': [], 'runtime': []}
+    for entry in manifest['documents'] + manifest['artifacts']:
+        item = {
+            'url': prefix + entry.get('url', entry['path']),
+            'revision': entry['hash'][:HASH_LENGTH],
+            'size': entry['bytes'],
+            'compressed_size': entry.get('compressed_bytes'),
+        }
+        tiers[precache_tier(entry, bundles, bundled_ids)].append(item)
+    return tiers
+
+
+def build_cache_config(version, fingerprinted, prefix='data/'):
+    """Route strategies that match the precache tiers"""
+    content_route = {
+        'pattern': rf"^/?{prefix}.*\.json$",
+        'cache': f"content-{version}",
+    }
+    if fingerprinted:
+        # Fingerprinted names never change content: serve from cache forever
+        content_route.update(
+            pattern=rf"^/?{prefix}.*\.[0-9a-f]{{{HASH_LENGTH}}}\.json$",
+            strategy='cache-first',
+            max_age_seconds=ONE_YEAR,
+        )
+    else:
+        content_route.update(strategy='stale-while-revalidate')
+
+    return {
+        'version': version,
+        'cache_name': f"content-{version}",
+        'precache': {
+            'critical': 'install',
+            'on_demand': 'idle',
+        },
+        'routes': [
+            {
+                'pattern': rf"^/?{re.escape(prefix + MANIFEST_NAME)}$",
+                'strategy': 'network-first',
+                'cache': 'content-manifest',
+            },
+            content_route,
+        ],
+        'cleanup_outdated_caches': True,
+    }
+
+
+def generate(public_dir=PUBLIC_DIR, build_dir=os.path.join(BUILD_DIR, 'data')):
+    """Write precache-manifest.json and sw-cache-config.json. Returns (precache, config)."""
+    published = os.path.join(public_dir, 'data', MANIFEST_NAME)
+    fingerprinted = os.path.exists(published)
+    manifest = read_json(published if fingerprinted else os.path.join(build_dir, MANIFEST_NAME))
+
+    try:
+        bundles = read_json(os.path.join(build_dir, 'bundles', 'manifest.json'))['bundles']
+    except (ValueError, OSError, KeyError):
+        bundles = []
+
+    tiers = build_precache(manifest, {b['path']: b for b in bundles})
+    version = hash_json({tier: tiers[tier] for tier in ('critical', 'on_demand')})[:HASH_LENGTH]
+    precache = {
+        'version': version,
+        'fingerprinted': fingerprinted,
+        'totals': {
+            tier: {'files': len(items), 'bytes': sum(i['size'] for i in items)}
+            for tier, items in tiers.items()
+        },
+        'critical': tiers['critical'],
+        'on_demand': tiers['on_demand'],
+    }
+    config = build_cache_config(version, fingerprinted)
+
+    write_json(os.path.join(public_dir, 'precache-manifest.json'), precache)
+    write_json(os.path.join(public_dir, 'sw-cache-config.json'), config)
+    return precache, config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the service worker precache plan")
+    parser.add_argument('--public', default=PUBLIC_DIR, help="published site directory")
+    parser.add_argument('--build', default=os.path.join(BUILD_DIR, 'data'), help="built content directory")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SERVICE WORKER PRECACHE")
+    print("=" * 80)
+
+    precache, config = generate(args.public, args.build)
+    for tier, totals in precache['totals'].items():
+        print(f"  ✅ {tier}: {totals['files']} files, {totals['bytes'] / 1024:.0f} KB")
+    mode = "fingerprinted (cache-first)" if precache['fingerprinted'] else "logical paths (stale-while-revalidate)"
+    print(f"\n  📦 version {precache['version']}, {mode}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
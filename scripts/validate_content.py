@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+Schema-Driven Content Validator
+
+Replaces validate_lessons.py, which only looked at lessons, read each file
+twice and hardcoded the lesson total. Every document of every content type
+is parsed exactly once and checked against the schema for its type:
+
+- SCHEMAS holds one declarative schema per content type, built from the
+  helpers below (obj / array / one_of / string); compile_schema turns each
+  into a tree of closures once, at import, so checking a document is a
+  single walk with no spec interpretation
+- obj() field names: 'name' is required, 'name?' optional, 'name~'
+  recommended (missing -> warning rather than error)
+- RULES adds per-type checks a schema cannot express (answer index in
+  range, IDs matching filenames, ...)
+
+Files are validated across the process pool (--jobs N) and merged in path
+order. A document under --sources (data/) with no built counterpart -
+typically a source that failed to parse - counts as a failed document, as
+does a built document whose source is gone, so a build that silently
+dropped content or kept deleted content cannot pass. The machine-readable
+report goes to build/reports/validation.json;
+the exit code is 1 when any document has errors (or warnings, with
+--strict), so it can gate publish_content.py.
+
+Usage:
+    python scripts/validate_content.py [--source build/data] [--sources data] [--jobs N] [--strict] [--profile]
+"""
+
+import argparse
+import contextlib
+import os
+import re
+import time
+
+from content_repo import BUILD_DIR, DATA_DIR, discover_documents, document_id, parallel_map, read_json, unwrap, write_json
+from profiling import Profiler, print_summary as print_profile
+from question_bank import normalize_correct
+
+REPORT_PATH = os.path.join(BUILD_DIR, 'reports', 'validation.json')
+
+LESSON_ID = r'^D[1-5]-LESSON-\d{3}$'
+
+
+# ================================================
+# SCHEMA HELPERS
+# ================================================
+
+def obj(fields=None, extra=None):
+    """Object with named fields; `extra` validates the values of unlisted keys"""
+    return {'kind': 'object', 'fields': fields or {}, 'extra': extra}
+
+
+def array(items='any', min_items=0):
+    return {'kind': 'array', 'items': items, 'min_items': min_items}
+
+
+def one_of(*specs):
+    return {'kind': 'one_of', 'specs': specs}
+
+
+def string(pattern=None, min_length=1):
+    return {'kind': 'string', 'pattern': pattern, 'min_length': min_length}
+
+
+SCALARS = {
+    'any': (object,),
+    'str': (str,),
+    'int': (int,),
+    'number': (int, float),
+    'bool': (bool,),
+    'dict': (dict,),
+    'list': (list,),
+    'null': (type(None),),
+}
+
+TYPE_NAMES = {dict: 'object', list: 'array', str: 'string', int: 'integer',
+              float: 'number', bool: 'boolean', type(None): 'null'}
+
+
+def _type_name(value):
+    return TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+# ================================================
+# SCHEMAS
+# ================================================
+
+CHOICE_QUESTION = obj({
+    'question': 'text',
+    'options': array('text', min_items=2),
+    'correct?': one_of('int', 'str'),
+    'correct_answer?': one_of('int', 'str'),
+    'explanation~': 'text',
+})
+
+OPEN_QUESTION = obj({
+    'question': 'text',
+    'answer': 'text',
+    'explanation~': 'text',
+})
+
+LESSON_CHECK = one_of(CHOICE_QUESTION, OPEN_QUESTION)
+
+DECISION_POINT = obj({
+    'sequence~': 'int',
+    'title': 'text',
+    'options': array(obj({
+        'id': 'text',
+        'text': 'text',
+        'feedback~': one_of('text', 'dict'),
+        'points?': 'number',
+        'is_correct?': 'bool',
+        'is_optimal?': 'bool',
+        'next_dp?': one_of('str', 'null'),
+    }), min_items=1),
+    'hints?': 'list',
+})
+
+SCENARIO = obj({
+    'title': 'text',
+    'difficulty~': 'text',
+    'domain~': 'int',
+    'decision_points': array(DECISION_POINT, min_items=1),
+    'prerequisites?': 'list',
+    'unlocks?': 'list',
+    'glossary?': obj(extra='str'),
+    'passing_score?': 'number',
+    'max_score?': 'number',
+})
+
+SCHEMAS = {
+    'lesson': obj({
+        'lesson_id': string(LESSON_ID),
+        'domain': 'int',
+        'title': 'text',
+        'subtitle~': 'text',
+        'version~': 'str',
+        'objectives_covered~': 'list',
+        'difficulty~': 'text',
+        'introduction': obj({
+            'hook~': 'text',
+            'learning_goals~': array('text', min_items=1),
+            'why_it_matters~': 'dict',
+        }),
+        'sections': array(obj({
+            'section_id~': 'text',
+            'title': 'text',
+            'content': one_of('text', 'dict'),
+            'key_points~': 'list',
+            'knowledge_check?': one_of(LESSON_CHECK, array(LESSON_CHECK)),
+            'micro_checks?': array(obj({'question': 'text'})),
+            'glossary_terms?': array(obj({'term': 'text', 'definition': 'text'})),
+        }), min_items=1),
+        'skill_tree': obj({
+            'prerequisites': array(obj({'lesson_id': 'text', 'title~': 'str'})),
+            'unlocks?': array(obj({'lesson_id': 'text', 'title~': 'str'})),
+        }),
+        'summary': obj({
+            'key_takeaways~': 'list',
+            'connection_to_next~': 'text',
+        }),
+        'related_content?': 'dict',
+        'hands_on_activity~': 'dict',
+        'what_would_you_do~': 'dict',
+    }),
+    'simulation': SCENARIO,
+    'remediation': SCENARIO,
+    'tool_lab': obj({
+        'lab_id': 'text',
+        'tool_name': 'text',
+        'tool_category~': 'text',
+        'overview': 'dict',
+        'security_plus_relevance~': obj({'domains?': array('int')}),
+        'core_concepts': array(obj({
+            'concept_id': 'text',
+            'title': 'text',
+            'explanation': 'text',
+        }), min_items=1),
+        'cheat_sheet~': 'dict',
+        'knowledge_check': array(CHOICE_QUESTION),
+        'next_steps~': obj({'related_labs?': 'list', 'related_lessons?': 'list'}),
+    }),
+    'guide': obj({
+        'guide_id': 'text',
+        'title': 'text',
+        'chapters': array('dict', min_items=1),
+    }),
+    'glossary': obj(extra=array(obj({'term': 'text', 'definition': 'text'}))),
+    'questions': array(obj({
+        'id': 'text',
+        'domain': 'int',
+        'question': 'text',
+        'options': array('text', min_items=2),
+        'correct': one_of('int', 'str'),
+        'explanation~': 'text',
+    })),
+    'question_bank': obj({
+        'total_questions~': 'int',
+        'domains': array(obj({
+            'domain_id': 'int',
+            'domain_name~': 'text',
+            'questions': array(obj({
+                'id': 'text',
+                'question': 'text',
+                'options': array('text', min_items=2),
+                'correct_answer': one_of('int', 'str'),
+                'explanation~': 'text',
+            })),
+        }), min_items=1),
+    }),
+    'pbqs': array(obj({
+        'id': 'text',
+        'domain': 'int',
+        'type': 'text',
+        'title': 'text',
+        'scenario': 'text',
+    })),
+    'simulation_collection': one_of(
+        array('dict'),
+        obj({'simulations': array('dict')}),
+    ),
+}
+
+
+# ================================================
+# COMPILER
+# ================================================
+
+def compile_schema(spec):
+    """Turn a schema spec into check(value, path, issues)"""
+    if spec == 'text':
+        return compile_schema(string())
+    if isinstance(spec, str):
+        types = SCALARS[spec]
+        if spec == 'any':
+            return lambda value, path, issues: None
+        exclude_bool = bool not in types
+
+        def check_scalar(value, path, issues):
+            if not isinstance(value, types) or (exclude_bool and isinstance(value, bool)):
+                issues['errors'].append([path, f"expected {spec}, got {_type_name(value)}"])
+        return check_scalar
+
+    kind = spec['kind']
+    if kind == 'string':
+        pattern = re.compile(spec['pattern']) if spec['pattern'] else None
+        min_length = spec['min_length']
+
+        def check_string(value, path, issues):
+            if not isinstance(value, str):
+                issues['errors'].append([path, f"expected string, got {_type_name(value)}"])
+            elif len(value.strip()) < min_length:
+                issues['errors'].append([path, "empty string"])
+            elif pattern and not pattern.match(value):
+                issues['errors'].append([path, f"does not match {pattern.pattern}"])
+        return check_string
+
+    if kind == 'array':
+        item_check = compile_schema(spec['items'])
+        min_items = spec['min_items']
+
+        def check_array(value, path, issues):
+            if not isinstance(value, list):
+                issues['errors'].append([path, f"expected array, got {_type_name(value)}"])
+                return
+            if len(value) < min_items:
+                issues['errors'].append([path, f"expected at least {min_items} items, got {len(value)}"])
+            for index, item in enumerate(value):
+                item_check(item, f"{path}[{index}]", issues)
+        return check_array
+
+    if kind == 'one_of':
+        checks = [compile_schema(option) for option in spec['specs']]
+
+        def check_one_of(value, path, issues):
+            attempts = []
+            for check in checks:
+                attempt = {'errors': [], 'warnings': []}
+                check(value, path, attempt)
+                if not attempt['errors']:
+                    issues['warnings'].extend(attempt['warnings'])
+                    return
+                attempts.append(attempt)
+            # Report the closest alternative
+            issues['errors'].extend(min(attempts, key=lambda a: len(a['errors']))['errors'])
+        return check_one_of
+
+    if kind == 'object':
+        fields = []
+        for key, field_spec in spec['fields'].items():
+            level = {'?': None, '~': 'warnings'}.get(key[-1], 'errors')
+            name = key[:-1] if key[-1] in '?~' else key
+            fields.append((name, level, compile_schema(field_spec)))
+        known = {name for name, _, _ in fields}
+        extra = compile_schema(spec['extra']) if spec['extra'] else None
+
+        def check_object(value, path, issues):
+            if not isinstance(value, dict):
+                issues['errors'].append([path, f"expected object, got {_type_name(value)}"])
+                return
+            for name, level, check in fields:
+                if name in value:
+                    check(value[name], f"{path}.{name}", issues)
+                elif level:
+                    issues[level].append([f"{path}.{name}", "missing"])
+            if extra:
+                for name, item in value.items():
+                    if name not in known:
+                        extra(item, f"{path}.{name}", issues)
+        return check_object
+
+    raise ValueError(f"Unknown schema kind: {kind}")
+
+
+COMPILED = {content_type: compile_schema(spec) for content_type, spec in SCHEMAS.items()}
+
+
+# ================================================
+# RULES
+# ================================================
+
+def _list(value):
+    """value if it is a list, else [] (the schema reports the wrong type)"""
+    return value if isinstance(value, list) else []
+
+
+def _answer_in_range(question, path, issues):
+    """Multiple-choice answers must resolve to an option (index, text or letter)"""
+    options = question.get('options')
+    correct = question.get('correct', question.get('correct_answer'))
+    if not isinstance(options, list) or correct is None:
+        return
+    if normalize_correct(correct, options) is None:
+        issues['errors'].append([path, f"answer {correct!r} does not match any of {len(options)} options"])
+
+
+def rule_lesson(doc, filename, issues):
+    lesson_id = doc.get('lesson_id')
+    # A missing or non-string lesson_id is already a schema error
+    if isinstance(lesson_id, str) and not filename.startswith(lesson_id + '_'):
+        issues['errors'].append(['$.lesson_id', f"does not match filename {filename}"])
+    seen = set()
+    for index, section in enumerate(_list(doc.get('sections'))):
+        if not isinstance(section, dict):
+            continue
+        section_id = section.get('section_id')
+        if not isinstance(section_id, str):
+            continue
+        if section_id in seen:
+            issues['errors'].append([f"$.sections[{index}].section_id", f"duplicate {section_id}"])
+        seen.add(section_id)
+        checks = section.get('knowledge_check')
+        for q_index, question in enumerate(checks if isinstance(checks, list) else [checks]):
+            if isinstance(question, dict):
+                _answer_in_range(question, f"$.sections[{index}].knowledge_check[{q_index}]", issues)
+
+
+def rule_scenario(doc, filename, issues):
+    if not document_id(doc, filename):
+        issues['errors'].append(['$', "no scenario_id / simulation_id / id"])
+    ids = [dp.get('id') or dp.get('dp_id') for dp in _list(doc.get('decision_points')) if isinstance(dp, dict)]
+    ids = {dp_id for dp_id in ids if isinstance(dp_id, str)}
+    for index, dp in enumerate(_list(doc.get('decision_points'))):
+        if not isinstance(dp, dict):
+            continue
+        for o_index, option in enumerate(_list(dp.get('options'))):
+            target = option.get('next_dp') if isinstance(option, dict) else None
+            if isinstance(target, str) and target and target not in ids:
+                issues['errors'].append([f"$.decision_points[{index}].options[{o_index}].next_dp",
+                                         f"unknown decision point {target}"])
+
+
+def rule_questions(doc, filename, issues):
+    items = doc if isinstance(doc, list) else [
+        q for domain in _list(doc.get('domains')) if isinstance(domain, dict)
+        for q in _list(domain.get('questions'))
+    ]
+    seen = set()
+    for index, question in enumerate(items):
+        if not isinstance(question, dict):
+            continue
+        _answer_in_range(question, f"$[{index}]", issues)
+        question_id = question.get('id')
+        if not isinstance(question_id, (str, int)):
+            continue
+        if question_id in seen:
+            issues['errors'].append([f"$[{index}].id", f"duplicate {question_id}"])
+        seen.add(question_id)
+
+
+def rule_tool_lab(doc, filename, issues):
+    for index, question in enumerate(_list(doc.get('knowledge_check'))):
+        if isinstance(question, dict):
+            _answer_in_range(question, f"$.knowledge_check[{index}]", issues)
+
+
+RULES = {
+    'lesson': [rule_lesson],
+    'simulation': [rule_scenario],
+    'remediation': [rule_scenario],
+    'questions': [rule_questions],
+    'question_bank': [rule_questions],
+    'tool_lab': [rule_tool_lab],
+}
+
+
+# ================================================
+# VALIDATION
+# ================================================
+
+def check_document(data, content_type, filename):
+    """Schema + rules for one parsed document. Returns {'errors', 'warnings'}."""
+    issues = {'errors': [], 'warnings': []}
+    body = unwrap(data)
+    COMPILED[content_type](body, '$', issues)
+    # Rules assume the top-level shape the schema checks (an object, or an
+    # array for question lists); the schema error alone reports a mismatch
+    if any(path == '$' for path, _ in issues['errors']):
+        return issues
+    for rule in RULES.get(content_type, []):
+        rule(body, filename, issues)
+    return issues
+
+
+def validate_document(task):
+    """Parse and check one file. Returns its report entry."""
+    source_dir, entry = task
+    issues = {'errors': [], 'warnings': []}
+    result = {'path': entry['path'], 'type': entry['type'], 'id': None}
+    try:
+        data = read_json(os.path.join(source_dir, entry['path']))
+    except (ValueError, OSError) as e:
+        issues['errors'].append(['$', f"unreadable: {e}"])
+        return dict(result, **issues)
+
+    result['id'] = document_id(data, entry['filename'])
+    return dict(result, **check_document(data, entry['type'], entry['filename']))
+
+
+def missing_documents(source_dir, sources_dir):
+    """Report entries for documents under sources_dir that have no counterpart in source_dir.
+    A source that fails to build leaves no output, so without this check it would never be reported.
+    """
+    if not sources_dir or os.path.realpath(sources_dir) == os.path.realpath(source_dir):
+        return []
+    built = {entry['path'] for entry in discover_documents(source_dir)}
+    return [
+        {'path': entry['path'], 'type': entry['type'], 'id': None,
+         'errors': [['$', f"missing from {source_dir}: the source failed to build or was never built"]],
+         'warnings': []}
+        for entry in discover_documents(sources_dir) if entry['path'] not in built
+    ]
+
+
+def orphaned_paths(source_dir, sources_dir):
+    """Paths of documents in source_dir with no counterpart under sources_dir (deleted sources)"""
+    if not sources_dir or os.path.realpath(sources_dir) == os.path.realpath(source_dir):
+        return set()
+    sources = {entry['path'] for entry in discover_documents(sources_dir)}
+    return {entry['path'] for entry in discover_documents(source_dir) if entry['path'] not in sources}
+
+
+def validate_corpus(source_dir, jobs=1, profiler=None, sources_dir=DATA_DIR):
+    """Validate every document; with a profiler, runs in-process and times each file
+    Every document under sources_dir must also be present in source_dir, and vice versa.
+    """
+    entries = discover_documents(source_dir)
+    tasks = [(source_dir, entry) for entry in entries]
+    if profiler:
+        results = []
+        for task in tasks:
+            start = time.perf_counter()
+            results.append(validate_document(task))
+            profiler.record_file('validate', task[1]['path'], time.perf_counter() - start)
+    else:
+        results = parallel_map(validate_document, tasks, jobs)
+    orphaned = orphaned_paths(source_dir, sources_dir)
+    for result in results:
+        if result['path'] in orphaned:
+            result['errors'].append(['$', f"no source in {sources_dir}: deleted, but still in the build"])
+    missing = missing_documents(source_dir, sources_dir)
+    results = sorted(results + missing, key=lambda r: r['path'])
+
+    by_type = {}
+    for result in results:
+        stats = by_type.setdefault(result['type'], {'documents': 0, 'failed': 0, 'errors': 0, 'warnings': 0})
+        stats['documents'] += 1
+        stats['failed'] += 1 if result['errors'] else 0
+        stats['errors'] += len(result['errors'])
+        stats['warnings'] += len(result['warnings'])
+
+    return {
+        'version': 1,
+        'source': source_dir,
+        'totals': {
+            'documents': len(results),
+            'failed': sum(1 for r in results if r['errors']),
+            'missing': len(missing),
+            'orphaned': len(orphaned),
+            'errors': sum(len(r['errors']) for r in results),
+            'warnings': sum(len(r['warnings']) for r in results),
+        },
+        'by_type': dict(sorted(by_type.items())),
+        'documents': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate every content document against its schema")
+    parser.add_argument('--source', default=os.path.join(BUILD_DIR, 'data'), help="content directory")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes (0 = one per CPU)")
+    parser.add_argument('--sources', default=DATA_DIR,
+                        help="source tree every built document must come from ('' to skip the check)")
+    parser.add_argument('--report', default=REPORT_PATH, help="JSON report path")
+    parser.add_argument('--strict', action='store_true', help="fail on warnings too")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile validation (implies --jobs 1), report under build/profile/")
+    args = parser.parse_args()
+    profiler = Profiler('validate') if args.profile else None
+
+    print("=" * 80)
+    print("CONTENT VALIDATION REPORT")
+    print("=" * 80)
+
+    with profiler.stage('validate') if profiler else contextlib.nullcontext():
+        report = validate_corpus(args.source, args.jobs, profiler, args.sources)
+    write_json(args.report, report)
+
+    for content_type, stats in report['by_type'].items():
+        passed = stats['documents'] - stats['failed']
+        status = "✅" if not stats['failed'] else "❌"
+        warnings = f", {stats['warnings']} warnings" if stats['warnings'] else ""
+        print(f"  {status} {content_type}: {passed}/{stats['documents']} valid{warnings}")
+
+    failed = [r for r in report['documents'] if r['errors']]
+    if failed:
+        print("\n" + "=" * 80)
+        print("❌ ERRORS")
+        print("=" * 80)
+        for result in failed:
+            print(f"\n  {result['path']}")
+            for path, message in result['errors'][:5]:
+                print(f"     - {path}: {message}")
+            if len(result['errors']) > 5:
+                print(f"     ... and {len(result['errors']) - 5} more")
+
+    warned = {}
+    for result in report['documents']:
+        for path, message in result['warnings']:
+            field = re.sub(r'\[\d+\]', '[]', path)
+            warned.setdefault(f"{result['type']} {field} {message}", []).append(result['id'] or result['path'])
+    if warned:
+        print("\n" + "=" * 80)
+        print("⚠️ WARNINGS")
+        print("=" * 80)
+        for label, documents in sorted(warned.items(), key=lambda item: -len(item[1])):
+            print(f"  ⚠️ {label}: {len(documents)}")
+
+    totals = report['totals']
+    print("\n" + "=" * 80)
+    notes = [f"{totals['missing']} missing from the build"] if totals['missing'] else []
+    notes += [f"{totals['orphaned']} with no source"] if totals['orphaned'] else []
+    missing = f" ({', '.join(notes)})" if notes else ""
+    print(f"VALIDATION COMPLETE: {totals['documents']} documents, {totals['failed']} failed{missing}, "
+          f"{totals['warnings']} warnings")
+    print(f"Report: {args.report}")
+    print("=" * 80)
+    if profiler:
+        print_profile(profiler.write())
+    if totals['failed'] or (args.strict and totals['warnings']):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
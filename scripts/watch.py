@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Content Watch Mode
+
+Editing a lesson used to mean rerunning the phase scripts, the build and
+the validator by hand. This keeps the build warm and redoes only what an
+edit touches:
+
+1. Initial build - the content_build.py document pass and every stage; the
+   built corpus then stays parsed in memory
+2. data/ is watched with inotify (via ctypes, Linux); elsewhere it falls
+   back to polling file mtimes every --poll seconds
+3. Events are debounced: a burst (editor save, git checkout) is collected
+   until --debounce ms pass without a new one
+4. Changed files go through build_document + validate_document only;
+   deleted files are removed from the build tree
+5. Only stages whose STAGE_INPUTS include a changed content type rerun,
+   against the in-memory corpus and a memo that lets unchanged documents
+   keep their search tokens, bundles and manifest measurements
+6. A dev server (--port) serves the app with /data/ mapped to the build
+   tree and pushes a Server-Sent Event after every rebuild; HTML pages get
+   a small script injected that reloads the page on it
+7. A rebuild that raises (say a stage tripping over a half-saved file) is
+   logged and sent as a 'build-error' event instead of stopping the watcher
+
+Usage:
+    python scripts/watch.py [--source data] [--output build/data] [--port 8000] [--debounce 150] [--no-serve]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import struct
+import threading
+import time
+import traceback
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from compress_content import remove_siblings, require_brotli
+from content_build import build_document, run_build, run_stages
+from content_repo import BUILD_DIR, CONTENT_DIRS, DATA_DIR, ROOT_DIR, discover_documents, load_corpus, load_document
+from validate_content import validate_document
+
+DEFAULT_PORT = 8000
+DEFAULT_DEBOUNCE_MS = 150
+DEFAULT_POLL_SECONDS = 0.5
+RELOAD_PATH = '/__livereload'
+RELOAD_SCRIPT = (
+    "<script>(() => { const events = new EventSource('" + RELOAD_PATH + "');"
+    " events.addEventListener('reload', () => location.reload());"
+    " events.addEventListener('build-error', e => console.error('Content rebuild failed', JSON.parse(e.data)));"
+    " })();</script>\n"
+)
+KEEPALIVE_SECONDS = 15
+
+
+# ================================================
+# WATCHERS
+# Both return the set of changed 'subdir/file.json' paths from wait(timeout);
+# timeout None blocks until something changes
+# ================================================
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT = struct.Struct('iIII')
+
+
+def _libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        libc.inotify_init1
+        return libc
+    except (OSError, AttributeError):  # not Linux - the polling watcher is used
+        return None
+
+
+def _json_files(source_dir):
+    """{'subdir/file.json': (mtime_ns, size)} for every JSON file in the content dirs"""
+    files = {}
+    for subdir in CONTENT_DIRS:
+        full_dir = os.path.join(source_dir, subdir)
+        if not os.path.isdir(full_dir):
+            continue
+        for entry in os.scandir(full_dir):
+            if entry.name.endswith('.json') and entry.is_file():
+                stat = entry.stat()
+                files[f"{subdir}/{entry.name}"] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+class InotifyWatcher:
+    """data/ and its content subdirectories (which are flat) via inotify"""
+
+    def __init__(self, source_dir, libc):
+        self.source_dir = source_dir
+        self.libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        self._add(source_dir, None)
+        for subdir in CONTENT_DIRS:
+            if os.path.isdir(os.path.join(source_dir, subdir)):
+                self._add(os.path.join(source_dir, subdir), subdir)
+
+    def _add(self, path, subdir):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.dirs[wd] = subdir
+
+    def _read(self):
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(self.fd, 65536)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        buf = self._read()
+        changed = set()
+        offset = 0
+        while offset + EVENT.size <= len(buf):
+            wd, mask, _, length = EVENT.unpack_from(buf, offset)
+            name = buf[offset + EVENT.size:offset + EVENT.size + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: treat every file as changed
+                changed.update(_json_files(self.source_dir))
+                continue
+            subdir = self.dirs.get(wd)
+            if subdir is None:
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and name in CONTENT_DIRS:
+                    self._add(os.path.join(self.source_dir, name), name)
+                    changed.update(p for p in _json_files(self.source_dir) if p.startswith(name + '/'))
+                continue
+            # A created file is picked up by its IN_CLOSE_WRITE
+            if name.endswith('.json') and not mask & (IN_ISDIR | IN_CREATE):
+                changed.add(f"{subdir}/{name}")
+        return changed
+
+
+class PollingWatcher:
+    """Fallback: compare mtimes and sizes every `interval` seconds"""
+
+    def __init__(self, source_dir, interval=DEFAULT_POLL_SECONDS):
+        self.source_dir = source_dir
+        self.interval = interval
+        self.snapshot = _json_files(source_dir)
+
+    def wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = _json_files(self.source_dir)
+            changed = {path for path in set(current) | set(self.snapshot)
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed:
+                return changed
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+
+def make_watcher(source_dir, poll=None):
+    libc = None if poll else _libc()
+    if libc is not None:
+        try:
+            return InotifyWatcher(source_dir, libc)
+        except OSError as e:
+            print(f"  ⚠️ inotify unavailable ({e}), polling instead")
+    return PollingWatcher(source_dir, poll or DEFAULT_POLL_SECONDS)
+
+
+def wait_for_burst(watcher, debounce):
+    """Block for the first change, then collect until `debounce` seconds are quiet"""
+    changed = watcher.wait(None)
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+# ================================================
+# INCREMENTAL REBUILD
+# ================================================
+
+class Rebuilder:
+    """Holds the parsed build corpus and the stage memo between rebuilds"""
+
+    def __init__(self, source_dir, output_dir, compact=False, use_brotli=True):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.compact = compact
+        self.options = {'compact': compact, 'brotli': use_brotli, 'jobs': 1, 'memo': {}, 'source_dir': source_dir}
+        self.docs = {}
+
+    def initial_build(self):
+        reports = run_build(self.source_dir, self.output_dir, compact=self.compact)
+        corpus, errors = load_corpus(self.output_dir)
+        self.docs = {doc['path']: doc for doc in corpus}
+        run_stages(self.output_dir, self.options, self.corpus())
+        return reports, errors
+
+    def corpus(self):
+        """Documents in discovery order, as load_corpus would return them"""
+        return [self.docs[entry['path']] for entry in discover_documents(self.output_dir) if entry['path'] in self.docs]
+
+    def rebuild(self, paths):
+        """Rebuild changed paths and the stages that read their types. Returns a summary."""
+        start = time.perf_counter()
+        entries = {entry['path']: entry for entry in discover_documents(self.source_dir)}
+        summary = {'built': [], 'removed': [], 'errors': [], 'invalid': [], 'stages': []}
+        changed_types = set()
+
+        for path in sorted(paths):
+            entry = entries.get(path)
+            if entry is None:
+                if path in self.docs:
+                    changed_types.add(self.docs.pop(path)['type'])
+                    output_path = os.path.join(self.output_dir, path)
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+                    remove_siblings(output_path)
+                    summary['removed'].append(path)
+                continue
+            # Keep the last good build of a file that no longer parses: the
+            # in-memory corpus the stages use still holds that version
+            report = build_document(entry, self.source_dir, self.output_dir, compact=self.compact, keep_stale=True)
+            if report['error']:
+                summary['errors'].append({'path': path, 'error': report['error']})
+                continue
+            result = validate_document((self.output_dir, entry))
+            if result['errors']:
+                summary['invalid'].append(result)
+            self.docs[path] = load_document(self.output_dir, entry)
+            changed_types.add(entry['type'])
+            summary['built'].append(path)
+
+        if changed_types:
+            results = run_stages(self.output_dir, self.options, self.corpus(), changed_types)
+            summary['stages'] = [name for name in results if name != 'compress']
+        summary['seconds'] = round(time.perf_counter() - start, 3)
+        return summary
+
+
+def print_rebuild(summary):
+    for path in summary['built']:
+        print(f"  🔄 {path}")
+    for path in summary['removed']:
+        print(f"  🗑️ {path}")
+    for e in summary['errors']:
+        print(f"  ❌ {e['path']}: {e['error']}")
+    for result in summary['invalid']:
+        print(f"  ❌ {result['path']}: {len(result['errors'])} validation errors")
+        for path, message in result['errors'][:3]:
+            print(f"     - {path}: {message}")
+    stages = ', '.join(summary['stages']) or 'none'
+    print(f"  ✅ rebuilt in {summary['seconds'] * 1000:.0f} ms (stages: {stages})")
+
+
+# ================================================
+# DEV SERVER + LIVE RELOAD
+# ================================================
+
+class LiveReload:
+    """Rebuild counter that SSE clients block on"""
+
+    def __init__(self):
+        self.version = 0
+        self.event = None
+        self.payload = None
+        self.changed = threading.Condition()
+
+    def publish(self, payload, event='reload'):
+        with self.changed:
+            self.version += 1
+            self.event = event
+            self.payload = payload
+            self.changed.notify_all()
+
+    def wait(self, version, timeout):
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version, timeout)
+            return self.version, self.event, self.payload
+
+
+def make_handler(output_dir, reload):
+    class DevHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=ROOT_DIR, **kwargs)
+
+        def translate_path(self, path):
+            url_path = path.split('?', 1)[0].split('#', 1)[0]
+            if url_path.startswith('/data/'):
+                relative = os.path.normpath(url_path[len('/data/'):]).lstrip(os.sep)
+                if not relative.startswith('..'):
+                    return os.path.join(output_dir, relative)
+            return super().translate_path(path)
+
+        def end_headers(self):
+            self.send_header('Cache-Control', 'no-store')
+            super().end_headers()
+
+        def do_GET(self):
+            if self.path == RELOAD_PATH:
+                return self.stream_events()
+            filepath = self.translate_path(self.path)
+            if os.path.isdir(filepath):
+                filepath = os.path.join(filepath, 'index.html')
+            if filepath.endswith('.html') and os.path.isfile(filepath):
+                return self.send_html(filepath)
+            return super().do_GET()
+
+        def send_html(self, filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                html = f.read()
+            marker = html.rfind('</body>')
+            html = html + RELOAD_SCRIPT if marker < 0 else html[:marker] + RELOAD_SCRIPT + html[marker:]
+            body = html.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def stream_events(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            version = reload.version
+            try:
+                while True:
+                    current, event, payload = reload.wait(version, KEEPALIVE_SECONDS)
+                    if current == version:
+                        self.wfile.write(b": keepalive\n\n")
+                    else:
+                        version = current
+                        self.wfile.write(f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return DevHandler
+
+
+def serve(output_dir, reload, port):
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(output_dir, reload))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch data/ and rebuild incrementally")
+    parser.add_argument('--source', default=DATA_DIR, help="source content directory")
+    parser.add_argument('--output', default=os.path.join(BUILD_DIR, 'data'), help="build output directory")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="dev server port")
+    parser.add_argument('--no-serve', action='store_true', help="rebuild only, no dev server")
+    parser.add_argument('--debounce', type=int, default=DEFAULT_DEBOUNCE_MS, help="quiet period in ms")
+    parser.add_argument('--poll', type=float, help="poll every N seconds instead of using inotify")
+    parser.add_argument('--minify', action='store_true', help="write compact JSON plus .gz/.br siblings")
+    parser.add_argument('--no-brotli', action='store_true', help="with --minify, write .gz siblings only")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CONTENT WATCH")
+    print("=" * 80)
+    if args.minify and not require_brotli(args.no_brotli):
+        return 1
+
+    rebuilder = Rebuilder(args.source, args.output, args.minify, not args.no_brotli)
+    start = time.perf_counter()
+    reports, errors = rebuilder.initial_build()
+    for r in reports:
+        if r['error']:
+            print(f"  ❌ {r['path']}: {r['error']}")
+    print(f"  ✅ initial build: {len(rebuilder.docs)} documents in {time.perf_counter() - start:.2f}s")
+
+    reload = LiveReload()
+    if not args.no_serve:
+        serve(args.output, reload, args.port)
+        print(f"  🌐 http://127.0.0.1:{args.port}/ (live reload)")
+
+    watcher = make_watcher(args.source, args.poll)
+    print(f"  👀 watching {args.source} ({type(watcher).__name__})\n")
+    try:
+        while True:
+            changed = wait_for_burst(watcher, args.debounce / 1000)
+            try:
+                summary = rebuilder.rebuild(changed)
+                print_rebuild(summary)
+            except Exception as e:
+                # A half-saved edit can break a stage; report it and keep watching.
+                # Saving the file again reruns the same stages.
+                traceback.print_exc()
+                print(f"  ❌ rebuild failed: {type(e).__name__}: {e}")
+                reload.publish({'paths': sorted(changed), 'error': f"{type(e).__name__}: {e}"}, 'build-error')
+                continue
+            problems = [e['path'] for e in summary['errors']] + [result['path'] for result in summary['invalid']]
+            if summary['built'] or summary['removed']:
+                reload.publish({'paths': summary['built'] + summary['removed'], 'stages': summary['stages'],
+                                'errors': problems})
+            elif problems:
+                reload.publish({'paths': problems, 'error': 'build or validation errors'}, 'build-error')
+    except KeyboardInterrupt:
+        print("\n  👋 stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())